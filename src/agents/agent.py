@@ -1,23 +1,44 @@
+import os
 import typing as t
 
 from icecream import ic
 from langchain.agents import AgentExecutor, create_openai_functions_agent
 from langchain.output_parsers import JsonOutputToolsParser
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.caches import BaseCache
+from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
 from langchain_core.runnables import Runnable, RunnableLambda
 from langchain_core.tools import BaseTool
 from langchain_core.utils.function_calling import convert_to_openai_function
 from langchain_openai import ChatOpenAI
 
+from src.common.common import AGENT_STOP_SEQUENCES
 from src.parser.supservisor_result_parser import parsing_supervisor_result
+from src.utils.agent_response_cache import get_agent_response_cache
+from src.utils.stub_chat_model import StubChatModel
 
 
 class AgentCreator:
-    def __init__(self, model_name: str = "gpt-4o-mini"):
-        self.llm = ChatOpenAI(
+    def __init__(self, model_name: str = "gpt-4o-mini", cache: t.Optional[BaseCache] = None):
+        # stop: '</next_agent>'가 나오면 이후 토큰은 생성하지 않음('<FINISHED>'는 답변 중간에도 나올 수 있어 router가 parsing)
+        self.llm = self._create_llm(model_name, cache, stop=AGENT_STOP_SEQUENCES)
+        # routing 태그 뒤에도 parsing할 내용(<paper_indexes>)을 쓰는 agent용
+        self.llm_without_stop = self._create_llm(model_name, cache, stop=None)
+
+    def _create_llm(
+        self, model_name: str, cache: t.Optional[BaseCache], stop: t.Optional[t.List[str]]
+    ) -> BaseChatModel:
+        if os.getenv("CHAT_LLM_STUB"):
+            # 부하 테스트: openai 대신 고정 답변을 token 단위로 생성하는 stub llm 사용(매 호출 streaming되도록 cache 미사용)
+            return StubChatModel(stop=stop, cache=False)
+
+        # response cache key: model 설정 + bind된 tools + 직렬화된 message 리스트
+        return ChatOpenAI(
             model=model_name,
             temperature=0.0,
+            stop=stop,
+            cache=cache or get_agent_response_cache() or False,
         )
 
     def create_supervisor_agent(self):
@@ -94,7 +115,11 @@ class AgentCreator:
         return agent
 
     def create_chat_agent(
-        self, tools: t.Sequence[BaseTool], system_prompt: str, next_roles: str
+        self,
+        tools: t.Sequence[BaseTool],
+        system_prompt: str,
+        next_roles: str,
+        stop_at_next_agent: bool = True,
     ) -> Runnable:
         """Create a function-calling agnet and add it to the graph.
 
@@ -103,6 +128,8 @@ class AgentCreator:
             tools (t.Sequence[BaseTool]): tools that used in agent.
             system_prompt (str): system prompt of this agent.
             next_roles (t.List[str]): next role names.
+            stop_at_next_agent (bool): stop generation at '</next_agent>'. set False for the agent that can write
+                '<paper_indexes>' after the routing tag, otherwise the indexes are cut off.
 
         Returns:
             Runnable: Agent Object.
@@ -126,7 +153,8 @@ class AgentCreator:
         )
 
         prompt = prompt.partial(prompt=system_prompt).partial(next_roles=str(next_roles))
-        llm_with_tools = self.llm.bind_tools(tools=tools)
+        llm = self.llm if stop_at_next_agent else self.llm_without_stop
+        llm_with_tools = llm.bind_tools(tools=tools)
 
         agent = prompt | llm_with_tools
 
@@ -1,9 +1,12 @@
+import asyncio
 import re
 import typing as t
 
 from langchain_core.messages import AIMessage, ToolMessage
 from langchain_core.runnables import Runnable
 
+from src.utils.message_history import get_bounded_history
+
 
 def _re_search_next_agent(text: str) -> t.Union[str, bool]:
     """search next agent format from agent result message.
@@ -40,9 +43,28 @@ def _re_search_paper_index(text: str) -> t.Union[str, bool]:
         return False
 
 
-def agent_node(state, agent: Runnable, name: str) -> t.Dict[str, object]:
+def _restore_stop_sequence(agent_result: AIMessage) -> AIMessage:
+    """restore '</next_agent>' end mark that stop sequence(AGENT_STOP_SEQUENCES) cut off from agent result message.
+
+    Args:
+        agent_result (AIMessage): agent result message
+
+    Returns:
+        AIMessage: message that has complete '<next_agent>...</next_agent>' mark
+    """
+    content = agent_result.content
+    if agent_result.response_metadata.get("finish_reason") != "stop" or not isinstance(content, str):
+        return agent_result
+
+    if not re.search(r"<next_agent>[^<]*$", content):
+        return agent_result
+
+    return agent_result.copy(update={"content": content + "</next_agent>"})
+
+
+def _make_agent_node_result(agent_result: AIMessage, name: str) -> t.Dict[str, object]:
     temp_agent_result = {"sender": name}
-    agent_result = agent.invoke(state)
+    agent_result = _restore_stop_sequence(agent_result)
 
     # 1. next agent 검색
     next_agent_search_result = _re_search_next_agent(text=agent_result.content)
@@ -58,3 +80,19 @@ def agent_node(state, agent: Runnable, name: str) -> t.Dict[str, object]:
     temp_agent_result["messages"] = [agent_result]
 
     return temp_agent_result
+
+
+def agent_node(state, agent: Runnable, name: str) -> t.Dict[str, object]:
+    # 전체 transcript 대신 token 제한된 message view로 호출(state의 messages는 그대로 유지)
+    agent_result = agent.invoke({**state, "messages": get_bounded_history(state["messages"])})
+
+    return _make_agent_node_result(agent_result, name)
+
+
+async def async_agent_node(state, agent: Runnable, name: str) -> t.Dict[str, object]:
+    # agent_node의 async 버전, llm 응답을 기다리는 동안 event loop를 막지 않음
+    # history token 계산(tokenizer 로드 포함)도 event loop 밖에서 수행
+    bounded_history = await asyncio.get_running_loop().run_in_executor(None, get_bounded_history, state["messages"])
+    agent_result = await agent.ainvoke({**state, "messages": bounded_history})
+
+    return _make_agent_node_result(agent_result, name)
@@ -18,7 +18,6 @@ from src.agents.paper_agent.utils.paper_agent_utils import (
 from src.common.common import (
     CHAT_MODEL,
     PDF_DOWNLOAD_DIR,
-    RECENT_PAPER_SEARCH_RSS_FORMAT,
 )
 from src.common.prompts import (
     EXTRACT_ARXIV_PAPER_ID_PROMPT,
@@ -40,4 +39,6 @@ arxiv_paper_search_agent = agent_creator.create_chat_agent(
     tools=[search_paper_by_arxiv_id, paper_index_extract],
     system_prompt="You are Paper Team's member agent, 'arxiv_paper_search_agent'. You will do below jobs by your tools:\n- search paper by arxiv paper id.\n- download paper pdf\n- extract paper's indexes.",
     next_roles=["paper_team_leader"],
+    # 목차 추출 결과(<paper_indexes>)를 routing 태그 뒤에 쓸 수 있으므로 stop sequence를 쓰지 않음
+    stop_at_next_agent=False,
 )
@@ -1,9 +1,11 @@
+import ast
+import functools
 import os
+import re
 import typing as t
 
 import fitz
 from icecream import ic
-from langchain_community.document_loaders import ArxivLoader
 from langchain_core.documents import Document
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import chain
@@ -14,51 +16,118 @@ from typing_extensions import Annotated
 
 from src.common.common import (
     CHAT_MODEL,
+    ENTRY_SUMMARY_ENABLED,
+    INDEX_EXTRACT_MAX_CONCURRENCY,
+    INDEX_EXTRACT_WINDOW_TOKENS,
+    LLM_REQUEST_MAX_RETRIES,
+    LLM_REQUEST_TIMEOUT_SECONDS,
     PDF_DOWNLOAD_DIR,
-    RECENT_PAPER_SEARCH_RSS_FORMAT,
+    RECENT_PAPER_MARKDOWN_MODE,
+    RECENT_PAPER_MAX_RESULTS,
+    RECENT_PAPER_TYPE_MIN_CONFIDENCE,
+    SECTION_CONTENT_MAX_TOKENS,
 )
 from src.common.prompts import (
     EXTRACT_ARXIV_PAPER_ID_PROMPT,
     EXTRACT_RECENT_PAPER_TYPE_PROMPT,
     MAKE_MARKDOWN_FORMAT_RECENT_PAPER_SUMMARY_PROMPT,
 )
-from src.utils.get_paper_page_indexes import ExtractPaperIndexes
-from src.utils.get_rss_url_values import get_processed_entries_from_rss_url
-from src.utils.paper_pdf_handler import paper_pdf_download, paper_pdf_load
+from src.utils.arxiv_entry_store import get_arxiv_entry_store
+from src.utils.arxiv_metadata import (
+    get_arxiv_pdf_file_name,
+    is_valid_arxiv_id,
+    normalize_arxiv_id,
+    resolve_arxiv_papers,
+)
+from src.utils.entry_summarizer import summarize_entries
+from src.utils.get_paper_page_indexes import TieredExtractPaperIndexes
+from src.utils.paper_index_cache import get_paper_index_cache
+from src.utils.paper_page_store import build_paper_page_store, load_paper_page_store
+from src.utils.paper_pdf_downloader import is_pdf_file
+from src.utils.paper_pdf_handler import (
+    paper_pdf_download_many,
+    paper_pdf_page_texts,
+    pdf_document_cache,
+)
+from src.utils.paper_section_index import PaperSectionIndex, get_tokenizer
+from src.utils.paper_type_classifier import classify_paper_types, normalize_user_input
+from src.utils.recent_paper_markdown import render_recent_papers_markdown
+from src.utils.single_flight import paper_single_flight
+
+
+def _ensure_paper_page_store(pdf_path: str):
+    # 같은 논문의 page store 생성은 caller(thread/process) 간에 한 번만 수행
+    def build_page_store():
+        if load_paper_page_store(pdf_path) is None:
+            build_paper_page_store(pdf_path)
+
+    paper_single_flight.do(f"page_store:{os.path.abspath(pdf_path)}", build_page_store)
 
 
 @tool
-def search_paper_by_arxiv_id(arxiv_paper_id: t.List[str]) -> t.List[str]:
+def search_paper_by_arxiv_id(arxiv_paper_id: t.List[str]) -> t.Dict[str, t.List[str]]:
     """arxiv id를 통해 특정 논문을 찾고, 해당 논문 pdf를 다운로드를 수행합니다.
 
     Args:
         arxiv_paper_id (t.List[str]): 찾고자 하는 논문의 arxiv id들.
 
     Returns:
-        t.List[str]: 논문을 다운로드한 경로(path)들.
+        t.Dict[str, t.List[str]]: 논문을 다운로드한 경로(path)들('paper_paths'),
+            형식이 잘못된 id들('invalid_arxiv_ids'), arxiv에서 찾지 못한 id들('not_found_arxiv_ids'),
+            다운로드에 실패한 id들('failed_arxiv_ids').
     """
     # 0. save dir make
     if not os.path.isdir(PDF_DOWNLOAD_DIR):
         os.mkdir(PDF_DOWNLOAD_DIR)
-    # 1. search arxiv papers
-    paper_infos = [
-        ArxivLoader(query=id, doc_content_chars_max=1, load_all_available_meta=True).load()[0]
-        for id in arxiv_paper_id
-    ]
+    # 형식이 잘못된 id는 arxiv api에 보내지 않고 결과로 알려줌
+    paper_ids = []
+    invalid_arxiv_ids = []
+    for raw_arxiv_id in arxiv_paper_id:
+        paper_id = normalize_arxiv_id(raw_arxiv_id)
+        if not is_valid_arxiv_id(paper_id):
+            invalid_arxiv_ids.append(raw_arxiv_id)
+        elif paper_id not in paper_ids:
+            paper_ids.append(paper_id)
+    download_paths = {
+        paper_id: os.path.join(PDF_DOWNLOAD_DIR, get_arxiv_pdf_file_name(paper_id)) for paper_id in paper_ids
+    }
 
-    # 2. download paper pdfs
-    paper_save_paths = []
-    for paper_info in paper_infos:
-        http_pdf_path = paper_info.metadata["links"][1]
-        arxiv_pdf_name = ".".join([http_pdf_path.split("/")[-1][:10], "pdf"])
-        download_path = os.path.join(PDF_DOWNLOAD_DIR, arxiv_pdf_name)
-        # print(f"download path: {download_path}")
+    # 1. search arxiv papers(local pdf가 없는 논문만 metadata cache -> arxiv api 단일 요청 순으로 조회)
+    missing_paper_ids = [paper_id for paper_id in paper_ids if not is_pdf_file(download_paths[paper_id])]
+    paper_metadatas = resolve_arxiv_papers(missing_paper_ids)
 
-        if not os.path.isfile(download_path):
-            paper_pdf_download(http_pdf_path=http_pdf_path, pdf_download_path=download_path)
-        paper_save_paths.append(download_path)
+    # 2. download paper pdfs(아직 받지 않은 pdf만 동시에 다운로드, 논문별 single-flight)
+    download_paper_ids = []
+    download_targets = []
+    not_found_arxiv_ids = []
+    for paper_id in missing_paper_ids:
+        if paper_id not in paper_metadatas:
+            print(f"[search_paper_by_arxiv_id] arxiv paper '{paper_id}' is not found")
+            not_found_arxiv_ids.append(paper_id)
+            continue
+        download_paper_ids.append(paper_id)
+        download_targets.append((paper_metadatas[paper_id]["pdf_url"], download_paths[paper_id]))
+    # 일부 다운로드가 실패해도 받은 pdf들과 실패한 id를 함께 반환
+    failed_arxiv_ids = []
+    download_results = paper_pdf_download_many(download_targets, return_exceptions=True)
+    for paper_id, download_result in zip(download_paper_ids, download_results):
+        if isinstance(download_result, Exception):
+            print(f"[search_paper_by_arxiv_id] arxiv paper '{paper_id}' download failed: {download_result}")
+            failed_arxiv_ids.append(paper_id)
+    paper_save_paths = [
+        download_path for download_path in download_paths.values() if is_pdf_file(download_path)
+    ]
+
+    # 3. 페이지 텍스트를 한 번만 추출해 page store로 저장
+    for download_path in paper_save_paths:
+        _ensure_paper_page_store(download_path)
 
-    return paper_save_paths
+    return {
+        "paper_paths": paper_save_paths,
+        "invalid_arxiv_ids": invalid_arxiv_ids,
+        "not_found_arxiv_ids": not_found_arxiv_ids,
+        "failed_arxiv_ids": failed_arxiv_ids,
+    }
 
 
 @tool
@@ -71,91 +140,181 @@ def paper_index_extract(target_paper_path: str) -> t.Dict[str, int]:
     Returns:
         t.Dict[str, int]: 추출된 논문 목차들. Dict 내에는 page: index로 구성.
     """
-    index_extractor = ExtractPaperIndexes(using_llm_name=CHAT_MODEL)
-    paper_index_dict = index_extractor.run_extract_all_indexes(paper_pdf_load(target_paper_path))
+    # 0. 이전에 추출한 목차가 있으면 재사용
+    paper_index_cache = get_paper_index_cache()
+    cached_result = paper_index_cache.get(pdf_path=target_paper_path, model_name=CHAT_MODEL)
+    if cached_result is not None:
+        return cached_result[0]
+
+    # 1. 같은 논문의 목차 추출이 진행 중이면 그 결과를 기다려 공유
+    return paper_single_flight.do(
+        f"index:{os.path.abspath(target_paper_path)}", lambda: _extract_paper_indexes(target_paper_path)
+    )
+
+
+def _extract_paper_indexes(target_paper_path: str) -> t.Dict[str, int]:
+    # 기다리는 동안 다른 caller/worker가 추출을 끝냈으면 cache 결과를 사용
+    paper_index_cache = get_paper_index_cache()
+    cached_result = paper_index_cache.get(pdf_path=target_paper_path, model_name=CHAT_MODEL)
+    if cached_result is not None:
+        return cached_result[0]
+
+    index_extractor = TieredExtractPaperIndexes(
+        using_llm_name=CHAT_MODEL,
+        max_concurrency=INDEX_EXTRACT_MAX_CONCURRENCY,
+        max_window_tokens=INDEX_EXTRACT_WINDOW_TOKENS,
+    )
+    # 1. outline/heading tier는 공유 문서를 lock한 상태에서 수행
+    with pdf_document_cache.locked_document(target_paper_path) as paper_pdf:
+        extract_result = index_extractor.run_local_extract(paper_pdf)
+    # 2. llm tier는 캐시된 페이지 텍스트로 수행(llm 대기 중 문서 lock을 잡지 않음)
+    if extract_result is None:
+        extract_result = index_extractor.run_llm_extract(paper_pdf_page_texts(target_paper_path))
+    paper_index_dict, extract_tier = extract_result
+    print(f"[paper_index_extract] indexes extracted by '{extract_tier}' tier")
+    paper_index_cache.put(
+        pdf_path=target_paper_path,
+        model_name=CHAT_MODEL,
+        paper_indexes=paper_index_dict,
+        extract_tier=extract_tier,
+    )
 
     return paper_index_dict
 
 
-@tool
-def get_recent_upload_papers(user_input: str) -> str:
-    """사용자가 원하는 논문 domain의 최신 논문들의 abstract를 제공합니다. 단, 특정 arxiv id기반 논문 검색은 수행할 수 없습니다.
+def _parse_paper_types(paper_type_text: str) -> t.List[str]:
+    # 'cs.CL, cs.IR' 형태의 llm 결과에서 category code들을 추출
+    paper_types = re.findall(r"[a-z\-]+\.[A-Z]{2}", paper_type_text)
+    if not paper_types:
+        paper_types = [paper_type.strip() for paper_type in paper_type_text.split(",") if paper_type.strip()]
 
-    Args:
-        user_input (str): 사용자 입력
+    return list(dict.fromkeys(paper_types))
 
-    Returns:
-        str: 최신 논문들을 정리한 markdown format text
-    """
-    client = ChatOpenAI(model=CHAT_MODEL, temperature=0.0)
 
-    # 1. 사용자 입력에서 분야를 추출
+@functools.lru_cache(maxsize=1024)
+def _extract_paper_types(normalized_input: str) -> t.Tuple[str, ...]:
+    # 1. local classifier(category code, 한/영 alias, fuzzy matching)
+    paper_types, confidence = classify_paper_types(normalized_input)
+    if paper_types and confidence >= RECENT_PAPER_TYPE_MIN_CONFIDENCE:
+        return paper_types
+
+    # 2. confidence가 낮을 때만 llm으로 분류
+    print(f"[_extract_paper_types] local confidence {confidence:.2f}, fall back to llm")
     extract_paper_type_prompt = ChatPromptTemplate.from_messages(
         [
             ("system", EXTRACT_RECENT_PAPER_TYPE_PROMPT[0]),
             ("user", EXTRACT_RECENT_PAPER_TYPE_PROMPT[1]),
         ]
     )
-    extract_paper_type_chain = extract_paper_type_prompt | client
-    paper_type = extract_paper_type_chain.invoke(input={"user_input": user_input}).content
-    ic(paper_type)
-    rss_url = RECENT_PAPER_SEARCH_RSS_FORMAT.format(paper_type)
+    extract_paper_type_chain = extract_paper_type_prompt | ChatOpenAI(
+        model=CHAT_MODEL, temperature=0.0, timeout=LLM_REQUEST_TIMEOUT_SECONDS, max_retries=LLM_REQUEST_MAX_RETRIES
+    )
+    paper_type = extract_paper_type_chain.invoke(input={"user_input": normalized_input}).content
 
-    # 2. rss feed entries를 추출
-    rss_entries = get_processed_entries_from_rss_url(rss_url)
+    return tuple(_parse_paper_types(paper_type))
 
-    # 3. rss feed 기반 markdown을 생성(llm 사용)
-    markdown_generate_prompt = ChatPromptTemplate.from_messages(
-        [
-            ("system", MAKE_MARKDOWN_FORMAT_RECENT_PAPER_SUMMARY_PROMPT[0]),
-            ("user", MAKE_MARKDOWN_FORMAT_RECENT_PAPER_SUMMARY_PROMPT[1]),
-        ]
+
+@tool
+def get_recent_upload_papers(
+    user_input: str, max_results_per_category: int = RECENT_PAPER_MAX_RESULTS
+) -> str:
+    """사용자가 원하는 논문 domain(여러 domain 가능)의 최신 논문들의 abstract를 제공합니다. 단, 특정 arxiv id기반 논문 검색은 수행할 수 없습니다.
+
+    Args:
+        user_input (str): 사용자 입력
+        max_results_per_category (int): domain별 최대 논문 수
+
+    Returns:
+        str: 최신 논문들을 정리한 markdown format text
+    """
+    # 1. 사용자 입력에서 분야(들)를 추출(local classifier 우선, 정규화된 입력 단위로 cache)
+    paper_types = _extract_paper_types(normalize_user_input(user_input))
+    ic(paper_types)
+
+    # 2. local entry store에서 분야별 최신 entries를 동시에 추출해 병합(TTL이 지나면 background로 증분 동기화)
+    rss_entries = get_arxiv_entry_store().get_recent_entries_for_categories(
+        categories=paper_types,
+        max_results_per_category=max_results_per_category,
     )
-    markdown_generate_chain = markdown_generate_prompt | client
-    recent_papers_markdown = markdown_generate_chain.invoke(
-        input={"rss_entries": rss_entries}
-    ).content
+    # 2-1. abstract 요약(cache에 없는 entry들만 묶어서 한 번에 요청)
+    if ENTRY_SUMMARY_ENABLED:
+        rss_entries = summarize_entries(rss_entries)
+
+    # 3. entry들을 template으로 markdown 변환, llm 모드는 다시 쓰기/번역이 필요할 때만 사용
+    recent_papers_markdown = render_recent_papers_markdown(rss_entries)
+    if RECENT_PAPER_MARKDOWN_MODE == "llm" and rss_entries:
+        markdown_generate_prompt = ChatPromptTemplate.from_messages(
+            [
+                ("system", MAKE_MARKDOWN_FORMAT_RECENT_PAPER_SUMMARY_PROMPT[0]),
+                ("user", MAKE_MARKDOWN_FORMAT_RECENT_PAPER_SUMMARY_PROMPT[1]),
+            ]
+        )
+        markdown_generate_chain = markdown_generate_prompt | ChatOpenAI(
+            model=CHAT_MODEL, temperature=0.0, timeout=LLM_REQUEST_TIMEOUT_SECONDS, max_retries=LLM_REQUEST_MAX_RETRIES
+        )
+        recent_papers_markdown = markdown_generate_chain.invoke(
+            input={"rss_entries": rss_entries}
+        ).content
     ic(recent_papers_markdown)
-    ic(type(recent_papers_markdown))
 
     return recent_papers_markdown
 
 
+@functools.lru_cache(maxsize=16)
+def _load_paper_section_index(
+    pdf_path: str, pdf_mtime_ns: int, paper_index_items: t.Tuple[t.Tuple[str, int], ...]
+) -> PaperSectionIndex:
+    # pdf 수정 시각과 목차가 같으면 이전에 만든 section index를 재사용
+    page_texts = paper_pdf_page_texts(pdf_path)
+
+    return PaperSectionIndex(page_texts=page_texts, paper_indexes=dict(paper_index_items))
+
+
 @tool
 def get_user_question_part_contents(
-    target_index_name: str, state: Annotated[dict, InjectedState]
-) -> t.List[str]:
-    """find target index from state.paper_indexes, return page content that contain target index part.
+    target_index_name: str, state: Annotated[dict, InjectedState], cursor: int = 0
+) -> t.Union[t.Dict[str, object], str]:
+    """find target index from state.paper_indexes, return only the content text of that index section.
 
     Args:
         target_index_name (str): paper index name that user answered. it can have index number. ex) 1. Intruduction
         state (Annotated[dict, InjectedState]): temp graph's state.
+        cursor (int): continuation cursor. if previous result has 'next_cursor', pass it to read the rest of the section.
 
     Returns:
-        t.List[str]: page content that have index part.
+        t.Union[t.Dict[str, object], str]: section content('content') and 'next_cursor'(None if section ended), or error message.
     """
-    paper_indexes = state["paper_indexes"]
-    target_index_page_number = paper_indexes.get(target_index_name, None)
-    if target_index_page_number is None:
-        pass  # return error message
-
-    # extract index part pages
-    target_paper_pdf = paper_pdf_load(state["target_paper_path"])
-    if target_index_page_number == 0:
-        target_page_numbers = [target_index_page_number, target_index_page_number + 1]
-    else:
-        target_page_numbers = [
-            target_index_page_number - 1,
-            target_index_page_number,
-            target_index_page_number + 1,
-        ]
+    paper_indexes = state.get("paper_indexes")
+    if isinstance(paper_indexes, str):
+        try:
+            paper_indexes = ast.literal_eval(paper_indexes)
+        except (ValueError, SyntaxError) as parse_error:
+            return {"error": "invalid_paper_indexes", "message": f"paper indexes could not be parsed: {parse_error}"}
+    if paper_indexes and not isinstance(paper_indexes, dict):
+        return {"error": "invalid_paper_indexes", "message": f"paper indexes must be a dict, got {type(paper_indexes).__name__}"}
+    if not paper_indexes:
+        return "paper indexes are not extracted yet. extract paper indexes first."
 
-    result_paper_pages = []
-    for page_number in target_page_numbers:
-        page_content = target_paper_pdf.load_page(page_number).get_text("text")
-        result_paper_pages.append(page_content)
+    # 1. 목차별 문자 단위 span index 로드
+    target_paper_path = state["target_paper_path"]
+    paper_section_index = _load_paper_section_index(
+        target_paper_path,
+        os.stat(target_paper_path).st_mtime_ns,
+        tuple(sorted(paper_indexes.items())),
+    )
+    index_name = paper_section_index.find_index_name(target_index_name)
+    if index_name is None:
+        return f"'{target_index_name}' is not in paper indexes. available indexes: {list(paper_indexes.keys())}"
+
+    # 2. 대상 section 텍스트만 token budget 내에서 반환
+    section_content, next_cursor = paper_section_index.get_section_text(
+        index_name,
+        cursor=cursor,
+        max_tokens=SECTION_CONTENT_MAX_TOKENS,
+        tokenizer=get_tokenizer(CHAT_MODEL) if SECTION_CONTENT_MAX_TOKENS else None,
+    )
 
-    return result_paper_pages
+    return {"index": index_name, "content": section_content, "next_cursor": next_cursor}
 
 
 if __name__ == "__main__":
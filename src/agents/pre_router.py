@@ -0,0 +1,70 @@
+import re
+import typing as t
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import END
+
+PRE_ROUTER_NAME = "pre_router"
+GREETING_ANSWER = "안녕하세요! arxiv 논문 검색, 최신 논문 조회, 논문 목차/내용 설명을 도와드릴 수 있어요. 무엇을 도와드릴까요? <FINISHED>"
+
+_ARXIV_ID_PATTERN = re.compile(r"(?<![\d.])\d{4}\.\d{4,5}(v\d+)?(?![\d.])|arxiv\.org/(abs|pdf)/", re.IGNORECASE)
+# arxiv id가 있어도 논문을 찾거나 받으라는 요청일 때만 arxiv_paper_searcher로 보냄(이미 받은 논문의 section 질문 제외)
+_SEARCH_PATTERN = re.compile(
+    r"찾아|찾기|검색|다운|받아|불러|가져와|\b(search|find|download|fetch|load|look up)\b", re.IGNORECASE
+)
+_RECENT_PATTERN = re.compile(r"최신|최근|요즘|새로 나온|\b(recent|latest|newest|new)\b", re.IGNORECASE)
+_PAPER_PATTERN = re.compile(r"논문|페이퍼|\b(papers?|articles?|arxiv)\b", re.IGNORECASE)
+_GREETING_PATTERN = re.compile(
+    r"^(안녕(하세요|하십니까)?|반가워(요)?|반갑습니다|하이|hi|hello|hey|good (morning|afternoon|evening))[\s!.~?]*$",
+    re.IGNORECASE,
+)
+
+
+def classify_user_intent(user_input:str)->str:
+    """명확한 사용자 의도를 규칙 기반으로 분류해 다음 노드 이름을 반환
+
+    Args:
+        user_input (str): 사용자 입력
+
+    Returns:
+        str: arxiv_paper_searcher(arxiv id 논문 검색/다운로드 요청) | paper_team_leader(최신 논문 요청) | greeting | supervisor(그 외)
+    """
+    user_input = user_input.strip()
+    if _ARXIV_ID_PATTERN.search(user_input) and _SEARCH_PATTERN.search(user_input):
+        return "arxiv_paper_searcher"
+    if _RECENT_PATTERN.search(user_input) and _PAPER_PATTERN.search(user_input):
+        return "paper_team_leader"
+    if _GREETING_PATTERN.match(user_input):
+        return "greeting"
+
+    return "supervisor"
+
+
+def pre_router_node(state) -> t.Dict[str, object]:
+    """supervisor llm 호출 전에 명확한 요청을 바로 해당 agent로 보내는 노드. 그 외는 supervisor로 보냄."""
+    last_message = state["messages"][-1]
+    if not isinstance(last_message, HumanMessage) or not isinstance(last_message.content, str):
+        return {"sender": PRE_ROUTER_NAME, "next_role": "supervisor"}
+
+    user_intent = classify_user_intent(last_message.content)
+    print(f"[pre_router_node] route to '{user_intent}'")
+    if user_intent == "greeting":
+        # 인사는 llm 없이 바로 답변하고 종료
+        return {"sender": PRE_ROUTER_NAME, "next_role": END, "messages": [AIMessage(content=GREETING_ANSWER)]}
+
+    return {"sender": PRE_ROUTER_NAME, "next_role": user_intent}
+
+
+def pre_route(state) -> str:
+    return state["next_role"]
+
+
+if __name__ == "__main__":
+    for user_input in [
+        "2401.15884번 논문을 찾아서 다운로드해줘.",
+        "2401.15884 논문의 introduction 설명해줘",
+        "NLP 최신 논문 보여줘",
+        "안녕하세요!",
+        "트랜스포머가 뭐야?",
+    ]:
+        print(user_input, "->", classify_user_intent(user_input))
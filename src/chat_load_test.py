@@ -0,0 +1,140 @@
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import typing as t
+
+import httpx
+
+from src.common.common import SERVER_PORT
+
+
+def _percentile(values: t.List[float], percent: float) -> float:
+    if not values:
+        return float("nan")
+    sorted_values = sorted(values)
+    return sorted_values[min(len(sorted_values) - 1, int(round(percent / 100 * (len(sorted_values) - 1))))]
+
+
+async def run_turn(client: httpx.AsyncClient, url: str, session_id: str, message: str) -> t.Dict[str, object]:
+    """한 turn을 요청하고 첫 token까지 시간(ttft)과 전체 시간을 측정
+
+    Args:
+        client (httpx.AsyncClient): http client
+        url (str): server url
+        session_id (str): session id
+        message (str): 사용자 메세지
+
+    Returns:
+        t.Dict[str, object]: status, ttft, total, token 수
+    """
+    started_at = time.monotonic()
+    turn_result = {"status": None, "ttft": None, "total": None, "tokens": 0, "error": False}
+    async with client.stream("POST", f"{url}/chat/{session_id}", json={"message": message}) as response:
+        turn_result["status"] = response.status_code
+        if response.status_code != 200:
+            await response.aread()
+            return turn_result
+
+        event_type = None
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                event_type = line[len("event: "):]
+            elif line.startswith("data: ") and event_type == "token":
+                if turn_result["ttft"] is None:
+                    turn_result["ttft"] = time.monotonic() - started_at
+                turn_result["tokens"] += 1
+            elif line.startswith("data: ") and event_type == "error":
+                turn_result["error"] = True
+    turn_result["total"] = time.monotonic() - started_at
+
+    return turn_result
+
+
+async def run_session(
+    client: httpx.AsyncClient, url: str, session_id: str, turns: int, semaphore: asyncio.Semaphore
+) -> t.List[t.Dict[str, object]]:
+    # 같은 session의 turn은 순서대로, session끼리는 concurrency만큼 동시에
+    session_results = []
+    async with semaphore:
+        for turn_index in range(turns):
+            session_results.append(await run_turn(client, url, session_id, f"attention 메커니즘에 대해 설명해줘 ({turn_index + 1}번째 질문)"))
+
+    return session_results
+
+
+async def run_load_test(url: str, sessions: int, turns: int, concurrency: int) -> t.Dict[str, object]:
+    """sessions개의 대화를 concurrency개씩 동시에 진행하며 turn별 지연 시간을 집계
+
+    Args:
+        url (str): server url
+        sessions (int): session 수
+        turns (int): session당 turn 수
+        concurrency (int): 동시에 진행하는 session 수
+
+    Returns:
+        t.Dict[str, object]: 집계 결과
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    started_at = time.monotonic()
+    async with httpx.AsyncClient(timeout=httpx.Timeout(None), limits=httpx.Limits(max_connections=concurrency)) as client:
+        session_results = await asyncio.gather(
+            *[run_session(client, url, f"load-test-{session_index}", turns, semaphore) for session_index in range(sessions)]
+        )
+    elapsed_seconds = time.monotonic() - started_at
+
+    turn_results = [turn_result for session_result in session_results for turn_result in session_result]
+    succeeded_turns = [turn_result for turn_result in turn_results if turn_result["status"] == 200 and not turn_result["error"]]
+    ttfts = [turn_result["ttft"] for turn_result in succeeded_turns if turn_result["ttft"] is not None]
+    totals = [turn_result["total"] for turn_result in succeeded_turns]
+    status_counts = {}
+    for turn_result in turn_results:
+        status_counts[turn_result["status"]] = status_counts.get(turn_result["status"], 0) + 1
+
+    return {
+        "turns": len(turn_results),
+        "succeeded": len(succeeded_turns),
+        "stream_errors": sum(turn_result["error"] for turn_result in turn_results),
+        "status_counts": status_counts,
+        "elapsed_seconds": round(elapsed_seconds, 3),
+        "turns_per_second": round(len(turn_results) / elapsed_seconds, 2),
+        "ttft": {name: round(_percentile(ttfts, percent), 3) for name, percent in [("p50", 50), ("p95", 95), ("max", 100)]},
+        "total": {name: round(_percentile(totals, percent), 3) for name, percent in [("p50", 50), ("p95", 95), ("max", 100)]},
+    }
+
+
+def spawn_stub_server(port: int) -> subprocess.Popen:
+    """stub llm(CHAT_LLM_STUB=1)으로 chat server를 띄우고 health check가 될 때까지 대기"""
+    server_process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.chat_server:app", "--port", str(port), "--log-level", "warning"],
+        env={**os.environ, "CHAT_LLM_STUB": "1"},
+    )
+    for _ in range(100):
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                return server_process
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    server_process.terminate()
+    raise RuntimeError("chat server did not start in 20 seconds")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="chat server load test")
+    parser.add_argument("--url", default=f"http://127.0.0.1:{SERVER_PORT}")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--spawn-server", action="store_true", help="stub llm으로 server를 띄워서 테스트")
+    args = parser.parse_args()
+
+    server_process = spawn_stub_server(SERVER_PORT) if args.spawn_server else None
+    try:
+        print(asyncio.run(run_load_test(args.url, args.sessions, args.turns, args.concurrency)))
+    finally:
+        if server_process is not None:
+            server_process.terminate()
+            server_process.wait()
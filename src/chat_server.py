@@ -0,0 +1,240 @@
+import asyncio
+import json
+import time
+import typing as t
+
+import uvicorn
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+from langchain_core.messages import BaseMessage, HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+from pydantic import BaseModel
+
+from src.agents.pre_router import PRE_ROUTER_NAME
+from src.common.common import (
+    SERVER_ACQUIRE_TIMEOUT_SECONDS,
+    SERVER_HOST,
+    SERVER_MAX_INFLIGHT_SESSIONS,
+    SERVER_PORT,
+    SERVER_SESSION_QUEUE_SIZE,
+)
+from src.graph import build_workflow
+
+GRAPH_NODE_NAMES = {PRE_ROUTER_NAME, "supervisor", "paper_team_leader", "arxiv_paper_searcher", "search_team_leader", "call_tool"}
+
+
+class ChatRequest(BaseModel):
+    message: str
+
+
+def _format_sse(event_type: str, data: t.Dict[str, object]) -> str:
+    return f"event: {event_type}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def _serialize_message(message: BaseMessage) -> t.Dict[str, object]:
+    serialized_message = {"type": message.type, "content": message.content}
+    if getattr(message, "tool_calls", None):
+        serialized_message["tool_calls"] = [
+            {"name": tool_call["name"], "args": tool_call["args"]} for tool_call in message.tool_calls
+        ]
+
+    return serialized_message
+
+
+def _to_sse_event(graph_event: t.Dict[str, object]) -> t.Optional[str]:
+    """astream_events 이벤트 중 client에 보낼 것만 SSE 문자열로 변환
+
+    - token: llm이 생성 중인 token(어느 node의 llm인지 포함)
+    - node: graph node 하나가 끝났을 때의 state 업데이트
+    """
+    event_name = graph_event["event"]
+    node_name = graph_event.get("metadata", {}).get("langgraph_node")
+    if event_name == "on_chat_model_stream":
+        token = graph_event["data"]["chunk"].content
+        if isinstance(token, str) and token:
+            return _format_sse("token", {"node": node_name, "content": token})
+    elif event_name == "on_chain_end" and graph_event["name"] in GRAPH_NODE_NAMES and graph_event["name"] == node_name:
+        node_output = graph_event["data"].get("output")
+        if isinstance(node_output, dict):
+            return _format_sse(
+                "node",
+                {
+                    "node": node_name,
+                    "next_role": node_output.get("next_role"),
+                    "messages": [_serialize_message(message) for message in node_output.get("messages", [])],
+                },
+            )
+
+    return None
+
+
+class ChatTurn:
+    """session 하나의 진행 중인 turn. turn이 잡은 session/slot은 finish_turn에서 한 번만 반환."""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.finished = False
+
+
+class ChatSessionManager:
+    """session(thread_id)별 대화 상태를 checkpointer에 보관하고, 한 turn의 graph 이벤트를 SSE로 stream.
+
+    - 동시에 처리하는 turn 수는 max_inflight_sessions로 제한(넘으면 acquire_timeout 후 503)
+    - 같은 session은 한 번에 한 turn만 처리(진행 중이면 409)
+    - session별 queue(queue_size)가 가득 차면 graph 진행을 멈춰 느린 client가 메모리를 쌓지 않도록 함(backpressure)
+    """
+
+    def __init__(
+        self,
+        max_inflight_sessions: int = SERVER_MAX_INFLIGHT_SESSIONS,
+        queue_size: int = SERVER_SESSION_QUEUE_SIZE,
+        acquire_timeout_seconds: float = SERVER_ACQUIRE_TIMEOUT_SECONDS,
+    ):
+        self.checkpointer = MemorySaver()
+        self.graph = build_workflow(async_mode=True).compile(checkpointer=self.checkpointer)
+        self.max_inflight_sessions = max_inflight_sessions
+        self.queue_size = queue_size
+        self.acquire_timeout_seconds = acquire_timeout_seconds
+        self._inflight_semaphore = asyncio.Semaphore(max_inflight_sessions)
+        # session_id -> 진행 중(slot 대기 포함)인 ChatTurn
+        self._active_turns = {}
+        self._inflight_turns = 0
+        self.completed_turns = 0
+        self.rejected_turns = 0
+
+    async def start_turn(self, session_id: str) -> ChatTurn:
+        """turn 처리 자리를 확보. 실패 시 HTTPException.
+
+        Args:
+            session_id (str): session id
+
+        Returns:
+            ChatTurn: 확보한 turn. 끝나면 finish_turn으로 반환해야 함.
+        """
+        if session_id in self._active_turns:
+            self.rejected_turns += 1
+            raise HTTPException(status_code=409, detail=f"session '{session_id}' already has a running turn")
+        # slot을 기다리는 동안 같은 session의 다른 요청이 통과하지 않도록 먼저 등록
+        chat_turn = ChatTurn(session_id)
+        self._active_turns[session_id] = chat_turn
+        try:
+            await asyncio.wait_for(self._inflight_semaphore.acquire(), timeout=self.acquire_timeout_seconds)
+        except asyncio.TimeoutError:
+            del self._active_turns[session_id]
+            self.rejected_turns += 1
+            raise HTTPException(status_code=503, detail="too many in-flight sessions, retry later")
+        except BaseException:
+            # 대기 중 요청이 취소된 경우
+            del self._active_turns[session_id]
+            raise
+        self._inflight_turns += 1
+
+        return chat_turn
+
+    def finish_turn(self, chat_turn: ChatTurn):
+        """turn이 잡은 session/slot 반환. body 종료와 response 종료 양쪽에서 호출되므로 두 번째 호출은 무시."""
+        if chat_turn.finished:
+            return
+        chat_turn.finished = True
+        del self._active_turns[chat_turn.session_id]
+        self._inflight_turns -= 1
+        self._inflight_semaphore.release()
+
+    async def stream_turn(self, chat_turn: ChatTurn, message: str) -> t.AsyncIterator[str]:
+        """start_turn 이후 호출. 사용자 메세지 한 turn의 graph 이벤트를 SSE 문자열로 yield."""
+        session_id = chat_turn.session_id
+        event_queue = asyncio.Queue(maxsize=self.queue_size)
+        started_at = time.monotonic()
+
+        async def produce_events():
+            try:
+                async for graph_event in self.graph.astream_events(
+                    {"messages": [HumanMessage(content=message)]},
+                    config={"configurable": {"thread_id": session_id}},
+                    version="v2",
+                ):
+                    sse_event = _to_sse_event(graph_event)
+                    if sse_event is not None:
+                        # queue가 가득 차면 client가 읽을 때까지 graph 진행을 멈춤
+                        await event_queue.put(sse_event)
+                await event_queue.put(_format_sse("done", {"elapsed_seconds": round(time.monotonic() - started_at, 3)}))
+            except asyncio.CancelledError:
+                raise
+            except Exception as graph_error:
+                print(f"[ChatSessionManager] session '{session_id}' failed: {graph_error}")
+                await event_queue.put(_format_sse("error", {"message": str(graph_error)}))
+            await event_queue.put(None)
+
+        producer_task = asyncio.create_task(produce_events())
+        try:
+            while (sse_event := await event_queue.get()) is not None:
+                yield sse_event
+            self.completed_turns += 1
+        finally:
+            # client 연결이 끊기면 진행 중인 graph도 취소
+            producer_task.cancel()
+            self.finish_turn(chat_turn)
+
+    async def delete_session(self, session_id: str):
+        # 진행 중인 turn이 지운 thread에 checkpoint를 다시 쓰지 않도록 turn이 끝난 뒤에만 삭제
+        if session_id in self._active_turns:
+            raise HTTPException(status_code=409, detail=f"session '{session_id}' has a running turn, retry after it ends")
+        await self.checkpointer.adelete_thread(session_id)
+
+    def stats(self) -> t.Dict[str, int]:
+        return {
+            "inflight_sessions": self._inflight_turns,
+            "waiting_sessions": len(self._active_turns) - self._inflight_turns,
+            "max_inflight_sessions": self.max_inflight_sessions,
+            "completed_turns": self.completed_turns,
+            "rejected_turns": self.rejected_turns,
+        }
+
+
+class ChatTurnStreamingResponse(StreamingResponse):
+    """turn의 SSE 응답. body 전송이 시작되기 전에 client 연결이 끊겨도 응답이 끝나면 turn을 반환."""
+
+    def __init__(self, chat_session_manager: ChatSessionManager, chat_turn: ChatTurn, message: str):
+        super().__init__(
+            chat_session_manager.stream_turn(chat_turn, message),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+        self.chat_session_manager = chat_session_manager
+        self.chat_turn = chat_turn
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            # 시작된 body는 닫아서 graph 실행을 취소, 시작되지 않은 body는 여기서 turn 반환
+            await self.body_iterator.aclose()
+            self.chat_session_manager.finish_turn(self.chat_turn)
+
+
+app = FastAPI(title="arxiv paper multi agent chat server")
+chat_session_manager = ChatSessionManager()
+
+
+@app.post("/chat/{session_id}")
+async def chat(session_id: str, chat_request: ChatRequest) -> StreamingResponse:
+    chat_turn = await chat_session_manager.start_turn(session_id)
+
+    return ChatTurnStreamingResponse(chat_session_manager, chat_turn, chat_request.message)
+
+
+@app.delete("/chat/{session_id}")
+async def delete_chat(session_id: str) -> t.Dict[str, str]:
+    await chat_session_manager.delete_session(session_id)
+
+    return {"session_id": session_id}
+
+
+@app.get("/health")
+async def health() -> t.Dict[str, int]:
+    return chat_session_manager.stats()
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host=SERVER_HOST, port=SERVER_PORT)
@@ -1,4 +1,74 @@
 CHAT_MODEL = "gpt-4o-mini"
 CHAT_SEED = 42
-RECENT_PAPER_SEARCH_RSS_FORMAT = "https://export.arxiv.org/api/query?search_query=cat:{}&start=0&max_results=5&sortBy=submittedDate&sortOrder=descending"
 PDF_DOWNLOAD_DIR = "./pdfs"
+INDEX_EXTRACT_MAX_CONCURRENCY = 8
+INDEX_EXTRACT_WINDOW_TOKENS = 6000
+PAPER_INDEX_CACHE_PATH = f"{PDF_DOWNLOAD_DIR}/paper_index_cache.sqlite3"
+PAPER_INDEX_CACHE_MAX_ENTRIES = 256
+SECTION_CONTENT_MAX_TOKENS = 2000
+PDF_CACHE_MAX_DOCUMENTS = 16
+PDF_CACHE_MAX_BYTES = 256 * 1024 * 1024
+PDF_DOWNLOAD_MAX_WORKERS = 4
+PDF_DOWNLOAD_TIMEOUT = (5.0, 60.0)
+PDF_DOWNLOAD_MAX_RETRIES = 3
+# 재시도를 포함한 pdf 하나의 다운로드 시간 제한, search_paper_by_arxiv_id tool timeout보다 짧게 둠
+PDF_DOWNLOAD_MAX_SECONDS = 150.0
+ARXIV_API_TIMEOUT = (5.0, 30.0)
+ARXIV_METADATA_CACHE_PATH = f"{PDF_DOWNLOAD_DIR}/arxiv_metadata.json"
+ARXIV_API_QUERY_FORMAT = "https://export.arxiv.org/api/query?search_query={search_query}&start={start}&max_results={max_results}&sortBy=submittedDate&sortOrder=descending"
+ARXIV_ENTRY_STORE_PATH = f"{PDF_DOWNLOAD_DIR}/arxiv_entries.sqlite3"
+RECENT_PAPER_SYNC_TTL_SECONDS = 30 * 60
+RECENT_PAPER_MAX_RESULTS = 5
+# 'template': entry를 바로 markdown으로 변환, 'llm': llm으로 다시 쓰기/번역
+RECENT_PAPER_MARKDOWN_MODE = "template"
+# local category 분류 결과가 이 값보다 낮으면 llm으로 분류
+RECENT_PAPER_TYPE_MIN_CONFIDENCE = 0.85
+RSS_FEED_CACHE_TTL_SECONDS = 5 * 60
+RSS_FEED_CACHE_MAX_ENTRIES = 256
+RSS_FEED_TIMEOUT = (5.0, 30.0)
+ENTRY_SUMMARY_ENABLED = True
+ENTRY_SUMMARY_CACHE_PATH = f"{PDF_DOWNLOAD_DIR}/entry_summaries.sqlite3"
+ENTRY_SUMMARY_BATCH_SIZE = 20
+ENTRY_SUMMARY_MAX_CONCURRENCY = 4
+ENTRY_SUMMARY_FALLBACK_MAX_CHARS = 600
+AGENT_RESPONSE_CACHE_MODE = "memory"
+AGENT_RESPONSE_CACHE_PATH = f"{PDF_DOWNLOAD_DIR}/agent_responses.sqlite3"
+AGENT_RESPONSE_CACHE_MAX_ENTRIES = 512
+HISTORY_MAX_TOKENS = 6000
+HISTORY_KEEP_RECENT_MESSAGES = 6
+HISTORY_TOOL_STUB_CHARS = 300
+PRE_ROUTER_ENABLED = True
+# tool 내부 llm 요청 제한(실행 중인 tool thread는 중단할 수 없으므로 요청 단위로 끝나도록)
+LLM_REQUEST_TIMEOUT_SECONDS = 60.0
+LLM_REQUEST_MAX_RETRIES = 2
+# 라우팅 태그가 나오면 생성 중단(agent_node에서 잘린 마크를 복원)
+AGENT_STOP_SEQUENCES = ["</next_agent>"]
+# tool worker pool 크기. tool들은 blocking i/o이므로 동시 대화 수(SERVER_MAX_INFLIGHT_SESSIONS)만큼 둬서
+# 한 tool의 동시 실행 제한을 기다리는 call이 다른 tool call의 worker를 막지 않도록 함
+TOOL_EXECUTOR_MAX_WORKERS = 64
+# tool별 실행 제한: max_concurrency(동시 실행 수), min_interval_seconds(호출 시작 간격), timeout_seconds
+TOOL_CALL_DEFAULT_LIMIT = {"max_concurrency": 4, "min_interval_seconds": 0.0, "timeout_seconds": 120.0}
+TOOL_CALL_LIMITS = {
+    "search_paper_by_arxiv_id": {"max_concurrency": 2, "min_interval_seconds": 3.0, "timeout_seconds": 180.0},
+    "paper_index_extract": {"max_concurrency": 2, "timeout_seconds": 300.0},
+    "get_recent_upload_papers": {"max_concurrency": 2, "min_interval_seconds": 3.0, "timeout_seconds": 60.0},
+    "get_user_question_part_contents": {"timeout_seconds": 30.0},
+    "duckduckgo_search": {"max_concurrency": 1, "min_interval_seconds": 1.0, "timeout_seconds": 30.0},
+}
+# tool 결과 cache: off | memory | sqlite
+TOOL_RESULT_CACHE_MODE = "sqlite"
+TOOL_RESULT_CACHE_PATH = f"{PDF_DOWNLOAD_DIR}/tool_results.sqlite3"
+TOOL_RESULT_CACHE_MAX_ENTRIES = 512
+# tool별 cache TTL(초), None은 만료 없음. InjectedState를 쓰는 tool(get_user_question_part_contents)은 cache하지 않음.
+# paper_index_extract는 PaperIndexCache(pdf 내용 hash + model + prompt hash)가 담당하므로 여기서 cache하지 않음.
+TOOL_RESULT_CACHE_TTLS = {
+    "search_paper_by_arxiv_id": None,
+    "get_recent_upload_papers": 10 * 60,
+    "duckduckgo_search": 60 * 60,
+}
+SINGLE_FLIGHT_LOCK_DIR = f"{PDF_DOWNLOAD_DIR}/.locks"
+SERVER_HOST = "0.0.0.0"
+SERVER_PORT = 8000
+SERVER_MAX_INFLIGHT_SESSIONS = 64
+SERVER_SESSION_QUEUE_SIZE = 256
+SERVER_ACQUIRE_TIMEOUT_SECONDS = 5.0
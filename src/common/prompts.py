@@ -18,61 +18,83 @@ Answer: ["2401.15884"]
 ]
 
 
+RECENT_PAPER_TYPES = {
+    "cs.AI": ("인공지능", "Artificial Intelligence"),
+    "cs.CL": ("계산 및 언어", "Computation and Language, NLP"),
+    "cs.CC": ("계산 이론", "Computational Complexity"),
+    "cs.CE": ("계산 및 엔지니어링", "Computational Engineering, Finance, and Science"),
+    "cs.CG": ("컴퓨터 그래픽스", "Computational Geometry"),
+    "cs.GT": ("게임 이론", "Computer Science and Game Theory"),
+    "cs.CV": ("컴퓨터 비전 및 패턴 인식", "Computer Vision and Pattern Recognition"),
+    "cs.CY": ("컴퓨터 및 사회", "Computers and Society"),
+    "cs.CR": ("암호학 및 보안", "Cryptography and Security"),
+    "cs.DS": ("데이터 구조 및 알고리즘", "Data Structures and Algorithms"),
+    "cs.DB": ("데이터베이스", "Databases"),
+    "cs.DL": ("디지털 라이브러리", "Digital Libraries"),
+    "cs.DM": ("이산 수학", "Discrete Mathematics"),
+    "cs.DC": ("분산, 병렬 및 클러스터 컴퓨팅", "Distributed, Parallel, and Cluster Computing"),
+    "cs.ET": ("신뢰성", "Emerging Technologies"),
+    "cs.FL": ("형식 언어 및 자동 이론", "Formal Languages and Automata Theory"),
+    "cs.GL": ("일반 문서", "General Literature"),
+    "cs.GR": ("그래픽스", "Graphics"),
+    "cs.AR": ("하드웨어 아키텍처", "Hardware Architecture"),
+    "cs.HC": ("인간-컴퓨터 상호작용", "Human-Computer Interaction"),
+    "cs.IR": ("정보 검색", "Information Retrieval"),
+    "cs.IT": ("정보 이론", "Information Theory"),
+    "cs.LG": ("기계 학습", "Machine Learning"),
+    "cs.LO": ("논리", "Logic in Computer Science"),
+    "cs.MS": ("멀티미디어", "Multimedia"),
+    "cs.MA": ("멀티에이전트 시스템", "Multiagent Systems"),
+    "cs.NI": ("네트워크 및 인터넷 아키텍처", "Networking and Internet Architecture"),
+    "cs.NE": ("신경망 및 유전적 알고리즘", "Neural and Evolutionary Computing"),
+    "cs.NA": ("수치 해석", "Numerical Analysis"),
+    "cs.OS": ("운영 체제", "Operating Systems"),
+    "cs.OH": ("기타", "Other"),
+    "cs.PF": ("성능", "Performance"),
+    "cs.PL": ("프로그래밍 언어", "Programming Languages"),
+    "cs.RO": ("로보틱스", "Robotics"),
+    "cs.SE": ("소프트웨어 공학", "Software Engineering"),
+    "cs.SD": ("소리", "Sound"),
+    "cs.SC": ("과학 컴퓨팅", "Scientific Computing"),
+    "cs.SI": ("소셜 및 정보 네트워크", "Social and Information Networks"),
+    "cs.SY": ("시스템 및 제어", "Systems and Control"),
+}
+RECENT_PAPER_TYPE_BULLETS = "\n".join(
+    f"• {paper_type}: {korean_name} ({english_name})"
+    for paper_type, (korean_name, english_name) in RECENT_PAPER_TYPES.items()
+)
+
+
 EXTRACT_RECENT_PAPER_TYPE_PROMPT = [
     """
 Extract the arxiv rss paper type the user wants through user input.
 
 Below, I'll give you example of rss paper types:
-• cs.AI: 인공지능 (Artificial Intelligence)
-• cs.CL: 계산 및 언어 (Computation and Language, NLP)
-• cs.CC: 계산 이론 (Computational Complexity)
-• cs.CE: 계산 및 엔지니어링 (Computational Engineering, Finance, and Science)
-• cs.CG: 컴퓨터 그래픽스 (Computational Geometry)
-• cs.GT: 게임 이론 (Computer Science and Game Theory)
-• cs.CV: 컴퓨터 비전 및 패턴 인식 (Computer Vision and Pattern Recognition)
-• cs.CY: 컴퓨터 및 사회 (Computers and Society)
-• cs.CR: 암호학 및 보안 (Cryptography and Security)
-• cs.DS: 데이터 구조 및 알고리즘 (Data Structures and Algorithms)
-• cs.DB: 데이터베이스 (Databases)
-• cs.DL: 디지털 라이브러리 (Digital Libraries)
-• cs.DM: 이산 수학 (Discrete Mathematics)
-• cs.DC: 분산, 병렬 및 클러스터 컴퓨팅 (Distributed, Parallel, and Cluster Computing)
-• cs.ET: 신뢰성 (Emerging Technologies)
-• cs.FL: 형식 언어 및 자동 이론 (Formal Languages and Automata Theory)
-• cs.GL: 일반 문서 (General Literature)
-• cs.GR: 그래픽스 (Graphics)
-• cs.AR: 하드웨어 아키텍처 (Hardware Architecture)
-• cs.HC: 인간-컴퓨터 상호작용 (Human-Computer Interaction)
-• cs.IR: 정보 검색 (Information Retrieval)
-• cs.IT: 정보 이론 (Information Theory)
-• cs.LG: 기계 학습 (Machine Learning)
-• cs.LO: 논리 (Logic in Computer Science)
-• cs.MS: 멀티미디어 (Multimedia)
-• cs.MA: 멀티에이전트 시스템 (Multiagent Systems)
-• cs.NI: 네트워크 및 인터넷 아키텍처 (Networking and Internet Architecture)
-• cs.NE: 신경망 및 유전적 알고리즘 (Neural and Evolutionary Computing)
-• cs.NA: 수치 해석 (Numerical Analysis)
-• cs.OS: 운영 체제 (Operating Systems)
-• cs.OH: 기타 (Other)
-• cs.PF: 성능 (Performance)
-• cs.PL: 프로그래밍 언어 (Programming Languages)
-• cs.RO: 로보틱스 (Robotics)
-• cs.SE: 소프트웨어 공학 (Software Engineering)
-• cs.SD: 소리 (Sound)
-• cs.SC: 과학 컴퓨팅 (Scientific Computing)
-• cs.SI: 소셜 및 정보 네트워크 (Social and Information Networks)
-• cs.SY: 시스템 및 제어 (Systems and Control)
-
-Must return only rss paper type to user.
+"""
+    + RECENT_PAPER_TYPE_BULLETS
+    + """
+
+Must return only rss paper type to user. If user wants several types, return all of them separated by comma.
 <Example>
 user_input: 컴퓨터 비전 최신 논문들을 보고싶어
 Answer: cs.CV
 </Example>
+<Example>
+user_input: recent papers in NLP and IR
+Answer: cs.CL, cs.IR
+</Example>
 """,
     "extract arxiv paper type from user input:\nuser_input: {user_input}\nAnswer: ",
 ]
 
 
+EXTRACT_PAPER_INDEX_PROMPT = [
+    """주어지는 논문 페이지 내에서 목차들을 추출하세요. 목차의 번호와 제목이 '\\n'으로 끊어진 경우, 무조건 번호와 제목을 논문에 기입된 그대로 추출하세요. \n목차에는 다음과 같은 내용은 포함되지 않습니다:1) Figure, 2) Equation, 3) Table.\n특히 '\\n'기호 주변 문자들에 집중하세요, 일반적으로 목차는 줄바꿈을 통해 표기합니다. 또한 Abstract는 존재 시, 포함하세요.\n결과 텍스트는 아래 포맷을 따르세요:\n["목차1", "목차2", "목차3", ...] 현재 페이지 내에 목차 정보가 존재하지 않을 시, []를 반환하세요(주석 텍스트를 적는 것을 금자합니다!).""",
+    "given paper page:\n{range_page_texts}",
+    "알겠습니다. 주신 논문 페이지에서 목차를 추출하고 리턴 포맷에 맞춰 결과를 드리도록 하겠습니다.",
+]
+
+
 MAKE_MARKDOWN_FORMAT_RECENT_PAPER_SUMMARY_PROMPT = [
     """You are world class markdown maker. Please, make markdown format text using arxiv rss feed entries. 
 
@@ -111,11 +133,18 @@ If user want to explain mathematic concept, explain that with easy examples.
 ]
 
 
-SUMMARY_PATENT_SUMMARY_CONTENT_PROMPT = [
+SUMMARY_PAPER_ENTRIES_PROMPT = [
     """
-You're the world class summarizer. Please summarize the original outline of the paper in 2 to 3 lines.
+You're the world class summarizer. Please summarize the original outline of each paper in 2 to 3 lines.
+
+You will receive several papers as a JSON object of paper_id: original outline.
+Return only a JSON object that maps every given paper_id to its summary, and never add or drop paper_id.
+<Example>
+papers: {"2401.15884": "<outline 1>", "2401.15885": "<outline 2>"}
+Answer: {"2401.15884": "<summary 1>", "2401.15885": "<summary 2>"}
+</Example>
 """,
-    "summarize below text\ntext: {}\nAnswer: ",
+    "summarize below papers\npapers: {papers}\nAnswer: ",
 ]
 
 
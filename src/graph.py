@@ -4,14 +4,15 @@ import functools
 import typing as t
 
 from dotenv import load_dotenv
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import BaseMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, StateGraph
-from langgraph.prebuilt import ToolNode
 from langchain_community.tools import DuckDuckGoSearchRun
 
 # sys.path.append("/home/jminj/jminj/arxiv_paper_multi_agent")
 from src.agents.agent import AgentCreator
-from src.agents.agent_node import agent_node
+from src.agents.agent_node import agent_node, async_agent_node
+from src.agents.pre_router import PRE_ROUTER_NAME, pre_route, pre_router_node
 from src.agents.paper_agent.paper_agents import (
     arxiv_paper_search_agent,
     paper_team_leader_agent,
@@ -23,7 +24,9 @@ from src.agents.paper_agent.utils.paper_agent_utils import (
     search_paper_by_arxiv_id,
 )
 from src.agents.search_agent.search_agents import search_team_leader_agent
+from src.common.common import PRE_ROUTER_ENABLED
 from src.state import ArxivMultiAgentState
+from src.utils.parallel_tool_executor import ParallelToolExecutor
 
 load_dotenv(".env")
 
@@ -32,16 +35,8 @@ load_dotenv(".env")
 agent_creator = AgentCreator()
 supervisor_agent = agent_creator.create_supervisor_agent()
 
-## 2. agent node define
-supervisor_agent_node = functools.partial(agent_node, agent=supervisor_agent, name="supervisor")
-paper_team_leader_agent_node = functools.partial(
-    agent_node, agent=paper_team_leader_agent, name="paper_team_leader"
-)
-arxiv_paper_search_agent_node = functools.partial(
-    agent_node, agent=arxiv_paper_search_agent, name="arxiv_paper_searcher"
-)
-search_team_leader_agent_node = functools.partial(agent_node, agent=search_team_leader_agent, name="search_team_leader")
-tool_node = ToolNode(
+## 2. tool node define
+tool_node = ParallelToolExecutor(
     tools=[
         search_paper_by_arxiv_id,
         paper_index_extract,
@@ -49,11 +44,11 @@ tool_node = ToolNode(
         get_user_question_part_contents,
         DuckDuckGoSearchRun()
     ]
-)  # 추후 search tools도 적재
+)  # 한 메세지의 여러 tool call을 tool별 동시 실행/호출 간격/timeout 제한 내에서 동시에 실행
 
 
 ## 3. define router function
-def router(state):
+def router(state, next_roles: t.Collection[str], fallback_role: str = "supervisor"):
     # This is the router
     messages = state["messages"]
     last_message = messages[-1]
@@ -61,56 +56,122 @@ def router(state):
         return "call_tool"
     if "<FINISHED>" in last_message.content:
         return END
-    return state["next_role"]
+    # 이 node에서 갈 수 없는 role(태그 없는 답변에 남아있는 이전 next_role 등)은 fallback_role로
+    next_role = state.get("next_role")
+    return next_role if next_role in next_roles else fallback_role
 
 
-## 3. generate graph
-workflow = StateGraph(ArxivMultiAgentState)
-workflow.add_node("supervisor", supervisor_agent_node)
-workflow.add_node("paper_team_leader", paper_team_leader_agent_node)
-workflow.add_node("arxiv_paper_searcher", arxiv_paper_search_agent_node)
-workflow.add_node("search_team_leader", search_team_leader_agent_node)
-workflow.add_node("call_tool", tool_node)
+def _add_agent_edges(workflow: StateGraph, node_name: str, path_map: t.Dict[str, str], fallback_role: str = "supervisor"):
+    workflow.add_conditional_edges(
+        node_name, functools.partial(router, next_roles=set(path_map), fallback_role=fallback_role), path_map
+    )
 
-workflow.add_conditional_edges(
-    "supervisor", router, {"paper_team_leader": "paper_team_leader", "search_team_leader": "search_team_leader", END: END}
-)
-workflow.add_conditional_edges(
-    "paper_team_leader",
-    router,
-    {
-        "arxiv_paper_searcher": "arxiv_paper_searcher",
-        "call_tool": "call_tool",
-        "supervisor": "supervisor",
-        END: END,
-    },
-)
-workflow.add_conditional_edges(
-    "arxiv_paper_searcher",
-    router,
-    {"call_tool": "call_tool", "paper_team_leader": "paper_team_leader", END: END},
-)
-workflow.add_conditional_edges(
-    "search_team_leader",
-    router,
-    {
-        "call_tool": "call_tool",
-        "supervisor": "supervisor",
-        END: END,
-    },
-)
-workflow.add_conditional_edges(
-    "call_tool",
-    lambda x: x["sender"],
-    {
-        "paper_team_leader": "paper_team_leader",
-        "arxiv_paper_searcher": "arxiv_paper_searcher",
-        "search_team_leader": "search_team_leader"
-    },
-)
 
-workflow.set_entry_point("supervisor")
-graph = workflow.compile()
+## 4. generate graph
+def build_workflow(async_mode: bool = False) -> StateGraph:
+    """build multi agent workflow.
+
+    Args:
+        async_mode (bool): if True, agent nodes call agent.ainvoke and tool node runs tools on worker pool without blocking event loop.
+
+    Returns:
+        StateGraph: workflow to compile.
+    """
+    # 1. state graph
+    workflow = StateGraph(ArxivMultiAgentState)
+
+    # 2. agent/tool nodes(async 모드는 llm ainvoke, tool은 worker pool에서 실행)
+    node_function = async_agent_node if async_mode else agent_node
+    workflow.add_node("supervisor", functools.partial(node_function, agent=supervisor_agent, name="supervisor"))
+    workflow.add_node(
+        "paper_team_leader", functools.partial(node_function, agent=paper_team_leader_agent, name="paper_team_leader")
+    )
+    workflow.add_node(
+        "arxiv_paper_searcher", functools.partial(node_function, agent=arxiv_paper_search_agent, name="arxiv_paper_searcher")
+    )
+    workflow.add_node(
+        "search_team_leader", functools.partial(node_function, agent=search_team_leader_agent, name="search_team_leader")
+    )
+    workflow.add_node("call_tool", tool_node.ainvoke if async_mode else tool_node.invoke)
+    workflow.add_node(PRE_ROUTER_NAME, pre_router_node)
+
+    # 3. edges
+    workflow.add_conditional_edges(
+        PRE_ROUTER_NAME,
+        pre_route,
+        {
+            "supervisor": "supervisor",
+            "paper_team_leader": "paper_team_leader",
+            "arxiv_paper_searcher": "arxiv_paper_searcher",
+            END: END,
+        },
+    )
+    # supervisor의 태그 없는 답변은 사용자에게 직접 한 답변이므로 종료, 그 외 agent는 supervisor로
+    _add_agent_edges(
+        workflow,
+        "supervisor",
+        {"paper_team_leader": "paper_team_leader", "search_team_leader": "search_team_leader", END: END},
+        fallback_role=END,
+    )
+    _add_agent_edges(
+        workflow,
+        "paper_team_leader",
+        {
+            "arxiv_paper_searcher": "arxiv_paper_searcher",
+            "call_tool": "call_tool",
+            "supervisor": "supervisor",
+            END: END,
+        },
+    )
+    _add_agent_edges(
+        workflow,
+        "arxiv_paper_searcher",
+        {"call_tool": "call_tool", "paper_team_leader": "paper_team_leader", "supervisor": "supervisor", END: END},
+    )
+    _add_agent_edges(
+        workflow,
+        "search_team_leader",
+        {
+            "call_tool": "call_tool",
+            "supervisor": "supervisor",
+            END: END,
+        },
+    )
+    workflow.add_conditional_edges(
+        "call_tool",
+        lambda x: x["sender"],
+        {
+            "paper_team_leader": "paper_team_leader",
+            "arxiv_paper_searcher": "arxiv_paper_searcher",
+            "search_team_leader": "search_team_leader"
+        },
+    )
+
+    # 명확한 요청은 pre_router가 supervisor llm 호출 없이 바로 분기, 그 외는 supervisor로
+    workflow.set_entry_point(PRE_ROUTER_NAME if PRE_ROUTER_ENABLED else "supervisor")
+
+    return workflow
+
+
+graph = build_workflow().compile()
+async_graph = build_workflow(async_mode=True).compile()
+
+
+async def astream_graph(
+    messages: t.Sequence[BaseMessage], config: t.Optional[RunnableConfig] = None, stream_mode: str = "updates"
+) -> t.AsyncIterator[t.Dict[str, object]]:
+    """stream node events of async graph. many conversations can run concurrently in one event loop.
+
+    Args:
+        messages (t.Sequence[BaseMessage]): input messages.
+        config (t.Optional[RunnableConfig]): graph config.
+        stream_mode (str): langgraph stream mode.
+
+    Yields:
+        t.Dict[str, object]: node event.
+    """
+    async for event in async_graph.astream({"messages": list(messages)}, config=config, stream_mode=stream_mode):
+        yield event
 
 
 if __name__ == "__main__":
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import typing as t
+import warnings
+from collections import OrderedDict
+
+from langchain_core._api import LangChainBetaWarning
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+from src.common.common import (
+    AGENT_RESPONSE_CACHE_MAX_ENTRIES,
+    AGENT_RESPONSE_CACHE_MODE,
+    AGENT_RESPONSE_CACHE_PATH,
+)
+
+# off: cache 미사용, memory: 프로세스 내 LRU, sqlite: 디스크 저장(record), replay: 디스크에서만 읽고 miss 시 에러
+AGENT_RESPONSE_CACHE_MODES = ["off", "memory", "sqlite", "replay"]
+
+
+class ResponseCacheMissError(Exception):
+    """replay 모드에서 기록되지 않은 llm 요청이 들어왔을 때 발생"""
+
+
+def get_response_cache_key(prompt:str, llm_string:str)->str:
+    """llm 설정(model, bind된 tools, stop 등)과 직렬화된 message 리스트로 cache key를 계산
+
+    Args:
+        prompt (str): langchain이 직렬화한 message 리스트
+        llm_string (str): langchain이 직렬화한 llm 설정
+
+    Returns:
+        str: sha256 key
+    """
+    return hashlib.sha256(f"{llm_string}\n{prompt}".encode("utf-8")).hexdigest()
+
+
+class MemoryResponseCache(BaseCache):
+    """프로세스 내 LRU response cache"""
+
+    def __init__(self, max_entries:int=AGENT_RESPONSE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, prompt:str, llm_string:str)->t.Optional[RETURN_VAL_TYPE]:
+        cache_key = get_response_cache_key(prompt, llm_string)
+        with self._lock:
+            cached_generations = self._entries.get(cache_key)
+            if cached_generations is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+
+            return cached_generations
+
+    def update(self, prompt:str, llm_string:str, return_val:RETURN_VAL_TYPE):
+        cache_key = get_response_cache_key(prompt, llm_string)
+        with self._lock:
+            self._entries[cache_key] = return_val
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self, **kwargs:t.Any):
+        with self._lock:
+            self._entries.clear()
+
+
+class SqliteResponseCache(BaseCache):
+    """sqlite에 llm 응답을 기록하는 response cache. replay=True면 기록 없이 읽기만 하고 miss 시 ResponseCacheMissError 발생."""
+
+    def __init__(self, db_path:str, replay:bool=False):
+        self.db_path = db_path
+        self.replay = replay
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS agent_responses (
+                cache_key TEXT PRIMARY KEY,
+                llm_string TEXT NOT NULL,
+                generations TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def lookup(self, prompt:str, llm_string:str)->t.Optional[RETURN_VAL_TYPE]:
+        cache_key = get_response_cache_key(prompt, llm_string)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT generations FROM agent_responses WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if row is None:
+            if self.replay:
+                raise ResponseCacheMissError(f"no recorded response for key {cache_key} in {self.db_path}")
+            return None
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=LangChainBetaWarning)
+            return [loads(generation) for generation in json.loads(row[0])]
+
+    def update(self, prompt:str, llm_string:str, return_val:RETURN_VAL_TYPE):
+        if self.replay:
+            return
+        cache_key = get_response_cache_key(prompt, llm_string)
+        serialized_generations = json.dumps([dumps(generation) for generation in return_val])
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO agent_responses (cache_key, llm_string, generations) VALUES (?, ?, ?)",
+                (cache_key, llm_string, serialized_generations),
+            )
+            self._conn.commit()
+
+    def clear(self, **kwargs:t.Any):
+        with self._lock:
+            self._conn.execute("DELETE FROM agent_responses")
+            self._conn.commit()
+
+
+def create_agent_response_cache(
+    cache_mode:t.Optional[str]=None, cache_path:t.Optional[str]=None
+)->t.Optional[BaseCache]:
+    """cache 모드에 맞는 response cache 생성. 인자가 없으면 환경변수 -> common 설정 순으로 사용.
+
+    - AGENT_RESPONSE_CACHE_MODE: off | memory | sqlite | replay
+    - AGENT_RESPONSE_CACHE_PATH: sqlite/replay 모드 db 경로
+
+    Args:
+        cache_mode (t.Optional[str]): cache 모드
+        cache_path (t.Optional[str]): sqlite db 경로
+
+    Returns:
+        t.Optional[BaseCache]: off 모드면 None
+    """
+    cache_mode = cache_mode or os.getenv("AGENT_RESPONSE_CACHE_MODE", AGENT_RESPONSE_CACHE_MODE)
+    cache_path = cache_path or os.getenv("AGENT_RESPONSE_CACHE_PATH", AGENT_RESPONSE_CACHE_PATH)
+    if cache_mode not in AGENT_RESPONSE_CACHE_MODES:
+        raise ValueError(f"unknown agent response cache mode '{cache_mode}', choose one of {AGENT_RESPONSE_CACHE_MODES}")
+
+    if cache_mode == "off":
+        return None
+    if cache_mode == "memory":
+        return MemoryResponseCache()
+
+    return SqliteResponseCache(cache_path, replay=cache_mode == "replay")
+
+
+_agent_response_cache = None
+_agent_response_cache_lock = threading.Lock()
+
+
+def get_agent_response_cache()->t.Optional[BaseCache]:
+    """모든 AgentCreator가 공유하는 response cache를 반환"""
+    global _agent_response_cache
+    with _agent_response_cache_lock:
+        if _agent_response_cache is None:
+            # off 모드(None)도 매번 다시 생성하지 않도록 False로 기록
+            _agent_response_cache = create_agent_response_cache() or False
+
+    return _agent_response_cache or None
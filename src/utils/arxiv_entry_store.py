@@ -0,0 +1,243 @@
+import datetime
+import functools
+import os
+import sqlite3
+import threading
+import time
+import typing as t
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+from src.common.common import (
+    ARXIV_API_QUERY_FORMAT,
+    ARXIV_ENTRY_STORE_PATH,
+    RECENT_PAPER_SYNC_TTL_SECONDS,
+)
+from src.utils.get_rss_url_values import get_processed_entries_from_rss_url
+
+ENTRY_COLUMNS = ["paper_id", "title", "authors", "tags", "summary", "submitted"]
+
+
+def _to_submitted_date_query(submitted:str)->str:
+    # '2024-01-30T18:59:59Z' -> '202401301859' (arxiv api submittedDate 범위 포맷)
+    submitted_datetime = datetime.datetime.strptime(submitted, "%Y-%m-%dT%H:%M:%SZ")
+    return submitted_datetime.strftime("%Y%m%d%H%M")
+
+
+class ArxivEntryStore:
+    """category별 arxiv 최신 entry들을 sqlite에 보관하고, 마지막으로 본 제출일 이후 entry만 증분 동기화하는 store"""
+
+    def __init__(
+        self,
+        db_path:str,
+        api_query_format:str=ARXIV_API_QUERY_FORMAT,
+        sync_ttl_seconds:float=RECENT_PAPER_SYNC_TTL_SECONDS,
+        sync_page_size:int=50,
+        sync_page_delay_seconds:float=3.0,
+    ):
+        self.db_path = db_path
+        # 저장해 둔 Atom feed를 local server로 띄워 테스트할 수 있도록 api url 포맷을 주입 가능하게 함
+        self.api_query_format = api_query_format
+        self.sync_ttl_seconds = sync_ttl_seconds
+        self.sync_page_size = sync_page_size
+        # 여러 페이지를 요청할 때 페이지 사이 대기 시간(arxiv api 권장 3초)
+        self.sync_page_delay_seconds = sync_page_delay_seconds
+        self._lock = threading.Lock()
+        self._refreshing_categories = set()
+        # category -> 최신순으로 채워 본 최대 entry 수(그보다 적게 저장돼 있으면 arxiv에도 그만큼만 있음)
+        self._filled_counts = {}
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                paper_id TEXT PRIMARY KEY,
+                title TEXT,
+                authors TEXT,
+                tags TEXT,
+                summary TEXT,
+                submitted TEXT
+            );
+            CREATE TABLE IF NOT EXISTS entry_categories (
+                category TEXT NOT NULL,
+                paper_id TEXT NOT NULL,
+                PRIMARY KEY (category, paper_id)
+            );
+            CREATE TABLE IF NOT EXISTS sync_states (
+                category TEXT PRIMARY KEY,
+                last_submitted TEXT,
+                last_synced_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_submitted ON entries (submitted);
+            """
+        )
+        self._conn.commit()
+
+    def _get_sync_state(self, category:str)->t.Optional[t.Tuple[t.Optional[str], float]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT last_submitted, last_synced_at FROM sync_states WHERE category = ?", (category,)
+            ).fetchone()
+
+    def _build_sync_url(self, category:str, last_submitted:t.Optional[str], start:int)->str:
+        search_query = f"cat:{category}"
+        if last_submitted is not None:
+            # 마지막으로 본 제출일(분 단위 포함) 이후 entry만 요청
+            search_query += f" AND submittedDate:[{_to_submitted_date_query(last_submitted)} TO 999912312359]"
+
+        return self.api_query_format.format(
+            search_query=urllib.parse.quote(search_query, safe=":"),
+            start=start,
+            max_results=self.sync_page_size,
+        )
+
+    def upsert_entries(self, category:str, entries:t.Sequence[t.Dict]):
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO entries ({', '.join(ENTRY_COLUMNS)}) VALUES ({', '.join('?' * len(ENTRY_COLUMNS))})",
+                [tuple(entry[column] for column in ENTRY_COLUMNS) for entry in entries],
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO entry_categories (category, paper_id) VALUES (?, ?)",
+                [(category, entry["paper_id"]) for entry in entries],
+            )
+            self._conn.commit()
+
+    def count_entries(self, category:str)->int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM entry_categories WHERE category = ?", (category,)
+            ).fetchone()[0]
+
+    def sync_category(self, category:str, min_entries:int=0)->int:
+        """category의 마지막 제출일 이후 entry들을 arxiv api에서 가져와 저장.
+        저장된 entry가 min_entries보다 적으면 최신순으로 min_entries개 이상이 될 때까지 채운다.
+
+        Args:
+            category (str): arxiv category. ex) cs.CL
+            min_entries (int): store에 있어야 하는 최소 entry 수
+
+        Returns:
+            int: 받은 entry 수
+        """
+        sync_state = self._get_sync_state(category)
+        last_submitted = sync_state[0] if sync_state else None
+        # entry가 충분하면 마지막 제출일 이후만 요청하고, 부족하면 제출일 조건 없이 최신순으로 요청
+        fill_entries = last_submitted is None or self.count_entries(category) < min_entries
+        since_submitted = None if fill_entries else last_submitted
+
+        # 새 entry가 페이지 크기보다 많아도 빠지지 않도록, 결과가 끝나거나 마지막 제출일에 닿을 때까지 페이지를 넘김
+        synced_entries = []
+        start = 0
+        while True:
+            page_entries = get_processed_entries_from_rss_url(self._build_sync_url(category, since_submitted, start))
+            synced_entries.extend(page_entries)
+            start += self.sync_page_size
+            if len(page_entries) < self.sync_page_size:
+                break
+            reached_last_submitted = last_submitted is None or page_entries[-1]["submitted"] <= last_submitted
+            if reached_last_submitted and len(synced_entries) >= min_entries:
+                break
+            time.sleep(self.sync_page_delay_seconds)
+        if fill_entries:
+            with self._lock:
+                self._filled_counts[category] = max(self._filled_counts.get(category, 0), min_entries)
+
+        self.upsert_entries(category, synced_entries)
+        submitted_dates = [entry["submitted"] for entry in synced_entries]
+        if last_submitted is not None:
+            submitted_dates.append(last_submitted)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_states (category, last_submitted, last_synced_at) VALUES (?, ?, ?)",
+                (category, max(submitted_dates) if submitted_dates else None, time.time()),
+            )
+            self._conn.commit()
+
+        return len(synced_entries)
+
+    def _refresh_in_background(self, category:str):
+        with self._lock:
+            if category in self._refreshing_categories:
+                return
+            self._refreshing_categories.add(category)
+
+        def refresh():
+            try:
+                self.sync_category(category)
+            except Exception as sync_error:
+                print(f"[ArxivEntryStore] background sync of '{category}' failed: {sync_error}")
+            finally:
+                with self._lock:
+                    self._refreshing_categories.discard(category)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def query_recent_entries(self, category:str, max_results:int)->t.List[t.Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join('entries.' + column for column in ENTRY_COLUMNS)} FROM entries "
+                "JOIN entry_categories ON entries.paper_id = entry_categories.paper_id "
+                "WHERE entry_categories.category = ? ORDER BY entries.submitted DESC LIMIT ?",
+                (category, max_results),
+            ).fetchall()
+
+        return [dict(zip(ENTRY_COLUMNS, row)) for row in rows]
+
+    def get_recent_entries(self, category:str, max_results:int)->t.List[t.Dict]:
+        """category의 최신 entry들을 store에서 반환. 처음 조회하거나 저장된 entry가 max_results보다 적은 category는
+        동기화 후 반환하고, TTL이 지난 category는 저장된 값을 먼저 반환하면서 background로 동기화한다.
+
+        Args:
+            category (str): arxiv category. ex) cs.CL
+            max_results (int): 반환할 최대 entry 수
+
+        Returns:
+            t.List[t.Dict]: 제출일 내림차순 entry들
+        """
+        sync_state = self._get_sync_state(category)
+        needs_fill = max_results > self._filled_counts.get(category, 0) and self.count_entries(category) < max_results
+        if sync_state is None or needs_fill:
+            self.sync_category(category, min_entries=max_results)
+        elif time.time() - sync_state[1] > self.sync_ttl_seconds:
+            self._refresh_in_background(category)
+
+        return self.query_recent_entries(category, max_results)
+
+    def get_recent_entries_for_categories(
+        self, categories:t.Sequence[str], max_results_per_category:int, max_workers:int=8
+    )->t.List[t.Dict]:
+        """여러 category의 최신 entry들을 동시에 가져와 paper_id로 중복 제거 후 제출일 내림차순으로 병합
+
+        Args:
+            categories (t.Sequence[str]): arxiv category들. ex) ["cs.CL", "cs.IR"]
+            max_results_per_category (int): category별 최대 entry 수
+            max_workers (int): 동시에 조회할 최대 category 수
+
+        Returns:
+            t.List[t.Dict]: 병합된 entry들
+        """
+        categories = list(dict.fromkeys(categories))
+        if len(categories) <= 1:
+            category_entries = [self.get_recent_entries(category, max_results_per_category) for category in categories]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(categories))) as executor:
+                category_entries = list(
+                    executor.map(lambda category: self.get_recent_entries(category, max_results_per_category), categories)
+                )
+
+        merged_entries = {}
+        for entries in category_entries:
+            for entry in entries:
+                merged_entries.setdefault(entry["paper_id"], entry)
+
+        return sorted(merged_entries.values(), key=lambda entry: entry["submitted"] or "", reverse=True)
+
+
+@functools.lru_cache(maxsize=None)
+def get_arxiv_entry_store(db_path:str=ARXIV_ENTRY_STORE_PATH)->ArxivEntryStore:
+    """프로세스 내에서 공유하는 ArxivEntryStore를 반환"""
+    return ArxivEntryStore(db_path)
@@ -0,0 +1,144 @@
+import json
+import os
+import re
+import threading
+import typing as t
+
+import arxiv
+import requests
+
+from src.common.common import ARXIV_API_TIMEOUT, ARXIV_METADATA_CACHE_PATH
+
+_NEW_STYLE_ID_PATTERN = re.compile(r"(\d{4})\.?(\d{4,5})(v\d+)?$")
+_OLD_STYLE_ID_PATTERN = re.compile(r"([a-z\-]+(\.[A-Z]{2})?/\d{7})(v\d+)?$")
+_NORMALIZED_ID_PATTERN = re.compile(r"\d{4}\.\d{4,5}|[a-z\-]+(\.[A-Z]{2})?/\d{7}")
+
+
+def normalize_arxiv_id(raw_arxiv_id:str)->str:
+    """여러 형태의 arxiv id를 version 없는 표준 id로 변환
+
+    ex) '2401.15884', '240115884', 'arXiv:2401.15884v2', 'https://arxiv.org/abs/2401.15884' -> '2401.15884'
+
+    Args:
+        raw_arxiv_id (str): 사용자/llm이 준 arxiv id
+
+    Returns:
+        str: 정규화된 arxiv id
+    """
+    arxiv_id = raw_arxiv_id.strip()
+    arxiv_id = re.sub(r"^(https?://)?(export\.)?arxiv\.org/(abs|pdf)/", "", arxiv_id)
+    arxiv_id = re.sub(r"^arxiv:", "", arxiv_id, flags=re.IGNORECASE)
+    arxiv_id = re.sub(r"\.pdf$", "", arxiv_id)
+
+    new_style_match = _NEW_STYLE_ID_PATTERN.search(arxiv_id)
+    if new_style_match:
+        return f"{new_style_match.group(1)}.{new_style_match.group(2)}"
+    old_style_match = _OLD_STYLE_ID_PATTERN.search(arxiv_id)
+    if old_style_match:
+        return old_style_match.group(1)
+
+    return arxiv_id
+
+
+def is_valid_arxiv_id(arxiv_id:str)->bool:
+    """정규화된 id가 arxiv id 형식(ex. '2401.15884', 'cs/0112017')인지 검사"""
+    return _NORMALIZED_ID_PATTERN.fullmatch(arxiv_id) is not None
+
+
+def get_arxiv_pdf_file_name(arxiv_id:str)->str:
+    # old style id('cs/0112017')의 '/'는 파일명에 쓸 수 없으므로 '_'로 변경
+    return f"{arxiv_id.replace('/', '_')}.pdf"
+
+
+class ArxivMetadataCache:
+    """arxiv id -> {paper_id, title, pdf_url} metadata를 json 파일로 보관하는 cache"""
+
+    def __init__(self, cache_path:str):
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        self._metadatas = {}
+        if os.path.isfile(cache_path):
+            with open(cache_path, "r", encoding="utf-8") as cache_file:
+                self._metadatas = json.load(cache_file)
+
+    def get(self, arxiv_id:str)->t.Optional[t.Dict[str, str]]:
+        return self._metadatas.get(arxiv_id)
+
+    def update(self, metadatas:t.Dict[str, t.Dict[str, str]]):
+        if not metadatas:
+            return
+        with self._lock:
+            self._metadatas.update(metadatas)
+            cache_dir = os.path.dirname(self.cache_path)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            temp_cache_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(temp_cache_path, "w", encoding="utf-8") as cache_file:
+                json.dump(self._metadatas, cache_file, ensure_ascii=False)
+            os.replace(temp_cache_path, self.cache_path)
+
+
+_arxiv_metadata_cache = None
+
+
+class _TimeoutSession(requests.Session):
+    """timeout 없이 호출되는 요청에 기본 connect/read timeout을 적용하는 session"""
+
+    def __init__(self, timeout:t.Tuple[float, float]):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, *args, **kwargs)->requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(*args, **kwargs)
+
+
+_arxiv_client = arxiv.Client(page_size=100, delay_seconds=3.0, num_retries=3)
+# arxiv.Client는 timeout 없이 요청하므로 응답 없는 api 호출이 tool worker를 계속 점유하지 않도록 session 교체
+_arxiv_client._session = _TimeoutSession(ARXIV_API_TIMEOUT)
+
+
+def _get_arxiv_metadata_cache()->ArxivMetadataCache:
+    global _arxiv_metadata_cache
+    if _arxiv_metadata_cache is None:
+        _arxiv_metadata_cache = ArxivMetadataCache(ARXIV_METADATA_CACHE_PATH)
+    return _arxiv_metadata_cache
+
+
+def resolve_arxiv_papers(arxiv_ids:t.Sequence[str])->t.Dict[str, t.Dict[str, str]]:
+    """arxiv id들의 metadata(title, pdf_url)를 조회. cache에 없는 id들만 한 번의 id_list 요청으로 arxiv api에 조회.
+
+    Args:
+        arxiv_ids (t.Sequence[str]): 정규화된 arxiv id들
+
+    Returns:
+        t.Dict[str, t.Dict[str, str]]: arxiv id -> metadata. arxiv에 없거나 형식이 잘못된 id는 포함되지 않음.
+    """
+    arxiv_metadata_cache = _get_arxiv_metadata_cache()
+    # 형식이 잘못된 id 하나가 id_list 요청 전체를 실패시키지 않도록 미리 제외
+    arxiv_ids = [arxiv_id for arxiv_id in arxiv_ids if is_valid_arxiv_id(arxiv_id)]
+
+    # 1. local metadata cache
+    paper_metadatas = {}
+    for arxiv_id in arxiv_ids:
+        cached_metadata = arxiv_metadata_cache.get(arxiv_id)
+        if cached_metadata is not None:
+            paper_metadatas[arxiv_id] = cached_metadata
+    missing_arxiv_ids = [arxiv_id for arxiv_id in dict.fromkeys(arxiv_ids) if arxiv_id not in paper_metadatas]
+    if not missing_arxiv_ids:
+        return paper_metadatas
+
+    # 2. 남은 id들은 단일 id_list 요청으로 조회(논문 본문은 읽지 않음)
+    search = arxiv.Search(id_list=missing_arxiv_ids, max_results=len(missing_arxiv_ids))
+    fetched_metadatas = {}
+    for search_result in _arxiv_client.results(search):
+        arxiv_id = normalize_arxiv_id(search_result.get_short_id())
+        fetched_metadatas[arxiv_id] = {
+            "paper_id": arxiv_id,
+            "title": search_result.title,
+            "pdf_url": search_result.pdf_url or f"https://arxiv.org/pdf/{arxiv_id}",
+        }
+    arxiv_metadata_cache.update(fetched_metadatas)
+    paper_metadatas.update(fetched_metadatas)
+
+    return paper_metadatas
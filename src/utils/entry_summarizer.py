@@ -0,0 +1,183 @@
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+from openai import OpenAI, OpenAIError
+
+from src.common.common import (
+    CHAT_MODEL,
+    CHAT_SEED,
+    ENTRY_SUMMARY_BATCH_SIZE,
+    ENTRY_SUMMARY_CACHE_PATH,
+    ENTRY_SUMMARY_FALLBACK_MAX_CHARS,
+    ENTRY_SUMMARY_MAX_CONCURRENCY,
+    LLM_REQUEST_MAX_RETRIES,
+    LLM_REQUEST_TIMEOUT_SECONDS,
+)
+from src.common.prompts import SUMMARY_PAPER_ENTRIES_PROMPT
+
+SUMMARY_PROMPT_HASH = hashlib.sha256("\n".join(SUMMARY_PAPER_ENTRIES_PROMPT).encode("utf-8")).hexdigest()
+
+
+class EntrySummaryCache:
+    """(paper_id, model 이름, 요약 prompt hash) -> 요약을 sqlite에 저장하는 cache"""
+
+    def __init__(self, db_path:str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entry_summaries (
+                paper_id TEXT NOT NULL,
+                model_name TEXT NOT NULL,
+                prompt_hash TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                PRIMARY KEY (paper_id, model_name, prompt_hash)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get_many(
+        self, paper_ids:t.Sequence[str], model_name:str, prompt_hash:str=SUMMARY_PROMPT_HASH
+    )->t.Dict[str, str]:
+        if not paper_ids:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT paper_id, summary FROM entry_summaries WHERE model_name = ? AND prompt_hash = ? "
+                f"AND paper_id IN ({', '.join('?' * len(paper_ids))})",
+                (model_name, prompt_hash, *paper_ids),
+            ).fetchall()
+
+        return dict(rows)
+
+    def put_many(self, summaries:t.Dict[str, str], model_name:str, prompt_hash:str=SUMMARY_PROMPT_HASH):
+        if not summaries:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entry_summaries (paper_id, model_name, prompt_hash, summary) VALUES (?, ?, ?, ?)",
+                [(paper_id, model_name, prompt_hash, summary) for paper_id, summary in summaries.items()],
+            )
+            self._conn.commit()
+
+
+@functools.lru_cache(maxsize=None)
+def get_entry_summary_cache(db_path:str=ENTRY_SUMMARY_CACHE_PATH)->EntrySummaryCache:
+    """프로세스 내에서 공유하는 EntrySummaryCache를 반환"""
+    return EntrySummaryCache(db_path)
+
+
+def _summarize_entry_batch(entry_batch:t.Sequence[t.Dict], model_name:str)->t.Dict[str, str]:
+    # 여러 abstract를 {paper_id: abstract} json 하나로 묶어 한 번의 요청으로 요약
+    papers = json.dumps({entry["paper_id"]: entry["summary"] for entry in entry_batch}, ensure_ascii=False)
+
+    # api error/rate limit은 이 batch만 실패 처리(요약하지 못한 entry는 원문 abstract 사용)
+    try:
+        summary_result = OpenAI(
+            timeout=LLM_REQUEST_TIMEOUT_SECONDS, max_retries=LLM_REQUEST_MAX_RETRIES
+        ).chat.completions.create(
+            model=model_name,
+            messages=[
+                {
+                    "role": "system",
+                    "content": SUMMARY_PAPER_ENTRIES_PROMPT[0]
+                },
+                {
+                    "role": "user",
+                    "content": SUMMARY_PAPER_ENTRIES_PROMPT[1].format(papers=papers)
+                }
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.0,
+            seed=CHAT_SEED
+        )
+    except OpenAIError as api_error:
+        print(f"[_summarize_entry_batch] summary request failed for {len(entry_batch)} entries: {api_error}")
+        return {}
+
+    try:
+        batch_summaries = json.loads(summary_result.choices[0].message.content or "")
+    except json.JSONDecodeError as decode_error:
+        print(f"[_summarize_entry_batch] invalid summary json: {decode_error}")
+        return {}
+    if not isinstance(batch_summaries, dict):
+        print(f"[_summarize_entry_batch] summary json is not an object: {type(batch_summaries).__name__}")
+        return {}
+
+    # 요청하지 않은 id나 문자열이 아닌 요약은 버림
+    requested_paper_ids = {entry["paper_id"] for entry in entry_batch}
+    return {
+        paper_id: summary.strip()
+        for paper_id, summary in batch_summaries.items()
+        if paper_id in requested_paper_ids and isinstance(summary, str) and summary.strip()
+    }
+
+
+def _truncate_abstract(abstract:str, max_chars:int=ENTRY_SUMMARY_FALLBACK_MAX_CHARS)->str:
+    # 요약 실패 시 사용하는 원문 abstract, 단어 경계에서 자름
+    abstract = " ".join(abstract.split())
+    if len(abstract) <= max_chars:
+        return abstract
+
+    return abstract[:max_chars].rsplit(" ", 1)[0] + " ..."
+
+
+def summarize_entries(
+    entries:t.Sequence[t.Dict],
+    model_name:str=CHAT_MODEL,
+    batch_size:int=ENTRY_SUMMARY_BATCH_SIZE,
+    max_concurrency:int=ENTRY_SUMMARY_MAX_CONCURRENCY,
+)->t.List[t.Dict]:
+    """entry들의 summary(abstract)를 짧은 요약으로 바꾼 새 entry 리스트를 반환.
+    cache에 없는 entry만 batch_size개씩 묶어 요약하며, batch들은 max_concurrency만큼 동시에 요청한다.
+
+    Args:
+        entries (t.Sequence[t.Dict]): paper_id, summary를 가진 entry들
+        model_name (str): 요약에 사용할 model 이름
+        batch_size (int): 한 요청에 묶을 최대 entry 수
+        max_concurrency (int): 동시에 보낼 최대 요청 수
+
+    Returns:
+        t.List[t.Dict]: 요약이 적용된 entry들. 요약에 실패한 entry는 원문 summary를 잘라서 사용(cache하지 않음).
+    """
+    entry_summary_cache = get_entry_summary_cache()
+
+    # 1. 이미 요약한 entry는 cache에서 가져옴
+    paper_ids = list(dict.fromkeys(entry["paper_id"] for entry in entries))
+    summaries = entry_summary_cache.get_many(paper_ids, model_name=model_name)
+
+    # 2. 남은 entry들을 batch로 묶어 요약
+    missing_entries = list({
+        entry["paper_id"]: entry for entry in entries if entry["paper_id"] not in summaries
+    }.values())
+    entry_batches = [missing_entries[start:start + batch_size] for start in range(0, len(missing_entries), batch_size)]
+    if len(entry_batches) == 1:
+        batch_results = [_summarize_entry_batch(entry_batches[0], model_name)]
+    elif entry_batches:
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(entry_batches))) as executor:
+            batch_results = list(executor.map(lambda entry_batch: _summarize_entry_batch(entry_batch, model_name), entry_batches))
+    else:
+        batch_results = []
+
+    # 3. 새 요약 저장 후 entry에 적용
+    for batch_summaries in batch_results:
+        entry_summary_cache.put_many(batch_summaries, model_name=model_name)
+        summaries.update(batch_summaries)
+    print(f"[summarize_entries] cached: {len(paper_ids) - len(missing_entries)}, requested batches: {len(entry_batches)}")
+
+    return [
+        {**entry, "summary": summaries.get(entry["paper_id"]) or _truncate_abstract(entry["summary"])}
+        for entry in entries
+    ]
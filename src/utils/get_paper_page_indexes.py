@@ -1,17 +1,46 @@
 import typing as t
 import fitz
 import ast
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
 import tiktoken
 import openai
 
+from src.common.common import LLM_REQUEST_MAX_RETRIES, LLM_REQUEST_TIMEOUT_SECONDS
+from src.common.prompts import EXTRACT_PAPER_INDEX_PROMPT
+
+OUTLINE_TIER = "outline"
+HEADING_TIER = "heading"
+LLM_TIER = "llm"
+
+_HEADING_NUMBER_PATTERN = re.compile(r"^(\d+(\.\d+)*\.?|[IVX]+\.|[A-Z]\.)$")
+_NUMBERED_HEADING_PATTERN = re.compile(r"^(\d+(\.\d+)*\.?|[IVX]+\.|[A-Z]\.)\s+[A-Z]")
+_NAMED_HEADING_PATTERN = re.compile(
+    r"^(abstract|introduction|related works?|background|conclusions?|discussion|limitations|references|bibliography|acknowledge?ments?|appendix)\b",
+    re.IGNORECASE,
+)
 
 class ExtractPaperIndexes:
-    def __init__(self, using_llm_name:str, extract_page_range:int=1):
+    def __init__(
+        self,
+        using_llm_name:str,
+        extract_page_range:int=1,
+        max_concurrency:int=1,
+        max_window_tokens:t.Optional[int]=None,
+        split_overlap_tokens:int=64,
+    ):
         self.tokenizer = tiktoken.encoding_for_model(using_llm_name)
         self.using_llm_name = using_llm_name
-        self.llm_client = openai.OpenAI()
+        self.llm_client = openai.OpenAI(timeout=LLM_REQUEST_TIMEOUT_SECONDS, max_retries=LLM_REQUEST_MAX_RETRIES)
         self.extract_page_range = extract_page_range
+        self.max_concurrency = max(1, max_concurrency)
+        # max_window_tokens가 주어지면 고정 page range 대신 token budget 기준으로 page를 묶음
+        self.max_window_tokens = max_window_tokens
+        if max_window_tokens is not None:
+            split_overlap_tokens = min(split_overlap_tokens, max_window_tokens // 2)
+        self.split_overlap_tokens = split_overlap_tokens
 
     def _count_pages_tokens(self, page_contents:str)->int:
         """논문 page들의 token 길이를 count
@@ -25,7 +54,12 @@ class ExtractPaperIndexes:
         tok_result = self.tokenizer.encode(page_contents)
         return len(tok_result)
 
-    def _get_target_range_pages(self, paper_pages:fitz.Document, start_page:int, extract_page_range:int)->str:
+    @staticmethod
+    def _get_page_text(page:t.Union[fitz.Page, str])->str:
+        # 미리 추출된 페이지 텍스트가 주어지면 그대로 사용
+        return page if isinstance(page, str) else page.get_text()
+
+    def _get_target_range_pages(self, paper_pages:t.Union[fitz.Document, t.Sequence[str]], start_page:int, extract_page_range:int)->t.Tuple[t.List[str], int]:
         """범위에 해당되는 논문의 page들을 추출
 
         Args:
@@ -34,16 +68,58 @@ class ExtractPaperIndexes:
             extract_page_range (int): 추출 범위
 
         Returns:
-            str: 범위 내 논문 페이지 텍스트
+            t.Tuple[t.List[str], int]: 범위 내 논문 페이지 텍스트들, 실제 추출 범위
         """
-        target_text_list = [page.get_text() for page in paper_pages[start_page:(start_page+extract_page_range)]]
-        target_text = "\n\n\n".join(target_text_list)
-        
-        ## 추후 사용되는 llm에 따라 max_token len 정보를 가져와 재귀로 추출 예정, token 길이에 따른 수정된 page range범위도 반환되어야 함.
-        # if self._count_pages_tokens(page_contents=target_text):
-        #     target_text, extract_page_range = self._get_target_range_pages(paper_pages, start_page, (extract_page_range-1)) 
-        return target_text, extract_page_range
-    
+        target_text_list = [self._get_page_text(page) for page in paper_pages[start_page:(start_page+extract_page_range)]]
+
+        return target_text_list, extract_page_range
+
+    def _split_page_text(self, page_text:str)->t.List[str]:
+        """token budget을 넘는 단일 페이지를 budget 크기의 조각들로 분할
+
+        조각 경계에서 목차가 잘리지 않도록 인접 조각끼리 split_overlap_tokens만큼 겹친다.
+
+        Args:
+            page_text (str): 페이지 텍스트
+
+        Returns:
+            t.List[str]: 분할된 페이지 텍스트 조각들
+        """
+        page_tokens = self.tokenizer.encode(page_text)
+        if len(page_tokens) <= self.max_window_tokens:
+            return [page_text]
+
+        step = self.max_window_tokens - self.split_overlap_tokens
+        return [
+            self.tokenizer.decode(page_tokens[start:(start+self.max_window_tokens)])
+            for start in range(0, len(page_tokens) - self.split_overlap_tokens, step)
+        ]
+
+    def _pack_page_windows(self, paper_pages:t.Union[fitz.Document, t.Sequence[str]])->t.List[t.Tuple[t.List[int], t.List[str]]]:
+        """연속된 페이지들을 max_window_tokens에 들어가는 만큼 하나의 window로 묶음
+
+        Args:
+            paper_pages (fitz.Document): 논문 전체 페이지
+
+        Returns:
+            t.List[t.Tuple[t.List[int], t.List[str]]]: (페이지 번호들, 페이지 텍스트들) window 리스트
+        """
+        page_windows = []
+        window_page_numbers, window_texts, window_tokens = [], [], 0
+        for page_number, page in enumerate(paper_pages):
+            for page_text in self._split_page_text(self._get_page_text(page)):
+                page_tokens = self._count_pages_tokens(page_contents=page_text)
+                if window_texts and window_tokens + page_tokens > self.max_window_tokens:
+                    page_windows.append((window_page_numbers, window_texts))
+                    window_page_numbers, window_texts, window_tokens = [], [], 0
+                window_page_numbers.append(page_number)
+                window_texts.append(page_text)
+                window_tokens += page_tokens
+        if window_texts:
+            page_windows.append((window_page_numbers, window_texts))
+
+        return page_windows
+
     def extract_page_indexes_using_llm(self, range_page_texts:str)->str:
         """주어지는 범위 텍스트 내에서 llm을 사용해 목차들을 추출
 
@@ -59,41 +135,266 @@ class ExtractPaperIndexes:
             messages=[
                 {
                     "role": "system",
-                    "content": """주어지는 논문 페이지 내에서 목차들을 추출하세요. 목차의 번호와 제목이 '\\n'으로 끊어진 경우, 무조건 번호와 제목을 논문에 기입된 그대로 추출하세요. \n목차에는 다음과 같은 내용은 포함되지 않습니다:1) Figure, 2) Equation, 3) Table.\n특히 '\\n'기호 주변 문자들에 집중하세요, 일반적으로 목차는 줄바꿈을 통해 표기합니다. 또한 Abstract는 존재 시, 포함하세요.\n결과 텍스트는 아래 포맷을 따르세요:\n["목차1", "목차2", "목차3", ...] 현재 페이지 내에 목차 정보가 존재하지 않을 시, []를 반환하세요(주석 텍스트를 적는 것을 금자합니다!)."""
+                    "content": EXTRACT_PAPER_INDEX_PROMPT[0]
                 },
                 {
                     "role": "user",
-                    "content": f"given paper page:\n{range_page_texts}"
+                    "content": EXTRACT_PAPER_INDEX_PROMPT[1].format(range_page_texts=range_page_texts)
                 },
                 {
                     "role": "assistant",
-                    "content": "알겠습니다. 주신 논문 페이지에서 목차를 추출하고 리턴 포맷에 맞춰 결과를 드리도록 하겠습니다."
+                    "content": EXTRACT_PAPER_INDEX_PROMPT[2]
                 }
             ]
         ).choices[0].message.content
 
         return llm_result
 
-    def run_extract_all_indexes(self, paper_pages:fitz.Document)->t.Dict[str, int]:
-        """pdf read 결과 내에서 논문 목차들을 추출
+    def _get_page_windows(self, paper_pages:t.Union[fitz.Document, t.Sequence[str]])->t.List[t.Tuple[t.List[int], t.List[str]]]:
+        """논문 전체 페이지를 llm 요청 단위의 page window들로 분할
 
         Args:
             paper_pages (fitz.Document): 논문 전체 페이지
-            
+
         Returns:
-            t.Dict[int, str]: 추출된 논문 목차들. Dict 내에는 page: index로 구성.
+            t.List[t.Tuple[t.List[int], t.List[str]]]: (페이지 번호들, 페이지 텍스트들) window 리스트. 페이지 순서로 정렬.
         """
+        if self.max_window_tokens is not None:
+            return self._pack_page_windows(paper_pages)
+
         start_page = 0
-        paper_indexes = {}
+        page_windows = []
         while start_page < len(paper_pages):
             temp_range_page_texts, temp_extract_range = self._get_target_range_pages(paper_pages, start_page, self.extract_page_range)
-            # temp_range_page_texts 내에서 목차들을 추출
-            temp_range_indexes = ast.literal_eval(self.extract_page_indexes_using_llm(range_page_texts=temp_range_page_texts))
-            for index in temp_range_indexes:
-                paper_indexes[index] = start_page
+            temp_range_page_numbers = list(range(start_page, start_page + len(temp_range_page_texts)))
+            page_windows.append((temp_range_page_numbers, temp_range_page_texts))
             start_page += temp_extract_range
 
+        return page_windows
+
+    @staticmethod
+    def _locate_index_page(index:str, page_numbers:t.List[int], page_texts:t.List[str])->int:
+        """window 내에서 목차가 실제로 등장하는 페이지 번호를 찾음
+
+        Args:
+            index (str): llm이 추출한 목차
+            page_numbers (t.List[int]): window의 페이지 번호들
+            page_texts (t.List[str]): window의 페이지 텍스트들
+
+        Returns:
+            int: 목차가 위치한 페이지 번호. 찾지 못하면 window의 첫 페이지.
+        """
+        normalized_index = " ".join(index.split()).lower()
+        for page_number, page_text in zip(page_numbers, page_texts):
+            if normalized_index in " ".join(page_text.split()).lower():
+                return page_number
+
+        return page_numbers[0]
+
+    def _extract_window_indexes(self, range_page_texts:str)->t.List[str]:
+        """단일 page window 내 목차들을 llm으로 추출해 list로 변환
+
+        Args:
+            range_page_texts (str): 범위 페이지 텍스트
+
+        Returns:
+            t.List[str]: 추출된 목차들
+        """
+        return ast.literal_eval(self.extract_page_indexes_using_llm(range_page_texts=range_page_texts))
+
+    def run_extract_all_indexes(self, paper_pages:t.Union[fitz.Document, t.Sequence[str]])->t.Dict[str, int]:
+        """pdf read 결과 내에서 논문 목차들을 추출
+
+        max_concurrency가 1보다 크면 모든 page window의 llm 요청을 worker pool로 동시에 보내고,
+        결과는 페이지 순서대로 병합해 순차 실행과 동일한 dict를 만든다.
+
+        Args:
+            paper_pages (t.Union[fitz.Document, t.Sequence[str]]): 논문 전체 페이지 또는 미리 추출된 페이지 텍스트들
+            
+        Returns:
+            t.Dict[int, str]: 추출된 논문 목차들. Dict 내에는 page: index로 구성.
+        """
+        page_windows = self._get_page_windows(paper_pages)
+        window_texts = ["\n\n\n".join(page_texts) for _, page_texts in page_windows]
+
+        # 1. window별 목차 추출(동시 실행 시 executor.map이 입력 순서를 보장)
+        if self.max_concurrency > 1 and len(page_windows) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(page_windows))) as executor:
+                window_indexes = list(executor.map(self._extract_window_indexes, window_texts))
+        else:
+            window_indexes = [self._extract_window_indexes(window_text) for window_text in window_texts]
+
+        # 2. 페이지 순서대로 병합
+        paper_indexes = {}
+        for (page_numbers, page_texts), temp_range_indexes in zip(page_windows, window_indexes):
+            for index in temp_range_indexes:
+                paper_indexes[index] = self._locate_index_page(index, page_numbers, page_texts)
+
+        return paper_indexes
+
+class TieredExtractPaperIndexes:
+    """outline -> font 기반 heading 검출 -> llm 순서로 논문 목차를 추출.
+
+    앞 단계에서 신뢰할 만한 결과가 나오면 llm 호출 없이 바로 반환한다.
+    """
+
+    def __init__(
+        self,
+        using_llm_name:str,
+        extract_page_range:int=1,
+        max_concurrency:int=1,
+        max_window_tokens:t.Optional[int]=None,
+        min_outline_entries:int=3,
+        min_heading_entries:int=3,
+        heading_size_ratio:float=1.15,
+    ):
+        self.using_llm_name = using_llm_name
+        self.extract_page_range = extract_page_range
+        self.max_concurrency = max_concurrency
+        self.max_window_tokens = max_window_tokens
+        self.min_outline_entries = min_outline_entries
+        self.min_heading_entries = min_heading_entries
+        self.heading_size_ratio = heading_size_ratio
+        self._llm_extractor = None
+
+    @property
+    def llm_extractor(self)->ExtractPaperIndexes:
+        # llm tier까지 내려가는 경우에만 tokenizer/openai client를 생성
+        if self._llm_extractor is None:
+            self._llm_extractor = ExtractPaperIndexes(
+                using_llm_name=self.using_llm_name,
+                extract_page_range=self.extract_page_range,
+                max_concurrency=self.max_concurrency,
+                max_window_tokens=self.max_window_tokens,
+            )
+        return self._llm_extractor
+
+    def extract_indexes_from_outline(self, paper_pages:fitz.Document)->t.Dict[str, int]:
+        """pdf outline(bookmark)에서 목차를 추출
+
+        Args:
+            paper_pages (fitz.Document): 논문 전체 페이지
+
+        Returns:
+            t.Dict[str, int]: index: page(0부터 시작)로 구성된 목차. outline이 없으면 빈 dict.
+        """
+        paper_indexes = {}
+        for _, title, page_number in paper_pages.get_toc(simple=True):
+            title = " ".join(title.split())
+            # page_number는 1부터 시작, 대상 페이지가 없는 항목은 -1
+            if title and page_number >= 1 and title not in paper_indexes:
+                paper_indexes[title] = page_number - 1
+
         return paper_indexes
+
+    @staticmethod
+    def _get_page_lines(page:fitz.Page)->t.List[t.Tuple[str, float, bool]]:
+        """페이지 내 text line들을 (텍스트, 최대 font size, bold 여부)로 추출"""
+        page_lines = []
+        for block in page.get_text("dict")["blocks"]:
+            if block.get("type") != 0:
+                continue
+            for line in block["lines"]:
+                spans = [span for span in line["spans"] if span["text"].strip()]
+                if not spans:
+                    continue
+                text = " ".join(" ".join(span["text"] for span in spans).split())
+                size = max(span["size"] for span in spans)
+                # flags bit 4(16) == bold
+                is_bold = all(span["flags"] & 16 or "bold" in span["font"].lower() for span in spans)
+                page_lines.append((text, size, is_bold))
+
+        return page_lines
+
+    def extract_indexes_from_headings(self, paper_pages:fitz.Document)->t.Dict[str, int]:
+        """본문보다 큰 font 또는 bold로 쓰인 heading line들을 목차로 추출
+
+        Args:
+            paper_pages (fitz.Document): 논문 전체 페이지
+
+        Returns:
+            t.Dict[str, int]: index: page(0부터 시작)로 구성된 목차.
+        """
+        all_page_lines = [self._get_page_lines(page) for page in paper_pages]
+
+        # 1. 글자 수 기준 최빈 font size를 본문 size로 사용
+        size_counter = Counter()
+        for page_lines in all_page_lines:
+            for text, size, _ in page_lines:
+                size_counter[round(size * 2) / 2] += len(text)
+        if not size_counter:
+            return {}
+        body_size = size_counter.most_common(1)[0][0]
+
+        # 2. heading 후보 line 검출
+        paper_indexes = {}
+        for page_number, page_lines in enumerate(all_page_lines):
+            pending_number = None
+            for text, size, is_bold in page_lines:
+                is_heading_style = size >= body_size * self.heading_size_ratio or (is_bold and size >= body_size)
+                if not is_heading_style or len(text) > 100:
+                    pending_number = None
+                    continue
+                # '1' 과 'Introduction'이 서로 다른 line으로 분리된 경우 병합
+                if _HEADING_NUMBER_PATTERN.match(text):
+                    pending_number = text
+                    continue
+                if pending_number is not None:
+                    text = f"{pending_number} {text}"
+                    pending_number = None
+                if _NUMBERED_HEADING_PATTERN.match(text) or _NAMED_HEADING_PATTERN.match(text):
+                    if text not in paper_indexes:
+                        paper_indexes[text] = page_number
+
+        return paper_indexes
+
+    def run_local_extract(self, paper_pages:fitz.Document)->t.Optional[t.Tuple[t.Dict[str, int], str]]:
+        """llm 없이 outline, heading 검출 순서로 목차를 추출
+
+        Args:
+            paper_pages (fitz.Document): 논문 전체 페이지
+
+        Returns:
+            t.Optional[t.Tuple[t.Dict[str, int], str]]: (추출된 논문 목차들, tier 이름). 신뢰할 만한 결과가 없으면 None.
+        """
+        # 1. pdf outline
+        paper_indexes = self.extract_indexes_from_outline(paper_pages)
+        if len(paper_indexes) >= self.min_outline_entries:
+            return paper_indexes, OUTLINE_TIER
+
+        # 2. font size/weight 기반 heading 검출
+        paper_indexes = self.extract_indexes_from_headings(paper_pages)
+        if len(paper_indexes) >= self.min_heading_entries:
+            return paper_indexes, HEADING_TIER
+
+        return None
+
+    def run_llm_extract(self, paper_pages:t.Union[fitz.Document, t.Sequence[str]])->t.Tuple[t.Dict[str, int], str]:
+        """llm fallback으로 목차를 추출
+
+        Args:
+            paper_pages (t.Union[fitz.Document, t.Sequence[str]]): 논문 전체 페이지 또는 미리 추출된 페이지 텍스트들
+
+        Returns:
+            t.Tuple[t.Dict[str, int], str]: (추출된 논문 목차들, tier 이름)
+        """
+        return self.llm_extractor.run_extract_all_indexes(paper_pages), LLM_TIER
+
+    def run_extract_all_indexes(self, paper_pages:fitz.Document)->t.Tuple[t.Dict[str, int], str]:
+        """outline, heading 검출, llm 순서로 목차를 추출
+
+        Args:
+            paper_pages (fitz.Document): 논문 전체 페이지
+
+        Returns:
+            t.Tuple[t.Dict[str, int], str]: (추출된 논문 목차들, 결과를 만든 tier 이름)
+        """
+        local_result = self.run_local_extract(paper_pages)
+        if local_result is not None:
+            return local_result
+
+        # 3. llm fallback
+        return self.run_llm_extract(paper_pages)
         
 
 if __name__ == "__main__":
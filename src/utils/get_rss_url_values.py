@@ -1,32 +1,21 @@
+import threading
+import time
 import typing as t
-import urllib
-import feedparser
-from openai import OpenAI
-
-from src.common.prompts import SUMMARY_PATENT_SUMMARY_CONTENT_PROMPT
-from src.common.common import CHAT_SEED, CHAT_MODEL
-
+import urllib.parse
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
 
-def _summarize_patent_summary_content(org_summary_text:str) -> str:
-    client = OpenAI()
+import feedparser
+import requests
 
-    summary_result = client.chat.completions.create(
-        model=CHAT_MODEL,
-        messages=[
-            {
-                "role": "system",
-                "content": SUMMARY_PATENT_SUMMARY_CONTENT_PROMPT[0]
-            },
-            {
-                "role": "user",
-                "content": SUMMARY_PATENT_SUMMARY_CONTENT_PROMPT[1].format(org_summary_text)
-            }
-        ],
-        temperature=0.0,
-        seed=CHAT_SEED
-    )
+from src.common.common import (
+    ARXIV_API_QUERY_FORMAT,
+    RSS_FEED_CACHE_MAX_ENTRIES,
+    RSS_FEED_CACHE_TTL_SECONDS,
+    RSS_FEED_TIMEOUT,
+)
 
-    return summary_result.choices[0].message.content
+ATOM_NAMESPACE = "{http://www.w3.org/2005/Atom}"
 
 
 def _extract_using_values_from_entry(temp_entry:t.Dict) -> t.Dict:
@@ -35,7 +24,8 @@ def _extract_using_values_from_entry(temp_entry:t.Dict) -> t.Dict:
         - author
         - tags
         - paper_id
-        - summary => 단일 특허마다 llm을 통한 summary 적용.
+        - summary => 원문 abstract. 요약은 entry_summarizer에서 여러 entry를 묶어 적용.
+        - submitted
 
     Args:
         temp_entry (t.Dict): 현재 entry
@@ -55,9 +45,10 @@ def _extract_using_values_from_entry(temp_entry:t.Dict) -> t.Dict:
 
     new_using_values["paper_id"] = paper_id
 
-    # new_using_values["summary"] = _summarize_patent_summary_content(org_summary_text=temp_entry["summary"])
     new_using_values["summary"] = temp_entry["summary"]
 
+    new_using_values["submitted"] = temp_entry["published"]
+
     return new_using_values 
 
 
@@ -81,6 +72,98 @@ def _change_rss_url_type(org_rss_url:str)->str:
     return new_rss_url
 
 
+class RssFeedHttpCache:
+    """arxiv api feed 응답을 url별로 보관하는 http cache.
+
+    - TTL 이내의 응답은 요청 없이 cache에서 반환
+    - TTL이 지나면 ETag/Last-Modified로 conditional GET(304면 cache 재사용)
+    - connect/read timeout 적용
+    - host별로 entry를 돌려준 scheme(http/https)을 기억해 scheme 전환 재시도를 한 번만 수행
+    """
+
+    def __init__(self, ttl_seconds:float, timeout:t.Tuple[float, float], max_entries:int):
+        self.ttl_seconds = ttl_seconds
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self.session = requests.Session()
+        self._lock = threading.Lock()
+        # url -> {"body", "etag", "last_modified", "fetched_at"}
+        self._responses = OrderedDict()
+        # host -> 확인된 scheme
+        self._confirmed_schemes = {}
+        self.fresh_hits = 0
+        self.not_modified_hits = 0
+        self.misses = 0
+
+    def resolve_url(self, rss_url:str)->str:
+        """host에 대해 확인된 scheme이 있으면 그 scheme으로 url을 바꿈"""
+        parsed_url = urllib.parse.urlsplit(rss_url)
+        confirmed_scheme = self._confirmed_schemes.get(parsed_url.netloc)
+        if confirmed_scheme is None or confirmed_scheme == parsed_url.scheme:
+            return rss_url
+
+        return urllib.parse.urlunsplit(parsed_url._replace(scheme=confirmed_scheme))
+
+    def is_scheme_confirmed(self, rss_url:str)->bool:
+        return urllib.parse.urlsplit(rss_url).netloc in self._confirmed_schemes
+
+    def confirm_scheme(self, rss_url:str):
+        parsed_url = urllib.parse.urlsplit(rss_url)
+        self._confirmed_schemes[parsed_url.netloc] = parsed_url.scheme
+
+    def fetch(self, rss_url:str)->bytes:
+        """feed 응답 body를 반환
+
+        Args:
+            rss_url (str): target rss url
+
+        Returns:
+            bytes: feed 응답 body
+        """
+        with self._lock:
+            cached_response = self._responses.get(rss_url)
+            if cached_response is not None:
+                self._responses.move_to_end(rss_url)
+                if time.time() - cached_response["fetched_at"] < self.ttl_seconds:
+                    self.fresh_hits += 1
+                    return cached_response["body"]
+
+        request_headers = {}
+        if cached_response is not None:
+            if cached_response["etag"]:
+                request_headers["If-None-Match"] = cached_response["etag"]
+            if cached_response["last_modified"]:
+                request_headers["If-Modified-Since"] = cached_response["last_modified"]
+        response = self.session.get(rss_url, headers=request_headers, timeout=self.timeout)
+
+        with self._lock:
+            if response.status_code == 304 and cached_response is not None:
+                self.not_modified_hits += 1
+                cached_response["fetched_at"] = time.time()
+                return cached_response["body"]
+
+            response.raise_for_status()
+            self.misses += 1
+            self._responses[rss_url] = {
+                "body": response.content,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+            }
+            self._responses.move_to_end(rss_url)
+            while len(self._responses) > self.max_entries:
+                self._responses.popitem(last=False)
+
+        return response.content
+
+
+rss_feed_http_cache = RssFeedHttpCache(
+    ttl_seconds=RSS_FEED_CACHE_TTL_SECONDS,
+    timeout=RSS_FEED_TIMEOUT,
+    max_entries=RSS_FEED_CACHE_MAX_ENTRIES,
+)
+
+
 def get_processed_entries_from_rss_url(rss_url:str) -> t.List[t.Dict]:
     """arxiv rss url 내 값을 가져와 entries 정제 후 리턴
 
@@ -91,20 +174,113 @@ def get_processed_entries_from_rss_url(rss_url:str) -> t.List[t.Dict]:
         t.List[t.Dict]: rss url 내 feed entries
     """
     def get_rss_feed_and_parse(rss_url:str)->t.List[t.Dict]:
-        # 1. rss url 내 값 read
-        response = urllib.request.urlopen(rss_url)
-        rss_feed = response.read()
+        # 1. rss url 내 값 read(http cache 경유)
+        rss_feed = rss_feed_http_cache.fetch(rss_url)
         # 2. feed parsing
         parsing_result = feedparser.parse(rss_feed).entries
         return parsing_result
     
+    rss_url = rss_feed_http_cache.resolve_url(rss_url)
     parsing_result = get_rss_feed_and_parse(rss_url)
-    if not bool(parsing_result):
+    if bool(parsing_result):
+        rss_feed_http_cache.confirm_scheme(rss_url)
+    elif not rss_feed_http_cache.is_scheme_confirmed(rss_url):
+        # scheme 전환 재시도는 host당 한 번만 수행하고, 결과를 기억
         print("[get_processed_entries_from_rss_url] change http type and re-search")
         new_rss_url = _change_rss_url_type(org_rss_url=rss_url)
         parsing_result = get_rss_feed_and_parse(new_rss_url)
+        rss_feed_http_cache.confirm_scheme(new_rss_url if bool(parsing_result) else rss_url)
 
     # 3. using key값 정제 및 추출
     processed_parsing_result = [_extract_using_values_from_entry(result) for result in parsing_result]
 
-    return processed_parsing_result
\ No newline at end of file
+    return processed_parsing_result
+
+
+
+def _atom_entry_to_feed_entry(entry_element:ET.Element)->t.Dict:
+    """Atom entry element를 _extract_using_values_from_entry가 사용하는 feedparser entry 형태의 dict로 변환"""
+    link = entry_element.findtext(f"{ATOM_NAMESPACE}id", default="")
+    for link_element in entry_element.iterfind(f"{ATOM_NAMESPACE}link"):
+        if link_element.get("rel", "alternate") == "alternate" and link_element.get("href"):
+            link = link_element.get("href")
+            break
+
+    return {
+        "title": entry_element.findtext(f"{ATOM_NAMESPACE}title", default=""),
+        "authors": [
+            {"name": author_element.findtext(f"{ATOM_NAMESPACE}name", default="")}
+            for author_element in entry_element.iterfind(f"{ATOM_NAMESPACE}author")
+        ],
+        "tags": [
+            {"term": category_element.get("term", "")}
+            for category_element in entry_element.iterfind(f"{ATOM_NAMESPACE}category")
+        ],
+        "link": link,
+        "summary": entry_element.findtext(f"{ATOM_NAMESPACE}summary", default=""),
+        "published": entry_element.findtext(f"{ATOM_NAMESPACE}published", default=""),
+    }
+
+
+def iter_entries_from_atom_stream(atom_stream:t.BinaryIO)->t.Iterator[t.Dict]:
+    """Atom 응답 stream을 incremental하게 parsing하며 entry를 하나씩 반환. 처리한 element는 바로 비워 메모리를 일정하게 유지.
+
+    Args:
+        atom_stream (t.BinaryIO): Atom xml stream
+
+    Yields:
+        t.Dict: feedparser entry 형태의 dict
+    """
+    feed_root = None
+    for event, element in ET.iterparse(atom_stream, events=("start", "end")):
+        if feed_root is None:
+            # 첫 start 이벤트의 element가 <feed> root
+            feed_root = element
+        elif event == "end" and element.tag == f"{ATOM_NAMESPACE}entry":
+            yield _atom_entry_to_feed_entry(element)
+            # entry 내용뿐 아니라 root에 남는 빈 entry element들도 제거
+            element.clear()
+            feed_root.clear()
+
+
+def iter_processed_entries_from_rss_url(
+    search_query:str,
+    page_size:int=100,
+    max_entries:t.Optional[int]=None,
+    page_delay_seconds:float=3.0,
+    api_query_format:str=ARXIV_API_QUERY_FORMAT,
+)->t.Iterator[t.Dict]:
+    """arxiv api를 start/max_results로 paging하며 정제된 entry들을 generator로 반환(대량 digest 용)
+
+    Args:
+        search_query (str): arxiv api search_query. ex) cat:cs.CL
+        page_size (int): 요청당 entry 수
+        max_entries (t.Optional[int]): 최대 entry 수. None이면 결과가 끝날 때까지.
+        page_delay_seconds (float): 페이지 요청 사이 대기 시간(arxiv api 권장 3초)
+        api_query_format (str): arxiv api url 포맷
+
+    Yields:
+        t.Dict: _extract_using_values_from_entry로 정제된 entry
+    """
+    start, yielded_count = 0, 0
+    while max_entries is None or yielded_count < max_entries:
+        request_size = page_size if max_entries is None else min(page_size, max_entries - yielded_count)
+        rss_url = api_query_format.format(
+            search_query=urllib.parse.quote(search_query, safe=":"), start=start, max_results=request_size
+        )
+        page_count = 0
+        with rss_feed_http_cache.session.get(rss_url, stream=True, timeout=rss_feed_http_cache.timeout) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            for entry in iter_entries_from_atom_stream(response.raw):
+                page_count += 1
+                yielded_count += 1
+                yield _extract_using_values_from_entry(entry)
+                if max_entries is not None and yielded_count >= max_entries:
+                    return
+
+        # 마지막 페이지
+        if page_count < request_size:
+            return
+        start += request_size
+        time.sleep(page_delay_seconds)
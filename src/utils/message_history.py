@@ -0,0 +1,135 @@
+import functools
+import json
+import typing as t
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+
+from src.common.common import (
+    CHAT_MODEL,
+    HISTORY_KEEP_RECENT_MESSAGES,
+    HISTORY_MAX_TOKENS,
+    HISTORY_TOOL_STUB_CHARS,
+)
+from src.utils.paper_section_index import get_tokenizer
+
+
+def _get_message_text(message:BaseMessage)->str:
+    message_text = message.content if isinstance(message.content, str) else json.dumps(message.content, ensure_ascii=False)
+    if isinstance(message, AIMessage) and message.tool_calls:
+        message_text += json.dumps(message.tool_calls, ensure_ascii=False, default=str)
+
+    return message_text
+
+
+def count_message_tokens(message:BaseMessage, tokenizer=None)->int:
+    message_text = _get_message_text(message)
+    if tokenizer is None:
+        # tokenizer가 없으면 대략 4글자당 1 token으로 추정
+        return len(message_text) // 4 + 1
+
+    return len(tokenizer.encode(message_text)) + 1
+
+
+def _group_tool_call_turns(messages:t.Sequence[BaseMessage])->t.List[t.List[BaseMessage]]:
+    # tool_calls를 가진 AIMessage와 그 결과 ToolMessage들을 하나의 turn으로 묶음(쌍이 깨지지 않도록)
+    message_groups = []
+    open_tool_call_ids = set()
+    for message in messages:
+        if isinstance(message, ToolMessage) and message.tool_call_id in open_tool_call_ids:
+            message_groups[-1].append(message)
+            continue
+        message_groups.append([message])
+        open_tool_call_ids = {
+            tool_call["id"] for tool_call in message.tool_calls
+        } if isinstance(message, AIMessage) and message.tool_calls else set()
+
+    return message_groups
+
+
+def stub_tool_message(message:ToolMessage, stub_chars:int=HISTORY_TOOL_STUB_CHARS)->ToolMessage:
+    """긴 tool 결과를 앞부분만 남긴 stub으로 교체. tool_call_id는 유지."""
+    message_text = _get_message_text(message)
+    if len(message_text) <= stub_chars:
+        return message
+
+    return ToolMessage(
+        content=f"{message_text[:stub_chars]}... [이전 tool 결과, {len(message_text) - stub_chars}자 생략]",
+        tool_call_id=message.tool_call_id,
+        name=message.name,
+        id=message.id,
+    )
+
+
+def build_bounded_history(
+    messages:t.Sequence[BaseMessage],
+    max_tokens:int=HISTORY_MAX_TOKENS,
+    keep_recent_messages:int=HISTORY_KEEP_RECENT_MESSAGES,
+    stub_chars:int=HISTORY_TOOL_STUB_CHARS,
+    tokenizer=None,
+)->t.List[BaseMessage]:
+    """agent에 넘길 token 제한 message view를 생성. state의 messages 자체는 바꾸지 않음.
+
+    1. 최근 keep_recent_messages개 message(tool call turn 단위로 확장)는 그대로 유지
+    2. 그 이전 tool 결과는 stub으로 교체
+    3. 그래도 max_tokens를 넘으면 첫 사용자 질문을 제외한 오래된 turn부터 제거
+
+    Args:
+        messages (t.Sequence[BaseMessage]): state의 전체 messages
+        max_tokens (int): view의 최대 token 수
+        keep_recent_messages (int): 그대로 유지할 최근 message 수
+        stub_chars (int): stub으로 남길 tool 결과 글자 수
+        tokenizer: token 수 계산용 tokenizer. None이면 글자 수로 추정.
+
+    Returns:
+        t.List[BaseMessage]: bounded message view
+    """
+    message_groups = _group_tool_call_turns(messages)
+
+    # 1. 최근 turn들
+    recent_start = len(message_groups)
+    recent_message_count = 0
+    while recent_start > 0 and recent_message_count < keep_recent_messages:
+        recent_start -= 1
+        recent_message_count += len(message_groups[recent_start])
+    recent_groups = message_groups[recent_start:]
+
+    # 2. 오래된 turn의 tool 결과 stub 처리
+    older_groups = [
+        [stub_tool_message(message, stub_chars) if isinstance(message, ToolMessage) else message for message in message_group]
+        for message_group in message_groups[:recent_start]
+    ]
+
+    # 3. token budget 초과 시 오래된 turn 제거(첫 사용자 질문은 유지)
+    first_group = []
+    if older_groups and isinstance(older_groups[0][0], HumanMessage):
+        first_group = older_groups.pop(0)
+    group_tokens = [
+        sum(count_message_tokens(message, tokenizer) for message in message_group)
+        for message_group in [first_group, *older_groups, *recent_groups]
+    ]
+    total_tokens = sum(group_tokens)
+    drop_count = 0
+    while drop_count < len(older_groups) and total_tokens > max_tokens:
+        total_tokens -= group_tokens[1 + drop_count]
+        drop_count += 1
+
+    return [
+        message
+        for message_group in [first_group, *older_groups[drop_count:], *recent_groups]
+        for message in message_group
+    ]
+
+
+@functools.lru_cache(maxsize=1)
+def _get_history_tokenizer():
+    # encoding 파일을 받을 수 없는 환경(offline 등)에서는 한 번만 시도하고 글자 수 추정으로 대체
+    try:
+        return get_tokenizer(CHAT_MODEL)
+    except (OSError, KeyError, ValueError) as tokenizer_error:
+        print(f"[get_bounded_history] tokenizer for '{CHAT_MODEL}' is not available, estimate tokens by chars: {tokenizer_error}")
+        return None
+
+
+def get_bounded_history(messages:t.Sequence[BaseMessage])->t.List[BaseMessage]:
+    """common 설정과 CHAT_MODEL tokenizer로 bounded message view 생성"""
+    return build_bounded_history(messages, tokenizer=_get_history_tokenizer())
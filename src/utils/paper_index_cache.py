@@ -0,0 +1,256 @@
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import typing as t
+from collections import OrderedDict
+
+from src.common.common import PAPER_INDEX_CACHE_MAX_ENTRIES, PAPER_INDEX_CACHE_PATH
+from src.common.prompts import EXTRACT_PAPER_INDEX_PROMPT
+
+
+def get_prompt_hash(prompt_messages:t.Sequence[str]=EXTRACT_PAPER_INDEX_PROMPT)->str:
+    """목차 추출 prompt의 hash를 계산. prompt가 바뀌면 cache key도 바뀐다.
+
+    Args:
+        prompt_messages (t.Sequence[str]): 목차 추출 prompt
+
+    Returns:
+        str: prompt sha256 hash
+    """
+    return hashlib.sha256("\n".join(prompt_messages).encode("utf-8")).hexdigest()
+
+
+CURRENT_PROMPT_HASH = get_prompt_hash()
+
+
+class PaperIndexCache:
+    """pdf 내용 hash + model 이름 + 목차 추출 prompt hash를 key로 추출된 목차를 sqlite에 저장하는 cache.
+
+    프로세스 내 반복 조회용 memory는 max_entries개까지의 LRU이고, 밀려난 목차는 sqlite에서 다시 읽는다.
+    """
+
+    def __init__(self, db_path:str, max_entries:int=PAPER_INDEX_CACHE_MAX_ENTRIES):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # (path, mtime_ns, size) -> pdf sha256, 같은 파일을 반복해서 hashing하지 않기 위함
+        self._file_hash_memo = OrderedDict()
+        # cache_key -> (paper_indexes, extract_tier), 프로세스 내 반복 조회용
+        self._memory = OrderedDict()
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS paper_indexes (
+                cache_key TEXT PRIMARY KEY,
+                pdf_sha256 TEXT NOT NULL,
+                pdf_path TEXT,
+                model_name TEXT NOT NULL,
+                prompt_hash TEXT NOT NULL,
+                extract_tier TEXT,
+                paper_indexes TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def _get_pdf_hash(self, pdf_path:str)->str:
+        pdf_stat = os.stat(pdf_path)
+        memo_key = (os.path.abspath(pdf_path), pdf_stat.st_mtime_ns, pdf_stat.st_size)
+        pdf_hash = self._file_hash_memo.get(memo_key)
+        if pdf_hash is None:
+            file_hasher = hashlib.sha256()
+            with open(pdf_path, "rb") as pdf_file:
+                for chunk in iter(lambda: pdf_file.read(1 << 20), b""):
+                    file_hasher.update(chunk)
+            pdf_hash = file_hasher.hexdigest()
+        self._remember(self._file_hash_memo, memo_key, pdf_hash)
+
+        return pdf_hash
+
+    def _remember(self, memory:OrderedDict, memory_key:t.Hashable, memory_value:t.Any):
+        # 최근에 쓴 항목을 뒤로 보내고 max_entries를 넘으면 가장 오래 쓰지 않은 항목부터 제거
+        with self._lock:
+            memory[memory_key] = memory_value
+            memory.move_to_end(memory_key)
+            while len(memory) > self.max_entries:
+                memory.popitem(last=False)
+
+    def get_cache_key(self, pdf_path:str, model_name:str, prompt_hash:t.Optional[str]=None)->str:
+        """cache key 생성
+
+        Args:
+            pdf_path (str): 논문 pdf 경로
+            model_name (str): 목차 추출에 사용하는 llm 이름
+            prompt_hash (t.Optional[str]): 목차 추출 prompt hash. None이면 현재 prompt 사용.
+
+        Returns:
+            str: cache key
+        """
+        prompt_hash = prompt_hash or CURRENT_PROMPT_HASH
+        key_source = "\n".join([self._get_pdf_hash(pdf_path), model_name, prompt_hash])
+
+        return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+    def get(self, pdf_path:str, model_name:str)->t.Optional[t.Tuple[t.Dict[str, int], str]]:
+        """저장된 목차 조회
+
+        Args:
+            pdf_path (str): 논문 pdf 경로
+            model_name (str): 목차 추출에 사용하는 llm 이름
+
+        Returns:
+            t.Optional[t.Tuple[t.Dict[str, int], str]]: (목차, 추출 tier). 없으면 None.
+        """
+        cache_key = self.get_cache_key(pdf_path, model_name)
+        cached_result = self._memory.get(cache_key)
+        if cached_result is not None:
+            self._remember(self._memory, cache_key, cached_result)
+            return cached_result
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT paper_indexes, extract_tier FROM paper_indexes WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        cached_result = (json.loads(row[0]), row[1])
+        self._remember(self._memory, cache_key, cached_result)
+
+        return cached_result
+
+    def put(self, pdf_path:str, model_name:str, paper_indexes:t.Dict[str, int], extract_tier:str):
+        """추출된 목차 저장
+
+        Args:
+            pdf_path (str): 논문 pdf 경로
+            model_name (str): 목차 추출에 사용하는 llm 이름
+            paper_indexes (t.Dict[str, int]): 추출된 목차
+            extract_tier (str): 목차를 추출한 tier 이름
+        """
+        prompt_hash = CURRENT_PROMPT_HASH
+        cache_key = self.get_cache_key(pdf_path, model_name, prompt_hash)
+        pdf_hash = self._get_pdf_hash(pdf_path)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO paper_indexes VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    cache_key,
+                    pdf_hash,
+                    os.path.abspath(pdf_path),
+                    model_name,
+                    prompt_hash,
+                    extract_tier,
+                    json.dumps(paper_indexes, ensure_ascii=False),
+                    time.time(),
+                ),
+            )
+            self._conn.commit()
+        self._remember(self._memory, cache_key, (paper_indexes, extract_tier))
+
+    def list_entries(self)->t.List[t.Dict]:
+        """저장된 cache entry 목록(목차 본문 제외)을 반환"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT cache_key, pdf_sha256, pdf_path, model_name, prompt_hash, extract_tier, paper_indexes, created_at "
+                "FROM paper_indexes ORDER BY created_at DESC"
+            ).fetchall()
+
+        return [
+            {
+                "cache_key": row[0],
+                "pdf_sha256": row[1],
+                "pdf_path": row[2],
+                "model_name": row[3],
+                "prompt_hash": row[4],
+                "extract_tier": row[5],
+                "index_count": len(json.loads(row[6])),
+                "created_at": row[7],
+                "is_current_prompt": row[4] == CURRENT_PROMPT_HASH,
+            }
+            for row in rows
+        ]
+
+    def purge(
+        self,
+        pdf_path:t.Optional[str]=None,
+        model_name:t.Optional[str]=None,
+        older_than_seconds:t.Optional[float]=None,
+        stale_prompt_only:bool=False,
+    )->int:
+        """조건에 맞는 cache entry들을 삭제. 조건이 없으면 전체 삭제.
+
+        Args:
+            pdf_path (t.Optional[str]): 해당 pdf의 entry만 삭제
+            model_name (t.Optional[str]): 해당 model의 entry만 삭제
+            older_than_seconds (t.Optional[float]): 지정 시간보다 오래된 entry만 삭제
+            stale_prompt_only (bool): 현재 prompt가 아닌 entry만 삭제
+
+        Returns:
+            int: 삭제된 entry 수
+        """
+        conditions, params = [], []
+        if pdf_path is not None:
+            conditions.append("pdf_sha256 = ?")
+            params.append(self._get_pdf_hash(pdf_path))
+        if model_name is not None:
+            conditions.append("model_name = ?")
+            params.append(model_name)
+        if older_than_seconds is not None:
+            conditions.append("created_at < ?")
+            params.append(time.time() - older_than_seconds)
+        if stale_prompt_only:
+            conditions.append("prompt_hash != ?")
+            params.append(CURRENT_PROMPT_HASH)
+        where_clause = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self._lock:
+            deleted_count = self._conn.execute(f"DELETE FROM paper_indexes{where_clause}", params).rowcount
+            self._conn.commit()
+            self._memory.clear()
+
+        return deleted_count
+
+
+@functools.lru_cache(maxsize=None)
+def get_paper_index_cache(db_path:str=PAPER_INDEX_CACHE_PATH)->PaperIndexCache:
+    """프로세스 내에서 공유하는 PaperIndexCache를 반환"""
+    return PaperIndexCache(db_path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="inspect or purge extracted paper index cache")
+    parser.add_argument("--db-path", default=PAPER_INDEX_CACHE_PATH)
+    sub_parsers = parser.add_subparsers(dest="command", required=True)
+    sub_parsers.add_parser("list")
+    purge_parser = sub_parsers.add_parser("purge")
+    purge_parser.add_argument("--pdf-path", default=None)
+    purge_parser.add_argument("--model-name", default=None)
+    purge_parser.add_argument("--older-than-days", type=float, default=None)
+    purge_parser.add_argument("--stale-prompt-only", action="store_true")
+    args = parser.parse_args()
+
+    paper_index_cache = PaperIndexCache(args.db_path)
+    if args.command == "list":
+        for entry in paper_index_cache.list_entries():
+            print(json.dumps(entry, ensure_ascii=False))
+    else:
+        older_than_seconds = args.older_than_days * 86400 if args.older_than_days is not None else None
+        deleted_count = paper_index_cache.purge(
+            pdf_path=args.pdf_path,
+            model_name=args.model_name,
+            older_than_seconds=older_than_seconds,
+            stale_prompt_only=args.stale_prompt_only,
+        )
+        print(f"purged {deleted_count} entries")
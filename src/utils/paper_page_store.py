@@ -0,0 +1,130 @@
+import functools
+import mmap
+import os
+import struct
+import threading
+import typing as t
+
+import fitz
+
+# store 파일 구조: header(magic, version, page 수) + offset table(page 수 + 1개, uint64) + utf-8 페이지 텍스트들
+PAGE_STORE_MAGIC = b"PGTX"
+PAGE_STORE_VERSION = 1
+PAGE_STORE_EXTENSION = ".pages"
+_HEADER_STRUCT = struct.Struct("<4sII")
+_OFFSET_STRUCT = struct.Struct("<Q")
+
+
+def get_page_store_path(pdf_path:str)->str:
+    return os.path.splitext(pdf_path)[0] + PAGE_STORE_EXTENSION
+
+
+def build_paper_page_store(pdf_path:str, page_texts:t.Optional[t.Sequence[str]]=None)->str:
+    """pdf의 모든 페이지 텍스트를 offset table과 함께 하나의 store 파일로 저장
+
+    Args:
+        pdf_path (str): 논문 pdf 경로
+        page_texts (t.Optional[t.Sequence[str]]): 이미 추출된 페이지 텍스트들. None이면 pdf에서 추출.
+
+    Returns:
+        str: 저장된 store 파일 경로
+    """
+    if page_texts is None:
+        with fitz.open(pdf_path) as paper_pdf:
+            page_texts = [page.get_text("text") for page in paper_pdf]
+
+    encoded_pages = [page_text.encode("utf-8") for page_text in page_texts]
+    page_offsets = [0]
+    for encoded_page in encoded_pages:
+        page_offsets.append(page_offsets[-1] + len(encoded_page))
+
+    # 임시 파일에 쓴 뒤 rename, 쓰다 만 store를 읽는 일이 없도록 함
+    store_path = get_page_store_path(pdf_path)
+    temp_store_path = f"{store_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_store_path, "wb") as store_file:
+        store_file.write(_HEADER_STRUCT.pack(PAGE_STORE_MAGIC, PAGE_STORE_VERSION, len(encoded_pages)))
+        for page_offset in page_offsets:
+            store_file.write(_OFFSET_STRUCT.pack(page_offset))
+        for encoded_page in encoded_pages:
+            store_file.write(encoded_page)
+    os.replace(temp_store_path, store_path)
+
+    return store_path
+
+
+class PaperPageStore:
+    """mmap으로 store 파일을 열어 페이지/byte 범위를 pdf 없이 O(1)로 읽음"""
+
+    def __init__(self, store_path:str):
+        self.store_path = store_path
+        with open(store_path, "rb") as store_file:
+            self._mmap = mmap.mmap(store_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, self.page_count = _HEADER_STRUCT.unpack_from(self._mmap, 0)
+            if magic != PAGE_STORE_MAGIC or version != PAGE_STORE_VERSION:
+                raise ValueError(f"invalid page store file: {store_path}")
+            self._offset_table_start = _HEADER_STRUCT.size
+            self._data_start = self._offset_table_start + (self.page_count + 1) * _OFFSET_STRUCT.size
+            # 잘리거나 손상된 store는 offset table이 data 크기와 맞지 않음
+            page_offsets = [self._get_page_offset(page_number) for page_number in range(self.page_count + 1)]
+            if page_offsets[0] != 0 or page_offsets != sorted(page_offsets) \
+                    or self._data_start + page_offsets[-1] != len(self._mmap):
+                raise ValueError(f"truncated or corrupt page store file: {store_path}")
+        except (ValueError, struct.error):
+            self._mmap.close()
+            raise
+
+    def __len__(self)->int:
+        return self.page_count
+
+    def _get_page_offset(self, page_number:int)->int:
+        return _OFFSET_STRUCT.unpack_from(self._mmap, self._offset_table_start + page_number * _OFFSET_STRUCT.size)[0]
+
+    def get_page_byte_range(self, page_number:int)->t.Tuple[int, int]:
+        """페이지의 (시작, 끝) byte offset. data 영역 기준."""
+        if not 0 <= page_number < self.page_count:
+            raise IndexError(f"page {page_number} is out of range(0~{self.page_count - 1})")
+
+        return self._get_page_offset(page_number), self._get_page_offset(page_number + 1)
+
+    def read_bytes(self, start:int, end:int)->bytes:
+        """data 영역 기준 byte 범위를 읽음. 여러 페이지에 걸쳐도 됨."""
+        return self._mmap[self._data_start + start:self._data_start + end]
+
+    def get_page_text(self, page_number:int)->str:
+        return self.read_bytes(*self.get_page_byte_range(page_number)).decode("utf-8")
+
+    def get_page_texts(self)->t.List[str]:
+        return [self.get_page_text(page_number) for page_number in range(self.page_count)]
+
+    def close(self):
+        self._mmap.close()
+
+
+@functools.lru_cache(maxsize=64)
+def _open_paper_page_store(store_path:str, store_mtime_ns:int)->PaperPageStore:
+    return PaperPageStore(store_path)
+
+
+def load_paper_page_store(pdf_path:str)->t.Optional[PaperPageStore]:
+    """pdf에 대한 최신 page store가 있으면 열린 store를 반환, 없거나 pdf보다 오래됐으면 None.
+    잘리거나 손상된 store는 지우고 pdf에서 다시 만든다."""
+    store_path = get_page_store_path(pdf_path)
+    try:
+        store_mtime_ns = os.stat(store_path).st_mtime_ns
+        pdf_mtime_ns = os.stat(pdf_path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    if store_mtime_ns < pdf_mtime_ns:
+        return None
+
+    try:
+        return _open_paper_page_store(store_path, store_mtime_ns)
+    except (ValueError, struct.error) as store_error:
+        # mmap은 빈 파일에서 ValueError, 잘린 header는 struct.error
+        print(f"[load_paper_page_store] rebuild page store of '{pdf_path}': {store_error}")
+        os.remove(store_path)
+        build_paper_page_store(pdf_path)
+
+        return _open_paper_page_store(store_path, os.stat(store_path).st_mtime_ns)
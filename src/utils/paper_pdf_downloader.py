@@ -0,0 +1,203 @@
+import os
+import threading
+import time
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.utils.single_flight import SingleFlight
+
+PDF_MAGIC = b"%PDF"
+PARTIAL_DOWNLOAD_SUFFIX = ".part"
+
+
+class PdfIntegrityError(Exception):
+    """다운로드 받은 파일의 크기나 pdf magic이 올바르지 않을 때 발생"""
+
+
+class PdfDownloadTimeout(requests.Timeout):
+    """재시도를 포함한 다운로드 전체 시간이 max_download_seconds를 넘었을 때 발생. 받던 .part는 남겨 다음 요청에서 이어 받음."""
+
+
+def is_pdf_file(pdf_path:str)->bool:
+    """파일이 존재하고 pdf magic(%PDF)으로 시작하는지 검사"""
+    try:
+        with open(pdf_path, "rb") as pdf_file:
+            return pdf_file.read(len(PDF_MAGIC)) == PDF_MAGIC
+    except FileNotFoundError:
+        return False
+
+
+def _get_expected_total_size(response:requests.Response, resume_from:int)->t.Optional[int]:
+    # 206: 'Content-Range: bytes 100-999/1000' 의 전체 크기, 200: Content-Length
+    content_range = response.headers.get("Content-Range")
+    if response.status_code == 206 and content_range and "/" in content_range:
+        total_size = content_range.rsplit("/", 1)[1]
+        if total_size.isdigit():
+            return int(total_size)
+    content_length = response.headers.get("Content-Length")
+    if content_length and content_length.isdigit():
+        return int(content_length) + (resume_from if response.status_code == 206 else 0)
+
+    return None
+
+
+class PaperPdfDownloader:
+    """connection pool을 공유하는 pdf downloader.
+
+    - 임시 파일(.part)에 받은 뒤 검증이 끝나면 최종 경로로 atomic rename
+    - 이전에 받다 만 .part가 있으면 HTTP Range로 이어 받기
+    - Content-Length와 %PDF magic으로 무결성 검사
+    - 동시 다운로드 수는 max_workers로 제한
+    - timeout(connect, read)은 socket 읽기 한 번 단위이므로, 조금씩 계속 보내는 응답과 재시도까지 포함한
+      다운로드 전체 시간은 max_download_seconds로 제한(tool worker thread가 tool timeout 뒤에도 남지 않도록)
+    - single_flight가 주어지면 같은 저장 경로의 동시 다운로드(thread/process)를 하나로 합치고,
+      먼저 끝난 caller가 받아둔 pdf는 다시 받지 않음
+    """
+
+    def __init__(
+        self,
+        max_workers:int=4,
+        timeout:t.Tuple[float, float]=(5.0, 60.0),
+        max_retries:int=3,
+        retry_backoff:float=1.0,
+        chunk_size:int=1 << 16,
+        single_flight:t.Optional[SingleFlight]=None,
+        max_download_seconds:t.Optional[float]=None,
+    ):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_download_seconds = max_download_seconds
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.chunk_size = chunk_size
+        self.single_flight = single_flight
+        self._semaphore = threading.BoundedSemaphore(max_workers)
+
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": "arxiv-paper-multi-agent"})
+        http_adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", http_adapter)
+        self.session.mount("https://", http_adapter)
+
+    @staticmethod
+    def _get_remaining_seconds(http_pdf_path:str, deadline:t.Optional[float])->t.Optional[float]:
+        if deadline is None:
+            return None
+        remaining_seconds = deadline - time.monotonic()
+        if remaining_seconds <= 0:
+            raise PdfDownloadTimeout(f"download did not finish in time: {http_pdf_path}")
+
+        return remaining_seconds
+
+    def _download_once(self, http_pdf_path:str, pdf_download_path:str, deadline:t.Optional[float]=None):
+        temp_download_path = pdf_download_path + PARTIAL_DOWNLOAD_SUFFIX
+        resume_from = os.path.getsize(temp_download_path) if os.path.isfile(temp_download_path) else 0
+        request_headers = {"Range": f"bytes={resume_from}-"} if resume_from else {}
+        # 남은 시간보다 오래 응답을 기다리지 않음
+        remaining_seconds = self._get_remaining_seconds(http_pdf_path, deadline)
+        request_timeout = self.timeout
+        if remaining_seconds is not None:
+            request_timeout = tuple(min(timeout, remaining_seconds) for timeout in self.timeout)
+
+        with self.session.get(http_pdf_path, headers=request_headers, stream=True, timeout=request_timeout) as response:
+            if response.status_code == 416:
+                # 남아있는 .part가 서버 파일과 맞지 않음, 처음부터 다시 받음
+                os.remove(temp_download_path)
+                raise PdfIntegrityError(f"range not satisfiable for {http_pdf_path}, restart download")
+            response.raise_for_status()
+
+            # 서버가 Range를 무시하고 200을 주면 처음부터 다시 씀
+            if response.status_code != 206:
+                resume_from = 0
+            expected_total_size = _get_expected_total_size(response, resume_from)
+            with open(temp_download_path, "ab" if resume_from else "wb") as temp_file:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    temp_file.write(chunk)
+                    self._get_remaining_seconds(http_pdf_path, deadline)
+
+        # 무결성 검사, 덜 받은 .part는 다음 시도에서 이어 받음
+        downloaded_size = os.path.getsize(temp_download_path)
+        if expected_total_size is not None and downloaded_size != expected_total_size:
+            if downloaded_size > expected_total_size:
+                os.remove(temp_download_path)
+            raise PdfIntegrityError(
+                f"size mismatch for {http_pdf_path}: expected {expected_total_size}, got {downloaded_size}"
+            )
+        if not is_pdf_file(temp_download_path):
+            os.remove(temp_download_path)
+            raise PdfIntegrityError(f"downloaded file is not pdf: {http_pdf_path}")
+
+        os.replace(temp_download_path, pdf_download_path)
+
+    def download(self, http_pdf_path:str, pdf_download_path:str)->str:
+        """단일 pdf 다운로드. 실패 시 backoff 후 max_retries까지 재시도.
+
+        Args:
+            http_pdf_path (str): pdf url
+            pdf_download_path (str): 저장 경로
+
+        Returns:
+            str: 저장 경로
+        """
+        if self.single_flight is None:
+            return self._download_with_retry(http_pdf_path, pdf_download_path)
+
+        def download_once_per_path()->str:
+            # 기다리는 동안 다른 caller/worker가 받아둔 pdf는 재사용
+            if is_pdf_file(pdf_download_path):
+                return pdf_download_path
+            return self._download_with_retry(http_pdf_path, pdf_download_path)
+
+        return self.single_flight.do(f"download:{os.path.abspath(pdf_download_path)}", download_once_per_path)
+
+    def _download_with_retry(self, http_pdf_path:str, pdf_download_path:str)->str:
+        deadline = None if self.max_download_seconds is None else time.monotonic() + self.max_download_seconds
+        for attempt in range(self.max_retries):
+            try:
+                # backoff 동안에는 다른 다운로드가 slot을 쓸 수 있도록 요청 중에만 slot을 잡음
+                if not self._semaphore.acquire(timeout=self._get_remaining_seconds(http_pdf_path, deadline)):
+                    raise PdfDownloadTimeout(f"no download slot in time: {http_pdf_path}")
+                try:
+                    self._download_once(http_pdf_path, pdf_download_path, deadline)
+                finally:
+                    self._semaphore.release()
+                return pdf_download_path
+            except PdfDownloadTimeout:
+                raise
+            except (requests.RequestException, PdfIntegrityError) as download_error:
+                backoff_seconds = self.retry_backoff * (2 ** attempt)
+                if attempt == self.max_retries - 1 or (deadline is not None and time.monotonic() + backoff_seconds >= deadline):
+                    raise
+                print(f"[PaperPdfDownloader] retry download({attempt + 1}/{self.max_retries}): {download_error}")
+                time.sleep(backoff_seconds)
+
+        return pdf_download_path
+
+    def download_many(
+        self, download_targets:t.Sequence[t.Tuple[str, str]], return_exceptions:bool=False
+    )->t.List[t.Union[str, Exception]]:
+        """여러 pdf를 동시에 다운로드
+
+        Args:
+            download_targets (t.Sequence[t.Tuple[str, str]]): (pdf url, 저장 경로) 리스트
+            return_exceptions (bool): True면 실패한 다운로드의 예외를 저장 경로 대신 결과에 담고 나머지 다운로드를 계속 진행
+
+        Returns:
+            t.List[t.Union[str, Exception]]: 입력 순서대로의 저장 경로(또는 예외)들
+        """
+        def download_target(download_target:t.Tuple[str, str])->t.Union[str, Exception]:
+            try:
+                return self.download(*download_target)
+            except (requests.RequestException, PdfIntegrityError, OSError) as download_error:
+                if not return_exceptions:
+                    raise
+                return download_error
+
+        if len(download_targets) <= 1:
+            return [download_target(target) for target in download_targets]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(download_targets))) as executor:
+            return list(executor.map(download_target, download_targets))
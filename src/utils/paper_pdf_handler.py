@@ -1,11 +1,168 @@
-import wget
+import contextlib
+import os
+import threading
+import typing as t
+from collections import OrderedDict
+
 import fitz
 
+from src.common.common import (
+    PDF_CACHE_MAX_BYTES,
+    PDF_CACHE_MAX_DOCUMENTS,
+    PDF_DOWNLOAD_MAX_RETRIES,
+    PDF_DOWNLOAD_MAX_SECONDS,
+    PDF_DOWNLOAD_MAX_WORKERS,
+    PDF_DOWNLOAD_TIMEOUT,
+)
+from src.utils.paper_pdf_downloader import PaperPdfDownloader
+from src.utils.paper_page_store import load_paper_page_store
+from src.utils.single_flight import paper_single_flight
+
+
+class PdfDocumentCache:
+    """열린 fitz.Document와 페이지 텍스트를 (path, mtime) 기준으로 보관하는 process-wide LRU cache.
+
+    문서 수(max_documents)와 추정 메모리(pdf 파일 크기 + 캐시된 텍스트 길이, max_bytes) 중
+    하나라도 넘으면 가장 오래 사용되지 않은 문서부터 제거한다.
+    """
+
+    def __init__(self, max_documents:int, max_bytes:int):
+        self.max_documents = max_documents
+        self.max_bytes = max_bytes
+        # abspath -> {"mtime_ns", "document", "document_lock", "page_texts", "size_bytes"}
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        self.document_hits = 0
+        self.document_misses = 0
+        self.page_text_hits = 0
+        self.page_text_misses = 0
+        self.evictions = 0
+
+    def _evict_if_needed(self):
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_documents or self._total_bytes > self.max_bytes
+        ):
+            _, evicted_entry = self._entries.popitem(last=False)
+            self._total_bytes -= evicted_entry["size_bytes"]
+            self.evictions += 1
+            # 아직 문서를 쓰는 caller가 있을 수 있으므로 close하지 않고 참조만 해제(GC 시 close)
+
+    def _get_entry(self, pdf_path:str)->t.Dict:
+        cache_key = os.path.abspath(pdf_path)
+        pdf_stat = os.stat(cache_key)
+        entry = self._entries.get(cache_key)
+        if entry is not None and entry["mtime_ns"] == pdf_stat.st_mtime_ns:
+            self._entries.move_to_end(cache_key)
+            self.document_hits += 1
+            return entry
+
+        # 처음 열거나 파일이 바뀐 경우 새로 open
+        self.document_misses += 1
+        if entry is not None:
+            self._total_bytes -= entry["size_bytes"]
+        entry = {
+            "mtime_ns": pdf_stat.st_mtime_ns,
+            "document": fitz.open(cache_key),
+            # MuPDF 문서는 thread-safe 하지 않으므로 문서별 lock 안에서만 접근
+            "document_lock": threading.RLock(),
+            "page_texts": {},
+            "size_bytes": pdf_stat.st_size,
+        }
+        self._entries[cache_key] = entry
+        self._entries.move_to_end(cache_key)
+        self._total_bytes += entry["size_bytes"]
+        self._evict_if_needed()
+
+        return entry
+
+    def get_document(self, pdf_path:str)->fitz.Document:
+        with self._lock:
+            return self._get_entry(pdf_path)["document"]
+
+    @contextlib.contextmanager
+    def locked_document(self, pdf_path:str)->t.Iterator[fitz.Document]:
+        """다른 thread와 겹치지 않도록 문서 lock을 잡은 상태로 캐시된 문서를 사용"""
+        with self._lock:
+            entry = self._get_entry(pdf_path)
+        with entry["document_lock"]:
+            yield entry["document"]
+
+    def get_page_text(self, pdf_path:str, page_number:int)->str:
+        with self._lock:
+            entry = self._get_entry(pdf_path)
+            page_text = entry["page_texts"].get(page_number)
+            if page_text is not None:
+                self.page_text_hits += 1
+                return page_text
+            self.page_text_misses += 1
+
+        with entry["document_lock"]:
+            page_text = entry["document"].load_page(page_number).get_text("text")
+
+        with self._lock:
+            if page_number not in entry["page_texts"]:
+                entry["page_texts"][page_number] = page_text
+                entry["size_bytes"] += len(page_text)
+                # 이미 evict된 문서의 텍스트는 전체 크기에 반영하지 않음
+                if self._entries.get(os.path.abspath(pdf_path)) is entry:
+                    self._total_bytes += len(page_text)
+                    self._evict_if_needed()
+
+        return page_text
+
+    def get_page_texts(self, pdf_path:str)->t.List[str]:
+        with self._lock:
+            page_count = len(self._get_entry(pdf_path)["document"])
+
+        return [self.get_page_text(pdf_path, page_number) for page_number in range(page_count)]
+
+    def stats(self)->t.Dict[str, int]:
+        with self._lock:
+            return {
+                "documents": len(self._entries),
+                "total_bytes": self._total_bytes,
+                "document_hits": self.document_hits,
+                "document_misses": self.document_misses,
+                "page_text_hits": self.page_text_hits,
+                "page_text_misses": self.page_text_misses,
+                "evictions": self.evictions,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+
+pdf_document_cache = PdfDocumentCache(max_documents=PDF_CACHE_MAX_DOCUMENTS, max_bytes=PDF_CACHE_MAX_BYTES)
+paper_pdf_downloader = PaperPdfDownloader(
+    max_workers=PDF_DOWNLOAD_MAX_WORKERS,
+    timeout=PDF_DOWNLOAD_TIMEOUT,
+    max_retries=PDF_DOWNLOAD_MAX_RETRIES,
+    single_flight=paper_single_flight,
+    max_download_seconds=PDF_DOWNLOAD_MAX_SECONDS,
+)
+
 
 def paper_pdf_download(http_pdf_path:str, pdf_download_path:str):
-    wget.download(url=http_pdf_path, out=pdf_download_path)
+    paper_pdf_downloader.download(http_pdf_path=http_pdf_path, pdf_download_path=pdf_download_path)
+
+def paper_pdf_download_many(
+    download_targets:t.Sequence[t.Tuple[str, str]], return_exceptions:bool=False
+)->t.List[t.Union[str, Exception]]:
+    return paper_pdf_downloader.download_many(download_targets, return_exceptions=return_exceptions)
 
 def paper_pdf_load(pdf_path:str)->fitz.Document:
-    pdf_file = fitz.open(pdf_path)
+    # 캐시된 문서는 공유되므로 여러 thread에서 쓸 때는 pdf_document_cache.locked_document를 사용
+    pdf_file = pdf_document_cache.get_document(pdf_path)
 
     return pdf_file
+
+def paper_pdf_page_texts(pdf_path:str)->t.List[str]:
+    # 미리 추출된 page store가 있으면 pdf를 열지 않고 mmap으로 읽음
+    paper_page_store = load_paper_page_store(pdf_path)
+    if paper_page_store is not None:
+        return paper_page_store.get_page_texts()
+
+    return pdf_document_cache.get_page_texts(pdf_path)
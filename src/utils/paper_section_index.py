@@ -0,0 +1,109 @@
+import functools
+import re
+import typing as t
+
+import tiktoken
+
+PAGE_SEPARATOR = "\n"
+
+
+def _find_heading_offset(full_text:str, index:str, search_start:int)->t.Optional[int]:
+    """search_start 이후에서 목차 heading이 등장하는 문자 offset을 찾음. 줄바꿈/공백 차이는 무시."""
+    heading_words = index.split()
+    if not heading_words:
+        return None
+    heading_pattern = re.compile(r"\s+".join(re.escape(word) for word in heading_words), re.IGNORECASE)
+    search_result = heading_pattern.search(full_text, search_start)
+
+    return search_result.start() if search_result else None
+
+
+class PaperSectionIndex:
+    """논문 전체 텍스트 위에 목차별 문자 단위 span(heading 시작 ~ 다음 heading 시작)을 기록한 index"""
+
+    def __init__(self, page_texts:t.Sequence[str], paper_indexes:t.Dict[str, int]):
+        self.page_offsets = []
+        text_offset = 0
+        for page_text in page_texts:
+            self.page_offsets.append(text_offset)
+            text_offset += len(page_text) + len(PAGE_SEPARATOR)
+        self.full_text = PAGE_SEPARATOR.join(page_texts)
+        self.section_spans = self._build_section_spans(paper_indexes)
+
+    def _build_section_spans(self, paper_indexes:t.Dict[str, int])->t.Dict[str, t.Tuple[int, int]]:
+        """목차별 (시작 offset, 끝 offset) span 생성
+
+        Args:
+            paper_indexes (t.Dict[str, int]): index: page로 구성된 목차
+
+        Returns:
+            t.Dict[str, t.Tuple[int, int]]: index: (start, end) 문자 offset span
+        """
+        # 1. 각 목차 heading의 시작 offset 탐색(목차 페이지 시작부터), 못 찾으면 페이지 시작
+        heading_offsets = []
+        for index, page_number in paper_indexes.items():
+            page_number = min(max(int(page_number), 0), len(self.page_offsets) - 1)
+            page_offset = self.page_offsets[page_number] if self.page_offsets else 0
+            heading_offset = _find_heading_offset(self.full_text, index, page_offset)
+            heading_offsets.append((page_offset if heading_offset is None else heading_offset, index))
+        heading_offsets.sort()
+
+        # 2. 다음 heading 시작 offset까지를 section span으로 사용
+        all_offsets = sorted({offset for offset, _ in heading_offsets})
+        section_spans = {}
+        for start_offset, index in heading_offsets:
+            next_offsets = [offset for offset in all_offsets if offset > start_offset]
+            section_spans[index] = (start_offset, next_offsets[0] if next_offsets else len(self.full_text))
+
+        return section_spans
+
+    def find_index_name(self, target_index_name:str)->t.Optional[str]:
+        """사용자가 요청한 목차 이름과 일치하는 목차를 찾음(대소문자/공백 차이 무시)"""
+        if target_index_name in self.section_spans:
+            return target_index_name
+        normalized_target = " ".join(target_index_name.split()).lower()
+        for index in self.section_spans:
+            if " ".join(index.split()).lower() == normalized_target:
+                return index
+
+        return None
+
+    def get_section_text(
+        self,
+        index:str,
+        cursor:int=0,
+        max_tokens:t.Optional[int]=None,
+        tokenizer:t.Optional[tiktoken.Encoding]=None,
+    )->t.Tuple[str, t.Optional[int]]:
+        """목차 section 텍스트를 반환. max_tokens가 주어지면 그 길이까지만 자르고 이어 읽을 cursor를 함께 반환.
+
+        Args:
+            index (str): 대상 목차
+            cursor (int): section 시작부터의 문자 offset
+            max_tokens (t.Optional[int]): 반환할 최대 token 수
+            tokenizer (t.Optional[tiktoken.Encoding]): token 수 계산용 tokenizer
+
+        Returns:
+            t.Tuple[str, t.Optional[int]]: (section 텍스트, 다음 cursor). 끝까지 반환했으면 cursor는 None.
+        """
+        start_offset, end_offset = self.section_spans[index]
+        section_text = self.full_text[start_offset:end_offset][cursor:]
+        if max_tokens is None or tokenizer is None:
+            return section_text, None
+
+        section_tokens = tokenizer.encode(section_text)
+        if len(section_tokens) <= max_tokens:
+            return section_text, None
+
+        # token 경계에서 잘린 multi-byte 문자는 다음 cursor에서 다시 읽음
+        chunk_text = tokenizer.decode(section_tokens[:max_tokens]).rstrip("\ufffd")
+        if not section_text.startswith(chunk_text):
+            chunk_text = section_text[:len(chunk_text)]
+        chunk_text = chunk_text or section_text[:1]
+
+        return chunk_text, cursor + len(chunk_text)
+
+
+@functools.lru_cache(maxsize=32)
+def get_tokenizer(using_llm_name:str)->tiktoken.Encoding:
+    return tiktoken.encoding_for_model(using_llm_name)
@@ -0,0 +1,164 @@
+import difflib
+import functools
+import re
+import typing as t
+
+from src.common.prompts import RECENT_PAPER_TYPES
+
+# RECENT_PAPER_TYPES의 한/영 이름 외에 사용자가 자주 쓰는 표현들
+EXTRA_PAPER_TYPE_ALIASES = {
+    "cs.AI": ["ai", "인공 지능"],
+    "cs.CL": ["nlp", "자연어", "자연어 처리", "자연어처리", "언어 모델", "언어모델", "llm", "natural language processing"],
+    "cs.CV": ["컴퓨터 비전", "컴퓨터비전", "비전", "vision", "computer vision", "이미지 인식"],
+    "cs.CR": ["보안", "암호", "security", "cryptography"],
+    "cs.DB": ["database", "db"],
+    "cs.DC": ["분산 컴퓨팅", "병렬 컴퓨팅", "distributed computing", "parallel computing"],
+    "cs.GT": ["game theory"],
+    "cs.HC": ["hci", "인간 컴퓨터 상호작용"],
+    "cs.IR": ["ir", "정보검색", "추천 시스템", "추천시스템", "recommender system", "recommender systems"],
+    "cs.LG": ["머신러닝", "머신 러닝", "기계학습", "딥러닝", "딥 러닝", "ml", "deep learning"],
+    "cs.MA": ["multi-agent", "multi agent", "멀티 에이전트"],
+    "cs.NE": ["neural networks", "evolutionary computing"],
+    "cs.PL": ["programming language"],
+    "cs.RO": ["로봇", "robot", "robotics"],
+    "cs.SE": ["software engineering", "소프트웨어 엔지니어링"],
+    "cs.SD": ["음성", "오디오", "audio", "speech"],
+}
+_PAPER_TYPE_CODE_PATTERN = re.compile(r"\bcs\.([a-z]{2})\b")
+_ENGLISH_WORD_PATTERN = re.compile(r"[a-z][a-z\-]+")
+_PRECEDING_ENGLISH_WORD_PATTERN = re.compile(r"([a-z][a-z\-]*) $")
+# 여러 단어 영어 alias 앞에 와도 분야를 바꾸지 않는 단어들. 그 외 단어가 바로 앞에 붙으면('graph neural networks')
+# 더 좁은 다른 분야일 수 있으므로 confidence를 낮춰 llm이 분류하도록 함
+_ALIAS_LEADING_WORDS = {
+    "a", "an", "the", "on", "in", "about", "of", "for", "and", "or", "with", "to", "me", "some", "any",
+    "recent", "latest", "new", "top",
+}
+_COMPOUND_ALIAS_CONFIDENCE = 0.6
+_PAPER_TYPE_CODES = {paper_type.lower(): paper_type for paper_type in RECENT_PAPER_TYPES}
+# 너무 일반적이라 단독으로는 분야를 특정할 수 없는 이름
+_AMBIGUOUS_ALIASES = {"other", "기타", "논리", "성능", "소리", "sound", "performance", "graphics", "그래픽스"}
+
+
+def normalize_user_input(user_input:str)->str:
+    return re.sub(r"\s+", " ", user_input).strip().lower()
+
+
+def _split_english_name(english_name:str)->t.List[str]:
+    # 'Computation and Language, NLP' -> ['computation and language, nlp', 'computation and language', 'nlp']
+    english_name = english_name.lower()
+    name_parts = [name_part.strip() for name_part in english_name.split(",") if name_part.strip()]
+    if len(name_parts) > 1 and not name_parts[-1].startswith("and "):
+        return [english_name, *name_parts]
+
+    return [english_name]
+
+
+@functools.lru_cache(maxsize=1)
+def get_paper_type_aliases()->t.Dict[str, str]:
+    """alias(소문자) -> arxiv category code 테이블. RECENT_PAPER_TYPES와 EXTRA_PAPER_TYPE_ALIASES로 생성."""
+    paper_type_aliases = {}
+    for paper_type, (korean_name, english_name) in RECENT_PAPER_TYPES.items():
+        for alias in [korean_name.lower(), *_split_english_name(english_name)]:
+            paper_type_aliases.setdefault(alias, paper_type)
+    for paper_type, aliases in EXTRA_PAPER_TYPE_ALIASES.items():
+        for alias in aliases:
+            paper_type_aliases.setdefault(alias.lower(), paper_type)
+    for alias in _AMBIGUOUS_ALIASES:
+        paper_type_aliases.pop(alias, None)
+
+    return paper_type_aliases
+
+
+@functools.lru_cache(maxsize=1)
+def _get_alias_patterns()->t.List[t.Tuple[re.Pattern, str]]:
+    # 긴 alias부터 검사해 'computer vision'이 'vision'보다 먼저 매칭되도록 함
+    alias_patterns = []
+    for alias, paper_type in sorted(get_paper_type_aliases().items(), key=lambda item: -len(item[0])):
+        if alias.isascii():
+            # 영어 alias는 단어 경계 기준으로 매칭
+            alias_pattern = re.compile(rf"(?<![a-z0-9]){re.escape(alias)}(?![a-z0-9])")
+        else:
+            # 한글 alias는 어절 시작에서만 매칭('텔레비전'의 '비전' 제외), 뒤에는 조사가 붙을 수 있음
+            alias_pattern = re.compile(rf"(?<![가-힣a-z0-9]){re.escape(alias)}")
+        alias_patterns.append((alias_pattern, paper_type))
+
+    return alias_patterns
+
+
+def _is_compound_alias_match(remain_input:str, alias_match:re.Match)->bool:
+    # 'graph neural networks'처럼 여러 단어 영어 alias 앞에 수식어가 붙은 경우
+    alias = alias_match.group()
+    if not alias.isascii() or " " not in alias:
+        return False
+    preceding_word = _PRECEDING_ENGLISH_WORD_PATTERN.search(remain_input, 0, alias_match.start())
+
+    return preceding_word is not None and preceding_word.group(1) not in _ALIAS_LEADING_WORDS
+
+
+def _fuzzy_match_paper_types(normalized_input:str, fuzzy_cutoff:float)->t.Tuple[t.List[str], float]:
+    # 오타 대응: 영어 단어(1~3 gram)를 영어 alias와 비교
+    english_aliases = {alias: paper_type for alias, paper_type in get_paper_type_aliases().items() if alias.isascii() and len(alias) >= 5}
+    words = _ENGLISH_WORD_PATTERN.findall(normalized_input)
+    paper_types, scores = [], []
+    for ngram_size in (3, 2, 1):
+        for start in range(len(words) - ngram_size + 1):
+            ngram = " ".join(words[start:start + ngram_size])
+            if len(ngram) < 5:
+                continue
+            close_aliases = difflib.get_close_matches(ngram, english_aliases, n=1, cutoff=fuzzy_cutoff)
+            if close_aliases:
+                paper_types.append(english_aliases[close_aliases[0]])
+                scores.append(difflib.SequenceMatcher(None, ngram, close_aliases[0]).ratio())
+
+    return list(dict.fromkeys(paper_types)), min(scores, default=0.0)
+
+
+@functools.lru_cache(maxsize=1024)
+def classify_paper_types(normalized_input:str, fuzzy_cutoff:float=0.75)->t.Tuple[t.Tuple[str, ...], float]:
+    """정규화된 사용자 입력에서 arxiv category code들을 llm 없이 추출
+
+    1. 'cs.CL' 같은 category code -> 2. 한/영 이름, alias -> 3. 영어 alias fuzzy matching 순으로 시도.
+    한글 alias는 어절 시작에서만 매칭하고, 수식어가 붙은 여러 단어 영어 alias는 confidence를 낮춤.
+
+    Args:
+        normalized_input (str): normalize_user_input을 거친 사용자 입력
+        fuzzy_cutoff (float): fuzzy matching 최소 유사도
+
+    Returns:
+        t.Tuple[t.Tuple[str, ...], float]: (category code들, confidence). 찾지 못하면 ((), 0.0)
+    """
+    # 1. category code
+    paper_types = [
+        _PAPER_TYPE_CODES[f"cs.{code}"]
+        for code in _PAPER_TYPE_CODE_PATTERN.findall(normalized_input)
+        if f"cs.{code}" in _PAPER_TYPE_CODES
+    ]
+
+    # 2. alias, 매칭된 부분은 지워 짧은 alias가 중복으로 매칭되지 않도록 함
+    confidence = 1.0
+    remain_input = _PAPER_TYPE_CODE_PATTERN.sub(" ", normalized_input)
+    for alias_pattern, paper_type in _get_alias_patterns():
+        alias_match = alias_pattern.search(remain_input)
+        if alias_match:
+            paper_types.append(paper_type)
+            if _is_compound_alias_match(remain_input, alias_match):
+                confidence = min(confidence, _COMPOUND_ALIAS_CONFIDENCE)
+            remain_input = alias_pattern.sub(" ", remain_input)
+    if paper_types:
+        return tuple(dict.fromkeys(paper_types)), confidence
+
+    # 3. fuzzy matching
+    paper_types, confidence = _fuzzy_match_paper_types(normalized_input, fuzzy_cutoff)
+
+    return tuple(paper_types), confidence
+
+
+if __name__ == "__main__":
+    for user_input in [
+        "컴퓨터 비전 최신 논문들을 보고싶어",
+        "recent papers in NLP and IR",
+        "cs.RO 최신 논문",
+        "latest papers on machine lerning",
+        "요즘 재밌는 논문 알려줘",
+    ]:
+        print(user_input, "->", classify_paper_types(normalize_user_input(user_input)))
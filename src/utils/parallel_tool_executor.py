@@ -0,0 +1,223 @@
+import asyncio
+import functools
+import json
+import threading
+import time
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import BaseTool
+from langgraph.prebuilt import ToolNode
+
+from src.common.common import (
+    TOOL_CALL_DEFAULT_LIMIT,
+    TOOL_CALL_LIMITS,
+    TOOL_EXECUTOR_MAX_WORKERS,
+)
+from src.utils.single_flight import SingleFlight
+from src.utils.tool_result_cache import ToolResultCache, get_tool_cache_key, get_tool_result_cache
+
+
+def _make_error_tool_message(tool_call:t.Dict, error_type:str, error_message:str)->ToolMessage:
+    return ToolMessage(
+        content=json.dumps({"error": error_type, "tool": tool_call["name"], "message": error_message}, ensure_ascii=False),
+        name=tool_call["name"],
+        tool_call_id=tool_call["id"],
+        status="error",
+    )
+
+
+class _ToolCallStart:
+    """worker가 tool 실행 slot(tool semaphore + 호출 간격)을 얻은 시점. tool timeout은 이 시점부터 계산."""
+
+    def __init__(self, loop:t.Optional[asyncio.AbstractEventLoop]=None):
+        self.started_at = None
+        self._loop = loop
+        self._event = threading.Event() if loop is None else asyncio.Event()
+
+    def set(self):
+        # worker thread(slot 획득) 또는 완료 callback에서 호출, 먼저 호출된 시점을 사용
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+        if self._loop is None:
+            self._event.set()
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._event.set)
+
+    def wait(self):
+        self._event.wait()
+
+    async def async_wait(self):
+        await self._event.wait()
+
+    def get_remaining_seconds(self, timeout_seconds:float)->float:
+        return max(0.0, self.started_at + timeout_seconds - time.monotonic())
+
+
+class ParallelToolExecutor:
+    """마지막 AIMessage의 tool call들을 동시에 실행하는 graph node.
+
+    - 전체 동시 실행 수는 max_workers로 제한
+    - tool별 동시 실행 수(max_concurrency)와 호출 간 최소 간격(min_interval_seconds)으로 외부 api 보호
+    - tool별 timeout(timeout_seconds)을 넘기면 graph를 멈추지 않고 error ToolMessage 반환.
+      timeout은 worker/semaphore 대기가 끝나고 실행을 시작한 시점부터 계산.
+      실행 중인 thread는 중단할 수 없으므로 tool 내부의 외부 요청은 각자 request timeout으로 끝나도록 제한함.
+    - tool_result_cache가 있으면 같은(정규화된) 인자의 이전 결과를 재사용
+    - async 실행 시 여러 대화에서 동시에 들어온 같은 tool call(state를 주입받지 않는 tool)은 한 번만 실행
+
+    각 tool call은 단일 call ToolNode로 실행해 InjectedState 주입과 tool error 처리는 ToolNode와 동일하게 유지.
+    """
+
+    def __init__(
+        self,
+        tools:t.Sequence[BaseTool],
+        max_workers:int=TOOL_EXECUTOR_MAX_WORKERS,
+        tool_limits:t.Optional[t.Dict[str, t.Dict[str, float]]]=None,
+        default_limit:t.Optional[t.Dict[str, float]]=None,
+        tool_result_cache:t.Optional[t.Union[ToolResultCache, bool]]=None,
+    ):
+        self.tool_node = ToolNode(tools=tools)
+        # None이면 공유 cache 사용, False면 cache 미사용
+        self.tool_result_cache = get_tool_result_cache() if tool_result_cache is None else (tool_result_cache or None)
+        self.max_workers = max_workers
+        self.default_limit = {**TOOL_CALL_DEFAULT_LIMIT, **(default_limit or {})}
+        tool_limits = TOOL_CALL_LIMITS if tool_limits is None else tool_limits
+        self.tool_limits = {
+            tool_name: {**self.default_limit, **tool_limits.get(tool_name, {})}
+            for tool_name in self.tool_node.tools_by_name
+        }
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool_executor")
+        self._semaphores = {
+            tool_name: threading.BoundedSemaphore(int(tool_limit["max_concurrency"]))
+            for tool_name, tool_limit in self.tool_limits.items()
+        }
+        self._rate_locks = {tool_name: threading.Lock() for tool_name in self.tool_limits}
+        self._next_call_times = {tool_name: 0.0 for tool_name in self.tool_limits}
+        # process 내 중복 실행만 합침(다운로드 등 process 간 중복은 각 tool 내부에서 처리)
+        self._single_flight = SingleFlight(lock_dir=None)
+
+    def _wait_rate_limit(self, tool_name:str):
+        # 같은 tool의 호출 시작 간격을 min_interval_seconds 이상으로 유지
+        min_interval_seconds = self.tool_limits[tool_name]["min_interval_seconds"]
+        if not min_interval_seconds:
+            return
+        with self._rate_locks[tool_name]:
+            wait_seconds = self._next_call_times[tool_name] - time.monotonic()
+            if wait_seconds > 0:
+                time.sleep(wait_seconds)
+            self._next_call_times[tool_name] = time.monotonic() + min_interval_seconds
+
+    def _run_tool_call(
+        self,
+        tool_call:t.Dict,
+        state:t.Dict,
+        config:t.Optional[RunnableConfig],
+        on_start:t.Optional[t.Callable[[], None]]=None,
+    )->ToolMessage:
+        tool_name = tool_call["name"]
+        if tool_name not in self.tool_limits:
+            # 없는 tool 이름은 ToolNode가 error ToolMessage로 처리
+            return self.tool_node.invoke([AIMessage(content="", tool_calls=[tool_call])], config)[0]
+
+        # cache hit이면 동시 실행/호출 간격 제한 없이 바로 반환
+        if self.tool_result_cache is not None:
+            cached_tool_message = self.tool_result_cache.get(tool_call)
+            if cached_tool_message is not None:
+                print(f"[ParallelToolExecutor] cache hit '{tool_name}', stats: {self.tool_result_cache.stats()[tool_name]}")
+                return cached_tool_message
+
+        with self._semaphores[tool_name]:
+            self._wait_rate_limit(tool_name)
+            if on_start is not None:
+                on_start()
+            tool_result = self.tool_node.invoke({**state, "messages": [AIMessage(content="", tool_calls=[tool_call])]}, config)
+        tool_message = tool_result["messages"][0]
+        if self.tool_result_cache is not None:
+            self.tool_result_cache.put(tool_call, tool_message)
+
+        return tool_message
+
+    def invoke(self, state:t.Dict, config:t.Optional[RunnableConfig]=None)->t.Dict[str, t.List[ToolMessage]]:
+        """state의 마지막 AIMessage tool call들을 실행하고 입력 순서대로 ToolMessage들을 반환
+
+        Args:
+            state (t.Dict): graph state
+            config (t.Optional[RunnableConfig]): graph node config
+
+        Returns:
+            t.Dict[str, t.List[ToolMessage]]: {"messages": tool 결과들}
+        """
+        tool_calls = state["messages"][-1].tool_calls
+        tool_runs = []
+        for tool_call in tool_calls:
+            tool_call_start = _ToolCallStart()
+            tool_future = self._executor.submit(self._run_tool_call, tool_call, state, config, tool_call_start.set)
+            # cache hit 등 slot 없이 끝난 call도 대기가 풀리도록
+            tool_future.add_done_callback(lambda _, tool_call_start=tool_call_start: tool_call_start.set())
+            tool_runs.append((tool_call, tool_future, tool_call_start))
+
+        # timeout은 call별 실행 시작 시점 기준, 전체 대기 시간은 가장 느린 tool에 맞춰짐
+        tool_messages = []
+        for tool_call, tool_future, tool_call_start in tool_runs:
+            tool_call_start.wait()
+            try:
+                tool_messages.append(
+                    tool_future.result(timeout=tool_call_start.get_remaining_seconds(self._get_timeout_seconds(tool_call)))
+                )
+            except FutureTimeoutError:
+                tool_messages.append(self._make_timeout_tool_message(tool_call))
+            except Exception as tool_error:
+                tool_messages.append(_make_error_tool_message(tool_call, type(tool_error).__name__, str(tool_error)))
+
+        return {"messages": tool_messages}
+
+    async def _arun_tool_call(self, tool_call:t.Dict, state:t.Dict, config:t.Optional[RunnableConfig])->ToolMessage:
+        tool_name = tool_call["name"]
+        if tool_name not in self.tool_limits or self.tool_node.tool_to_state_args.get(tool_name):
+            return await self._arun_tool_call_once(tool_call, state, config)
+
+        # 같은 tool + 정규화된 인자의 call이 진행 중이면 그 결과를 공유하고 tool_call_id만 바꿈
+        tool_message = await self._single_flight.ado(
+            f"tool:{get_tool_cache_key(tool_name, tool_call['args'])}",
+            functools.partial(self._arun_tool_call_once, tool_call, state, config),
+        )
+
+        return tool_message.copy(update={"tool_call_id": tool_call["id"]})
+
+    async def _arun_tool_call_once(
+        self, tool_call:t.Dict, state:t.Dict, config:t.Optional[RunnableConfig]
+    )->ToolMessage:
+        # blocking tool(pdf 처리, urllib, sync llm 호출)은 worker pool에서 실행
+        tool_call_start = _ToolCallStart(asyncio.get_running_loop())
+        tool_future = asyncio.wrap_future(
+            self._executor.submit(self._run_tool_call, tool_call, state, config, tool_call_start.set)
+        )
+        tool_future.add_done_callback(lambda _: tool_call_start.set())
+        await tool_call_start.async_wait()
+        try:
+            return await asyncio.wait_for(
+                tool_future, timeout=tool_call_start.get_remaining_seconds(self._get_timeout_seconds(tool_call))
+            )
+        except asyncio.TimeoutError:
+            return self._make_timeout_tool_message(tool_call)
+        except Exception as tool_error:
+            return _make_error_tool_message(tool_call, type(tool_error).__name__, str(tool_error))
+
+    async def ainvoke(self, state:t.Dict, config:t.Optional[RunnableConfig]=None)->t.Dict[str, t.List[ToolMessage]]:
+        """invoke의 async 버전. tool 실행 중에도 event loop는 다른 대화를 처리함."""
+        tool_calls = state["messages"][-1].tool_calls
+        tool_messages = await asyncio.gather(*[self._arun_tool_call(tool_call, state, config) for tool_call in tool_calls])
+
+        return {"messages": list(tool_messages)}
+
+    def _get_timeout_seconds(self, tool_call:t.Dict)->float:
+        return self.tool_limits.get(tool_call["name"], self.default_limit)["timeout_seconds"]
+
+    def _make_timeout_tool_message(self, tool_call:t.Dict)->ToolMessage:
+        timeout_seconds = self._get_timeout_seconds(tool_call)
+        print(f"[ParallelToolExecutor] '{tool_call['name']}' timed out after {timeout_seconds}s")
+
+        return _make_error_tool_message(tool_call, "timeout", f"tool call did not finish in {timeout_seconds} seconds")
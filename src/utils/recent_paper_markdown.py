@@ -0,0 +1,59 @@
+import re
+import typing as t
+
+# MAKE_MARKDOWN_FORMAT_RECENT_PAPER_SUMMARY_PROMPT와 같은 순서로 heading3 항목 구성
+RECENT_PAPER_MARKDOWN_KEYS = ["paper_id", "authors", "tags", "summary"]
+EMPTY_RECENT_PAPER_MARKDOWN = "최신 논문을 찾지 못했습니다."
+
+
+def _to_single_line(value:object)->str:
+    # '\n'과 연속 공백을 공백 하나로 변환
+    return re.sub(r"\s+", " ", str(value)).strip()
+
+
+def render_recent_paper_markdown(entry:t.Dict)->str:
+    """단일 entry를 markdown으로 변환. title은 heading2(##), 나머지 key는 heading3(###).
+
+    Args:
+        entry (t.Dict): title, paper_id, authors, tags, summary를 가진 entry
+
+    Returns:
+        str: entry markdown
+    """
+    markdown_lines = [f"## {_to_single_line(entry.get('title', ''))}"]
+    for entry_key in RECENT_PAPER_MARKDOWN_KEYS:
+        markdown_lines.append(f"### {entry_key}")
+        markdown_lines.append(_to_single_line(entry.get(entry_key, "")))
+
+    return "\n".join(markdown_lines)
+
+
+def render_recent_papers_markdown(entries:t.Sequence[t.Dict])->str:
+    """entry들을 llm 없이 template으로 markdown 변환
+
+    Args:
+        entries (t.Sequence[t.Dict]): 최신 논문 entry들
+
+    Returns:
+        str: entry들을 빈 줄로 구분한 markdown text
+    """
+    if not entries:
+        return EMPTY_RECENT_PAPER_MARKDOWN
+
+    return "\n\n".join(render_recent_paper_markdown(entry) for entry in entries)
+
+
+if __name__ == "__main__":
+    print(
+        render_recent_papers_markdown(
+            [
+                {
+                    "title": "Sample\n  Paper",
+                    "paper_id": "2401.15884",
+                    "authors": "A, B",
+                    "tags": "cs.CL, cs.IR",
+                    "summary": "first line\nsecond line",
+                }
+            ]
+        )
+    )
@@ -0,0 +1,131 @@
+import asyncio
+import contextlib
+import hashlib
+import inspect
+import os
+import threading
+import typing as t
+
+try:
+    import fcntl
+except ImportError:  # windows: process 간 lock 없이 process 내 중복 제거만 수행
+    fcntl = None
+
+from src.common.common import SINGLE_FLIGHT_LOCK_DIR
+
+
+class _InFlightCall:
+    def __init__(self):
+        self.done_event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """같은 key(작업 종류 + 논문 id)로 동시에 들어온 작업을 한 번만 실행하고 결과를 공유.
+
+    - thread: 먼저 들어온 caller가 실행하고 나머지는 끝날 때까지 기다린 뒤 같은 결과(또는 예외)를 받음
+    - asyncio: 같은 event loop의 task들은 하나의 task를 공유, sync 작업은 thread caller들과도 공유
+    - process: key별 lock 파일(fcntl)로 다른 worker process와 직렬화.
+      다른 process가 먼저 끝낸 작업은 다시 하지 않도록, 작업 함수는 시작 시 결과가 이미 있는지 확인해야 함.
+    """
+
+    def __init__(self, lock_dir:t.Optional[str]=SINGLE_FLIGHT_LOCK_DIR):
+        self.lock_dir = lock_dir
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._async_tasks = {}
+
+    def _get_lock_path(self, key:str)->str:
+        return os.path.join(self.lock_dir, hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + ".lock")
+
+    @contextlib.contextmanager
+    def file_lock(self, key:str)->t.Iterator[None]:
+        """key에 대한 process 간 배타 lock"""
+        if fcntl is None or self.lock_dir is None:
+            yield
+            return
+
+        os.makedirs(self.lock_dir, exist_ok=True)
+        with open(self._get_lock_path(key), "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def do(self, key:str, work:t.Callable[[], t.Any])->t.Any:
+        """key에 대해 진행 중인 작업이 있으면 그 결과를 기다리고, 없으면 work를 실행
+
+        Args:
+            key (str): 작업 key. ex) 'download:2401.15884'
+            work (t.Callable[[], t.Any]): 실행할 작업
+
+        Returns:
+            t.Any: work 결과
+        """
+        with self._lock:
+            in_flight_call = self._calls.get(key)
+            is_leader = in_flight_call is None
+            if is_leader:
+                in_flight_call = self._calls[key] = _InFlightCall()
+
+        if not is_leader:
+            in_flight_call.done_event.wait()
+            if in_flight_call.error is not None:
+                raise in_flight_call.error
+            return in_flight_call.result
+
+        try:
+            with self.file_lock(key):
+                in_flight_call.result = work()
+        except BaseException as work_error:
+            in_flight_call.error = work_error
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            in_flight_call.done_event.set()
+
+        return in_flight_call.result
+
+    async def _run_async_leader(self, key:str, work:t.Callable[[], t.Awaitable[t.Any]])->t.Any:
+        loop = asyncio.get_running_loop()
+        lock_context = self.file_lock(key)
+        try:
+            # lock 대기가 event loop를 막지 않도록 thread에서 획득
+            await asyncio.to_thread(lock_context.__enter__)
+            try:
+                return await work()
+            finally:
+                lock_context.__exit__(None, None, None)
+        finally:
+            with self._lock:
+                self._async_tasks.pop((id(loop), key), None)
+
+    async def ado(self, key:str, work:t.Callable[[], t.Any])->t.Any:
+        """do의 async 버전. work는 sync 함수 또는 coroutine 함수.
+
+        Args:
+            key (str): 작업 key
+            work (t.Callable[[], t.Any]): 실행할 작업
+
+        Returns:
+            t.Any: work 결과
+        """
+        if not inspect.iscoroutinefunction(work):
+            # sync 작업은 thread caller들과 같은 in-flight call을 공유
+            return await asyncio.to_thread(self.do, key, work)
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            leader_task = self._async_tasks.get((id(loop), key))
+            if leader_task is None:
+                leader_task = loop.create_task(self._run_async_leader(key, work))
+                self._async_tasks[(id(loop), key)] = leader_task
+
+        # 한 caller가 취소돼도 다른 caller들이 기다리는 작업은 계속 진행
+        return await asyncio.shield(leader_task)
+
+
+paper_single_flight = SingleFlight()
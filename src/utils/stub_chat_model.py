@@ -0,0 +1,97 @@
+import asyncio
+import re
+import time
+import typing as t
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable
+
+STUB_CHAT_RESPONSE = "부하 테스트용 stub 답변입니다. 실제 llm을 호출하지 않고 token 단위로 지연을 두어 생성합니다. <FINISHED>"
+
+
+class StubChatModel(BaseChatModel):
+    """네트워크 없이 고정된 답변을 token 단위 지연과 함께 생성하는 chat model(서버 부하 테스트용).
+
+    bind된 tools는 무시하고, stop sequence는 실제 api처럼 해당 위치에서 답변을 자름.
+    """
+
+    response_text: str = STUB_CHAT_RESPONSE
+    first_token_delay_seconds: float = 0.2
+    token_delay_seconds: float = 0.02
+    stop: t.Optional[t.List[str]] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub-chat"
+
+    def bind_tools(self, tools: t.Sequence[t.Any], **kwargs: t.Any) -> Runnable:
+        return self.bind(**kwargs)
+
+    def _get_tokens(self, stop: t.Optional[t.List[str]]) -> t.List[str]:
+        response_text = self.response_text
+        for stop_sequence in (stop or self.stop or []):
+            if stop_sequence in response_text:
+                response_text = response_text[:response_text.index(stop_sequence)]
+
+        return re.findall(r"\S+\s*|\s+", response_text)
+
+    def _generate(
+        self,
+        messages: t.List[BaseMessage],
+        stop: t.Optional[t.List[str]] = None,
+        run_manager: t.Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: t.Any,
+    ) -> ChatResult:
+        tokens = self._get_tokens(stop)
+        time.sleep(self.first_token_delay_seconds + self.token_delay_seconds * len(tokens))
+        message = AIMessage(content="".join(tokens), response_metadata={"finish_reason": "stop"})
+
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: t.List[BaseMessage],
+        stop: t.Optional[t.List[str]] = None,
+        run_manager: t.Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: t.Any,
+    ) -> ChatResult:
+        tokens = self._get_tokens(stop)
+        await asyncio.sleep(self.first_token_delay_seconds + self.token_delay_seconds * len(tokens))
+        message = AIMessage(content="".join(tokens), response_metadata={"finish_reason": "stop"})
+
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: t.List[BaseMessage],
+        stop: t.Optional[t.List[str]] = None,
+        run_manager: t.Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: t.Any,
+    ) -> t.Iterator[ChatGenerationChunk]:
+        time.sleep(self.first_token_delay_seconds)
+        for token in self._get_tokens(stop):
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+            time.sleep(self.token_delay_seconds)
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", response_metadata={"finish_reason": "stop"}))
+
+    async def _astream(
+        self,
+        messages: t.List[BaseMessage],
+        stop: t.Optional[t.List[str]] = None,
+        run_manager: t.Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: t.Any,
+    ) -> t.AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self.first_token_delay_seconds)
+        for token in self._get_tokens(stop):
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+            await asyncio.sleep(self.token_delay_seconds)
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", response_metadata={"finish_reason": "stop"}))
@@ -0,0 +1,236 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import typing as t
+from collections import OrderedDict, defaultdict
+
+from langchain_core.messages import ToolMessage
+
+from src.common.common import (
+    TOOL_RESULT_CACHE_MAX_ENTRIES,
+    TOOL_RESULT_CACHE_MODE,
+    TOOL_RESULT_CACHE_PATH,
+    TOOL_RESULT_CACHE_TTLS,
+)
+from src.utils.arxiv_metadata import normalize_arxiv_id
+
+
+def _normalize_text(text:str)->str:
+    return re.sub(r"\s+", " ", str(text)).strip().lower()
+
+
+def _normalize_arxiv_ids(tool_args:t.Dict)->t.Dict:
+    return {"arxiv_paper_id": sorted({normalize_arxiv_id(str(arxiv_id)) for arxiv_id in tool_args.get("arxiv_paper_id", [])})}
+
+
+def _normalize_query_text(arg_name:str)->t.Callable[[t.Dict], t.Dict]:
+    def normalize(tool_args:t.Dict)->t.Dict:
+        return {**tool_args, arg_name: _normalize_text(tool_args.get(arg_name, ""))}
+    return normalize
+
+
+# tool별 인자 정규화(id 표기, 공백, 대소문자 차이를 같은 key로)
+TOOL_ARG_NORMALIZERS = {
+    "search_paper_by_arxiv_id": _normalize_arxiv_ids,
+    "get_recent_upload_papers": _normalize_query_text("user_input"),
+    "duckduckgo_search": _normalize_query_text("query"),
+}
+
+
+def _downloaded_paths_exist(content:str)->bool:
+    try:
+        search_result = json.loads(content)
+        paper_paths = search_result["paper_paths"]
+    except (json.JSONDecodeError, TypeError, KeyError):
+        return False
+    # 찾지 못했거나 다운로드에 실패한 id가 있는 결과는 일시적인 실패일 수 있으므로 cache하지 않음
+    if not paper_paths or search_result.get("not_found_arxiv_ids") or search_result.get("failed_arxiv_ids"):
+        return False
+
+    return all(os.path.isfile(pdf_path) for pdf_path in paper_paths)
+
+
+# 저장할 결과와 cache된 결과가 유효한지 검사(다운로드한 pdf가 지워졌으면 다시 실행)
+TOOL_RESULT_VALIDATORS = {
+    "search_paper_by_arxiv_id": _downloaded_paths_exist,
+}
+
+
+def get_tool_cache_key(tool_name:str, tool_args:t.Dict)->str:
+    """정규화된 tool 인자로 cache key 계산
+
+    Args:
+        tool_name (str): tool 이름
+        tool_args (t.Dict): tool call 인자
+
+    Returns:
+        str: sha256 key
+    """
+    normalizer = TOOL_ARG_NORMALIZERS.get(tool_name)
+    normalized_args = normalizer(tool_args) if normalizer else tool_args
+    serialized_args = json.dumps(normalized_args, sort_keys=True, ensure_ascii=False, default=str)
+
+    return hashlib.sha256(f"{tool_name}\n{serialized_args}".encode("utf-8")).hexdigest()
+
+
+class ToolResultCache:
+    """tool call 결과(ToolMessage content)를 tool별 TTL로 보관하는 cache. db_path가 None이면 memory만 사용.
+
+    memory는 max_entries개까지의 LRU이고, 만료되었거나 유효하지 않은 결과는 읽을 때 memory와 db에서 삭제.
+    """
+
+    def __init__(
+        self,
+        db_path:t.Optional[str]=None,
+        tool_ttls:t.Dict[str, t.Optional[float]]=TOOL_RESULT_CACHE_TTLS,
+        max_entries:int=TOOL_RESULT_CACHE_MAX_ENTRIES,
+    ):
+        self.db_path = db_path
+        # tool 이름 -> TTL(초), None이면 만료 없음. 목록에 없는 tool은 cache하지 않음.
+        self.tool_ttls = tool_ttls
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # cache_key -> (content, expires_at)
+        self._memory = OrderedDict()
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+
+        # graph import 시점에 db 파일을 만들지 않도록 첫 get/put에서 연결
+        self._conn = None
+
+    def _get_conn(self)->t.Optional[sqlite3.Connection]:
+        # self._lock을 잡은 상태에서 호출
+        if self._conn is None and self.db_path is not None:
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS tool_results (
+                    cache_key TEXT PRIMARY KEY,
+                    tool_name TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    expires_at REAL
+                )
+                """
+            )
+            self._conn.commit()
+
+        return self._conn
+
+    def is_cacheable(self, tool_name:str)->bool:
+        return tool_name in self.tool_ttls
+
+    def _remember(self, cache_key:str, cached_value:t.Tuple[str, t.Optional[float]]):
+        # self._lock을 잡은 상태에서 호출
+        self._memory[cache_key] = cached_value
+        self._memory.move_to_end(cache_key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load(self, cache_key:str)->t.Optional[t.Tuple[str, t.Optional[float]]]:
+        # self._lock을 잡은 상태에서 호출
+        cached_value = self._memory.get(cache_key)
+        if cached_value is not None:
+            self._memory.move_to_end(cache_key)
+            return cached_value
+
+        conn = self._get_conn()
+        if conn is not None:
+            cached_value = conn.execute(
+                "SELECT content, expires_at FROM tool_results WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+            if cached_value is not None:
+                self._remember(cache_key, cached_value)
+
+        return cached_value
+
+    def _evict(self, cache_key:str):
+        # self._lock을 잡은 상태에서 호출
+        self._memory.pop(cache_key, None)
+        conn = self._get_conn()
+        if conn is not None:
+            conn.execute("DELETE FROM tool_results WHERE cache_key = ?", (cache_key,))
+            conn.commit()
+
+    def get(self, tool_call:t.Dict)->t.Optional[ToolMessage]:
+        """cache된 tool 결과가 있으면 현재 tool call id의 ToolMessage로 반환"""
+        tool_name = tool_call["name"]
+        if not self.is_cacheable(tool_name):
+            return None
+
+        cache_key = get_tool_cache_key(tool_name, tool_call["args"])
+        with self._lock:
+            cached_value = self._load(cache_key)
+        content = None
+        if cached_value is not None:
+            content, expires_at = cached_value
+            validator = TOOL_RESULT_VALIDATORS.get(tool_name)
+            if (expires_at is not None and expires_at < time.time()) or (validator and not validator(content)):
+                content = None
+
+        with self._lock:
+            if content is None:
+                if cached_value is not None:
+                    self._evict(cache_key)
+                self.misses[tool_name] += 1
+                return None
+            self.hits[tool_name] += 1
+
+        return ToolMessage(content=content, name=tool_name, tool_call_id=tool_call["id"])
+
+    def put(self, tool_call:t.Dict, tool_message:ToolMessage):
+        """성공했고 validator를 통과한 tool 결과만 저장"""
+        tool_name = tool_call["name"]
+        if not self.is_cacheable(tool_name) or tool_message.status == "error" or not isinstance(tool_message.content, str):
+            return
+        validator = TOOL_RESULT_VALIDATORS.get(tool_name)
+        if validator and not validator(tool_message.content):
+            return
+
+        cache_key = get_tool_cache_key(tool_name, tool_call["args"])
+        tool_ttl = self.tool_ttls[tool_name]
+        expires_at = time.time() + tool_ttl if tool_ttl is not None else None
+        with self._lock:
+            self._remember(cache_key, (tool_message.content, expires_at))
+            conn = self._get_conn()
+            if conn is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO tool_results (cache_key, tool_name, content, expires_at) VALUES (?, ?, ?, ?)",
+                    (cache_key, tool_name, tool_message.content, expires_at),
+                )
+                conn.commit()
+
+    def stats(self)->t.Dict[str, t.Dict[str, int]]:
+        with self._lock:
+            return {
+                tool_name: {"hits": self.hits[tool_name], "misses": self.misses[tool_name]}
+                for tool_name in sorted(set(self.hits) | set(self.misses))
+            }
+
+
+_tool_result_cache = None
+_tool_result_cache_lock = threading.Lock()
+
+
+def get_tool_result_cache()->t.Optional[ToolResultCache]:
+    """TOOL_RESULT_CACHE_MODE(off | memory | sqlite, 환경변수로 변경 가능)에 맞는 공유 cache를 반환"""
+    global _tool_result_cache
+    with _tool_result_cache_lock:
+        if _tool_result_cache is None:
+            cache_mode = os.getenv("TOOL_RESULT_CACHE_MODE", TOOL_RESULT_CACHE_MODE)
+            if cache_mode == "off":
+                _tool_result_cache = False
+            elif cache_mode == "memory":
+                _tool_result_cache = ToolResultCache()
+            elif cache_mode == "sqlite":
+                _tool_result_cache = ToolResultCache(os.getenv("TOOL_RESULT_CACHE_PATH", TOOL_RESULT_CACHE_PATH))
+            else:
+                raise ValueError(f"unknown tool result cache mode '{cache_mode}', choose one of ['off', 'memory', 'sqlite']")
+
+    return _tool_result_cache or None
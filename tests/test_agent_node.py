@@ -0,0 +1,50 @@
+import os
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+# AgentCreator가 openai 대신 stub llm을 사용
+os.environ.setdefault("CHAT_LLM_STUB", "1")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from src.agents.agent import AgentCreator  # noqa: E402
+from src.agents.agent_node import _make_agent_node_result, _restore_stop_sequence  # noqa: E402
+
+PAPER_INDEXES_TEXT = "{'1. Introduction': 1, '2. Method': 3}"
+
+
+def test_truncated_completion_is_parsed_like_full_completion():
+    full_content = f"<paper_indexes>{PAPER_INDEXES_TEXT}</paper_indexes>\n<next_agent>paper_team_leader</next_agent>"
+    # stop sequence('</next_agent>')에서 잘린 응답
+    truncated_result = AIMessage(
+        content=full_content[: -len("</next_agent>")], response_metadata={"finish_reason": "stop"}
+    )
+
+    assert _restore_stop_sequence(truncated_result).content == full_content
+    truncated_node_result = _make_agent_node_result(truncated_result, "arxiv_paper_searcher")
+    full_node_result = _make_agent_node_result(AIMessage(content=full_content), "arxiv_paper_searcher")
+    assert truncated_node_result["next_role"] == full_node_result["next_role"] == "paper_team_leader"
+    assert truncated_node_result["paper_indexes"] == full_node_result["paper_indexes"] == PAPER_INDEXES_TEXT
+
+
+def test_paper_indexes_after_routing_tag_are_kept_without_stop():
+    agent_creator = AgentCreator()
+    for llm in [agent_creator.llm, agent_creator.llm_without_stop]:
+        llm.first_token_delay_seconds = 0.0
+        llm.token_delay_seconds = 0.0
+        llm.response_text = f"<next_agent>paper_team_leader</next_agent>\n<paper_indexes>{PAPER_INDEXES_TEXT}</paper_indexes>"
+    agent_kwargs = {"tools": [], "system_prompt": "test agent", "next_roles": ["paper_team_leader"]}
+    agent_input = {"messages": [HumanMessage(content="2401.00001 논문 목차 알려줘")]}
+
+    stopped_result = _make_agent_node_result(
+        agent_creator.create_chat_agent(**agent_kwargs).invoke(agent_input), "arxiv_paper_searcher"
+    )
+    assert stopped_result["next_role"] == "paper_team_leader"
+    assert not stopped_result["paper_indexes"]
+
+    # 목차를 쓰는 agent는 stop 없이 생성해 routing 태그 뒤의 목차도 유지
+    index_agent_result = _make_agent_node_result(
+        agent_creator.create_chat_agent(**agent_kwargs, stop_at_next_agent=False).invoke(agent_input),
+        "arxiv_paper_searcher",
+    )
+    assert index_agent_result["next_role"] == "paper_team_leader"
+    assert index_agent_result["paper_indexes"] == PAPER_INDEXES_TEXT
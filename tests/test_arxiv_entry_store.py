@@ -0,0 +1,105 @@
+import datetime
+import http.server
+import os
+import re
+import threading
+import urllib.parse
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from src.utils.arxiv_entry_store import ArxivEntryStore
+
+ATOM_NAMESPACE = "{http://www.w3.org/2005/Atom}"
+SAVED_FEED_PATH = os.path.join(os.path.dirname(__file__), "data", "arxiv_cs_CL_feed.xml")
+
+ET.register_namespace("", ATOM_NAMESPACE[1:-1])
+
+
+def _entry_submitted_minute(entry_element):
+    published = datetime.datetime.strptime(entry_element.findtext(f"{ATOM_NAMESPACE}published"), "%Y-%m-%dT%H:%M:%SZ")
+    return published.strftime("%Y%m%d%H%M")
+
+
+class _ArxivApiRequestHandler(http.server.BaseHTTPRequestHandler):
+    # 저장된 Atom feed를 arxiv api처럼 응답(제출일 내림차순, submittedDate 범위, start/max_results 적용)
+    # server.visible_count: feed의 오래된 entry부터 몇 개가 지금까지 제출되었는지
+    def do_GET(self):
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        self.server.requests.append(query)
+        start, max_results = int(query["start"][0]), int(query["max_results"][0])
+        date_range = re.search(r"submittedDate:\[(\d{12}) TO (\d{12})\]", query["search_query"][0])
+
+        feed_root = ET.parse(SAVED_FEED_PATH).getroot()
+        entry_elements = feed_root.findall(f"{ATOM_NAMESPACE}entry")
+        for entry_element in entry_elements:
+            feed_root.remove(entry_element)
+        entry_elements = entry_elements[len(entry_elements) - self.server.visible_count:]
+        if date_range:
+            entry_elements = [
+                entry_element for entry_element in entry_elements
+                if date_range.group(1) <= _entry_submitted_minute(entry_element) <= date_range.group(2)
+            ]
+        feed_root.extend(entry_elements[start:start + max_results])
+
+        body = ET.tostring(feed_root, encoding="utf-8", xml_declaration=True)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/atom+xml")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def arxiv_api_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _ArxivApiRequestHandler)
+    server.visible_count = 3
+    server.requests = []
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def entry_store(tmp_path, arxiv_api_server):
+    api_query_format = (
+        f"http://127.0.0.1:{arxiv_api_server.server_port}/api/query"
+        "?search_query={search_query}&start={start}&max_results={max_results}"
+    )
+    return ArxivEntryStore(
+        str(tmp_path / "arxiv_entries.sqlite3"),
+        api_query_format=api_query_format,
+        sync_page_size=2,
+        sync_page_delay_seconds=0.0,
+    )
+
+
+def _paper_ids(entries):
+    return [entry["paper_id"] for entry in entries]
+
+
+def test_first_sync_fills_requested_results_beyond_one_page(entry_store):
+    assert _paper_ids(entry_store.get_recent_entries("cs.CL", 1)) == ["2401.00003"]
+    # 한 페이지(2개)보다 많은 결과를 요청하면 부족한 만큼 더 받아옴
+    assert _paper_ids(entry_store.get_recent_entries("cs.CL", 3)) == ["2401.00003", "2401.00002", "2401.00001"]
+
+
+def test_incremental_sync_pages_until_last_submitted(entry_store, arxiv_api_server):
+    entry_store.get_recent_entries("cs.CL", 3)
+    # 다음 동기화 전에 페이지 크기(2)보다 많은 5개의 새 entry가 제출됨
+    arxiv_api_server.visible_count = 8
+    arxiv_api_server.requests.clear()
+
+    entry_store.sync_category("cs.CL")
+
+    assert all("submittedDate" in request["search_query"][0] for request in arxiv_api_server.requests)
+    assert _paper_ids(entry_store.query_recent_entries("cs.CL", 10)) == [f"2401.0000{index}" for index in range(8, 0, -1)]
+    # 이후 동기화는 마지막 제출일 이후만 요청
+    arxiv_api_server.requests.clear()
+    assert entry_store.sync_category("cs.CL") == 1
+    assert len(arxiv_api_server.requests) == 1
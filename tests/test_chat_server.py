@@ -0,0 +1,89 @@
+import asyncio
+import os
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import ClientDisconnect
+
+# graph import 시 openai 대신 stub llm을 사용
+os.environ.setdefault("CHAT_LLM_STUB", "1")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from src.chat_server import ChatSessionManager, ChatTurnStreamingResponse  # noqa: E402
+
+
+async def _receive_disconnect():
+    return {"type": "http.disconnect"}
+
+
+async def _send_slowly(message):
+    await asyncio.sleep(0.01)
+
+
+async def _send_disconnected(message):
+    raise OSError("client disconnected")
+
+
+@pytest.mark.parametrize(
+    "spec_version, send, expected_error",
+    [
+        # asgi < 2.4: header를 보내는 중 disconnect가 감지되어 body 전송 task가 취소됨
+        ("2.0", _send_slowly, None),
+        # asgi >= 2.4: 응답 header 전송부터 실패
+        ("2.4", _send_disconnected, ClientDisconnect),
+    ],
+)
+def test_turn_is_released_when_client_disconnects_before_body(spec_version, send, expected_error):
+    async def run():
+        chat_session_manager = ChatSessionManager(max_inflight_sessions=1, acquire_timeout_seconds=0.1)
+        chat_turn = await chat_session_manager.start_turn("session")
+        response = ChatTurnStreamingResponse(chat_session_manager, chat_turn, "hello")
+        scope = {"type": "http", "asgi": {"spec_version": spec_version}}
+
+        if expected_error is None:
+            await response(scope, _receive_disconnect, send)
+        else:
+            with pytest.raises(expected_error):
+                await response(scope, _receive_disconnect, send)
+
+        assert chat_session_manager.stats()["inflight_sessions"] == 0
+        # 같은 session과 slot을 바로 다시 쓸 수 있음
+        next_turn = await chat_session_manager.start_turn("session")
+        chat_session_manager.finish_turn(next_turn)
+
+    asyncio.run(run())
+
+
+def test_same_session_is_rejected_while_waiting_for_slot():
+    async def run():
+        chat_session_manager = ChatSessionManager(max_inflight_sessions=1, acquire_timeout_seconds=0.1)
+        other_turn = await chat_session_manager.start_turn("other")
+
+        start_results = await asyncio.gather(
+            chat_session_manager.start_turn("session"),
+            chat_session_manager.start_turn("session"),
+            return_exceptions=True,
+        )
+        # 먼저 들어온 요청은 slot 대기 후 503, 뒤의 요청은 대기 중인 turn 때문에 바로 409
+        assert sorted(start_result.status_code for start_result in start_results) == [409, 503]
+        assert chat_session_manager.stats()["waiting_sessions"] == 0
+
+        chat_session_manager.finish_turn(other_turn)
+        chat_session_manager.finish_turn(await chat_session_manager.start_turn("session"))
+
+    asyncio.run(run())
+
+
+def test_delete_session_is_rejected_while_turn_is_running():
+    async def run():
+        chat_session_manager = ChatSessionManager()
+        chat_turn = await chat_session_manager.start_turn("session")
+
+        with pytest.raises(HTTPException) as delete_error:
+            await chat_session_manager.delete_session("session")
+        assert delete_error.value.status_code == 409
+
+        chat_session_manager.finish_turn(chat_turn)
+        await chat_session_manager.delete_session("session")
+
+    asyncio.run(run())
@@ -0,0 +1,117 @@
+import fitz
+import pytest
+
+from src.utils import get_paper_page_indexes
+from src.utils.get_paper_page_indexes import ExtractPaperIndexes, TieredExtractPaperIndexes
+
+
+class _CharTokenizer:
+    # 글자 하나를 token 하나로 세는 tokenizer(tiktoken encoding 파일 없이 테스트)
+    def encode(self, text):
+        return [ord(char) for char in text]
+
+    def decode(self, tokens):
+        return "".join(chr(token) for token in tokens)
+
+
+@pytest.fixture
+def index_extractor(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr(get_paper_page_indexes.tiktoken, "encoding_for_model", lambda using_llm_name: _CharTokenizer())
+
+    return ExtractPaperIndexes(using_llm_name="gpt-4o-mini", max_window_tokens=12, split_overlap_tokens=2)
+
+
+def test_split_page_overlaps_chunks_within_budget(index_extractor):
+    page_text = "abcdefghijklmnopqrstuvwxyz"
+
+    page_chunks = index_extractor._split_page_text(page_text)
+
+    assert all(len(page_chunk) <= 12 for page_chunk in page_chunks)
+    assert page_chunks[0] == page_text[:12]
+    # 인접 조각은 split_overlap_tokens(2)만큼 겹치고, 모두 이으면 원래 페이지
+    for previous_chunk, page_chunk in zip(page_chunks, page_chunks[1:]):
+        assert previous_chunk[-2:] == page_chunk[:2]
+    assert "".join([page_chunks[0], *[page_chunk[2:] for page_chunk in page_chunks[1:]]]) == page_text
+
+
+def test_packed_windows_keep_page_numbers_of_split_pages(index_extractor):
+    paper_pages = ["p0 short", "p1 " + "x" * 25, "p2 a", "p3 b"]
+
+    page_windows = index_extractor._pack_page_windows(paper_pages)
+
+    assert all(sum(len(page_text) for page_text in page_texts) <= 12 for _, page_texts in page_windows)
+    # 모든 조각은 원래 페이지 번호를 유지하고, 페이지 순서대로 나열됨
+    window_pages = [(page_number, page_text) for page_numbers, page_texts in page_windows for page_number, page_text in zip(page_numbers, page_texts)]
+    assert [page_number for page_number, _ in window_pages] == sorted(page_number for page_number, _ in window_pages)
+    for page_number, page_text in window_pages:
+        assert page_text in paper_pages[page_number]
+    assert {page_number for page_number, _ in window_pages} == {0, 1, 2, 3}
+    # 나눈 페이지의 마지막 조각과 다음 페이지는 같은 window에 묶여도 각자의 페이지 번호를 가짐
+    assert ([1, 2], ["x" * 8, "p2 a"]) in page_windows
+
+
+def test_indexes_are_located_on_their_page_within_window(index_extractor, monkeypatch):
+    index_extractor.max_window_tokens = 40
+    paper_pages = ["1 Intro\ntext", "more text", "2 Method\ntext", "3 Results\ntext"]
+    # llm 대신 window 안의 heading을 그대로 돌려줌
+    monkeypatch.setattr(
+        index_extractor,
+        "_extract_window_indexes",
+        lambda range_page_texts: [line for line in range_page_texts.split("\n") if line[:1].isdigit()],
+    )
+
+    paper_indexes = index_extractor.run_extract_all_indexes(paper_pages)
+
+    assert paper_indexes == {"1 Intro": 0, "2 Method": 2, "3 Results": 3}
+
+
+_HEADINGS = ["1 Introduction", "2 Method", "3 Results"]
+_BODY_TEXT = "body text of the paper " * 4
+
+
+class _FakeLlmExtractor:
+    def __init__(self):
+        self.calls = 0
+
+    def run_extract_all_indexes(self, paper_pages):
+        self.calls += 1
+        return {"llm index": 0}
+
+
+def _paper_pdf(with_outline, with_headings):
+    paper_pages = fitz.open()
+    for page_number, heading in enumerate(_HEADINGS):
+        page = paper_pages.new_page()
+        if with_headings:
+            page.insert_text((50, 60), heading, fontsize=16)
+        for line_number in range(10):
+            page.insert_text((50, 100 + line_number * 14), _BODY_TEXT, fontsize=10)
+    if with_outline:
+        paper_pages.set_toc([[1, heading, page_number + 1] for page_number, heading in enumerate(_HEADINGS)])
+
+    return paper_pages
+
+
+@pytest.mark.parametrize(
+    "with_outline, with_headings, expected_tier",
+    [
+        (True, True, get_paper_page_indexes.OUTLINE_TIER),
+        (False, True, get_paper_page_indexes.HEADING_TIER),
+        (False, False, get_paper_page_indexes.LLM_TIER),
+    ],
+)
+def test_tiers_fall_back_from_outline_to_headings_to_llm(with_outline, with_headings, expected_tier):
+    tiered_extractor = TieredExtractPaperIndexes(using_llm_name="gpt-4o-mini")
+    fake_llm_extractor = _FakeLlmExtractor()
+    tiered_extractor._llm_extractor = fake_llm_extractor
+
+    paper_indexes, tier = tiered_extractor.run_extract_all_indexes(_paper_pdf(with_outline, with_headings))
+
+    assert tier == expected_tier
+    if expected_tier == get_paper_page_indexes.LLM_TIER:
+        assert paper_indexes == {"llm index": 0}
+    else:
+        # 앞 tier에서 목차를 찾으면 llm은 호출하지 않음
+        assert paper_indexes == {heading: page_number for page_number, heading in enumerate(_HEADINGS)}
+        assert fake_llm_extractor.calls == 0
@@ -0,0 +1,111 @@
+import http.server
+import os
+import threading
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from src.utils import get_rss_url_values
+from src.utils.get_rss_url_values import RssFeedHttpCache, iter_entries_from_atom_stream
+
+SAVED_FEED_PATH = os.path.join(os.path.dirname(__file__), "data", "arxiv_cs_CL_feed.xml")
+FEED_ETAG = '"feed-v1"'
+
+
+class _FeedRequestHandler(http.server.BaseHTTPRequestHandler):
+    # ETag가 같으면 304, 아니면 저장된 feed를 200으로 응답
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == FEED_ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        with open(SAVED_FEED_PATH, "rb") as feed_file:
+            body = feed_file.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/atom+xml")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", FEED_ETAG)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def feed_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _FeedRequestHandler)
+    server.requests = []
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _feed_url(feed_server):
+    return f"http://127.0.0.1:{feed_server.server_port}/api/query?search_query=cat:cs.CL"
+
+
+def test_not_modified_response_reuses_cached_body(feed_server):
+    # TTL 0: 매 요청마다 conditional GET으로 재검증
+    rss_cache = RssFeedHttpCache(ttl_seconds=0, timeout=(1.0, 5.0), max_entries=4)
+    with open(SAVED_FEED_PATH, "rb") as feed_file:
+        saved_feed = feed_file.read()
+
+    assert rss_cache.fetch(_feed_url(feed_server)) == saved_feed
+    assert rss_cache.fetch(_feed_url(feed_server)) == saved_feed
+
+    assert "If-None-Match" not in feed_server.requests[0]
+    assert feed_server.requests[1]["If-None-Match"] == FEED_ETAG
+    assert (rss_cache.misses, rss_cache.not_modified_hits) == (1, 1)
+
+
+def test_fresh_response_is_served_without_request(feed_server):
+    rss_cache = RssFeedHttpCache(ttl_seconds=60, timeout=(1.0, 5.0), max_entries=4)
+
+    first_body = rss_cache.fetch(_feed_url(feed_server))
+
+    assert rss_cache.fetch(_feed_url(feed_server)) is first_body
+    assert len(feed_server.requests) == 1
+    assert rss_cache.fresh_hits == 1
+
+
+class _ChunkedStream:
+    # 응답 stream처럼 조금씩 읽히도록 read 크기를 제한
+    def __init__(self, body, chunk_size):
+        self.body = body
+        self.chunk_size = chunk_size
+        self.offset = 0
+
+    def read(self, size=-1):
+        chunk = self.body[self.offset:self.offset + self.chunk_size]
+        self.offset += len(chunk)
+        return chunk
+
+
+def test_atom_stream_parser_clears_parsed_entries_from_root(monkeypatch):
+    parsed_roots = []
+    iterparse = ET.iterparse
+
+    def recording_iterparse(source, events=None):
+        # 첫 이벤트의 element(<feed> root)를 기록
+        for event, element in iterparse(source, events=events):
+            if not parsed_roots:
+                parsed_roots.append(element)
+            yield event, element
+
+    monkeypatch.setattr(get_rss_url_values.ET, "iterparse", recording_iterparse)
+    root_entry_counts, entries = [], []
+    with open(SAVED_FEED_PATH, "rb") as feed_file:
+        feed_stream = _ChunkedStream(feed_file.read(), chunk_size=64)
+    for entry in iter_entries_from_atom_stream(feed_stream):
+        entries.append(entry)
+        root_entry_counts.append(len(parsed_roots[0].findall(f"{get_rss_url_values.ATOM_NAMESPACE}entry")))
+
+    assert [entry["title"] for entry in entries] == [f"Sample Language Model Paper {index}" for index in range(8, 0, -1)]
+    # 처리한 entry는 root에서 바로 제거되어 root에는 현재 entry(와 미리 읽은 다음 entry)만 남음
+    assert max(root_entry_counts) <= 2
+    assert len(parsed_roots[0]) == 0
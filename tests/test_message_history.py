@@ -0,0 +1,22 @@
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.utils import message_history
+
+
+def test_bounded_history_falls_back_to_char_estimate_without_tokenizer(monkeypatch):
+    tokenizer_loads = []
+
+    def get_unavailable_tokenizer(using_llm_name):
+        tokenizer_loads.append(using_llm_name)
+        raise OSError("Failed to resolve 'openaipublic.blob.core.windows.net'")
+
+    monkeypatch.setattr(message_history, "get_tokenizer", get_unavailable_tokenizer)
+    message_history._get_history_tokenizer.cache_clear()
+    try:
+        messages = [HumanMessage(content="attention 설명해줘"), AIMessage(content="attention은 ...")]
+        for _ in range(3):
+            assert message_history.get_bounded_history(messages) == messages
+        # encoding 로드는 한 번만 시도
+        assert len(tokenizer_loads) == 1
+    finally:
+        message_history._get_history_tokenizer.cache_clear()
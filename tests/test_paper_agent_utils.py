@@ -0,0 +1,42 @@
+import os
+
+import requests
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from src.agents.paper_agent.utils import paper_agent_utils  # noqa: E402
+
+
+def test_search_paper_reports_failed_downloads_with_partial_result(monkeypatch, tmp_path):
+    monkeypatch.setattr(paper_agent_utils, "PDF_DOWNLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(
+        paper_agent_utils,
+        "resolve_arxiv_papers",
+        lambda paper_ids: {
+            paper_id: {"pdf_url": f"http://arxiv.org/pdf/{paper_id}"} for paper_id in paper_ids if paper_id != "2401.00003"
+        },
+    )
+
+    def download_many(download_targets, return_exceptions=False):
+        assert return_exceptions
+        download_results = []
+        for pdf_url, pdf_path in download_targets:
+            if pdf_url.endswith("2401.00002"):
+                download_results.append(requests.ConnectionError("connection reset"))
+                continue
+            with open(pdf_path, "wb") as pdf_file:
+                pdf_file.write(b"%PDF-1.4")
+            download_results.append(pdf_path)
+        return download_results
+
+    monkeypatch.setattr(paper_agent_utils, "paper_pdf_download_many", download_many)
+    monkeypatch.setattr(paper_agent_utils, "_ensure_paper_page_store", lambda pdf_path: None)
+
+    search_result = paper_agent_utils.search_paper_by_arxiv_id.invoke(
+        {"arxiv_paper_id": ["2401.00001", "2401.00002", "2401.00003", "not-an-id"]}
+    )
+
+    assert [os.path.basename(paper_path) for paper_path in search_result["paper_paths"]] == ["2401.00001.pdf"]
+    assert search_result["invalid_arxiv_ids"] == ["not-an-id"]
+    assert search_result["not_found_arxiv_ids"] == ["2401.00003"]
+    assert search_result["failed_arxiv_ids"] == ["2401.00002"]
@@ -0,0 +1,48 @@
+from src.utils import paper_index_cache
+from src.utils.paper_index_cache import PaperIndexCache
+
+PAPER_INDEXES = {"1 Introduction": 0, "2 Method": 2}
+
+
+def _write_pdf(pdf_path, content=b"%PDF-1.4 paper"):
+    pdf_path.write_bytes(content)
+    return str(pdf_path)
+
+
+def test_cache_is_invalidated_when_model_or_prompt_changes(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "paper_index_cache.sqlite3")
+    pdf_path = _write_pdf(tmp_path / "2401.00001.pdf")
+    index_cache = PaperIndexCache(db_path)
+    index_cache.put(pdf_path, "gpt-4o-mini", PAPER_INDEXES, "outline")
+
+    assert index_cache.get(pdf_path, "gpt-4o-mini") == (PAPER_INDEXES, "outline")
+    # 다른 프로세스(새 instance)에서도 sqlite에서 읽음
+    assert PaperIndexCache(db_path).get(pdf_path, "gpt-4o-mini") == (PAPER_INDEXES, "outline")
+    assert index_cache.get(pdf_path, "gpt-4o") is None
+
+    monkeypatch.setattr(paper_index_cache, "CURRENT_PROMPT_HASH", paper_index_cache.get_prompt_hash(["changed prompt"]))
+    assert index_cache.get(pdf_path, "gpt-4o-mini") is None
+    assert PaperIndexCache(db_path).purge(stale_prompt_only=True) == 1
+
+
+def test_cache_is_invalidated_when_pdf_content_changes(tmp_path):
+    pdf_path = _write_pdf(tmp_path / "2401.00001.pdf")
+    index_cache = PaperIndexCache(str(tmp_path / "paper_index_cache.sqlite3"))
+    index_cache.put(pdf_path, "gpt-4o-mini", PAPER_INDEXES, "outline")
+
+    _write_pdf(tmp_path / "2401.00001.pdf", b"%PDF-1.4 updated paper")
+
+    assert index_cache.get(pdf_path, "gpt-4o-mini") is None
+
+
+def test_memory_is_bounded_by_lru(tmp_path):
+    index_cache = PaperIndexCache(str(tmp_path / "paper_index_cache.sqlite3"), max_entries=2)
+    pdf_paths = [_write_pdf(tmp_path / f"2401.0000{index}.pdf", f"%PDF-1.4 paper {index}".encode()) for index in range(3)]
+    for pdf_path in pdf_paths:
+        index_cache.put(pdf_path, "gpt-4o-mini", PAPER_INDEXES, "outline")
+
+    assert len(index_cache._memory) == 2
+    assert len(index_cache._file_hash_memo) == 2
+    # memory에서 밀려난 목차는 sqlite에서 다시 읽음
+    assert index_cache.get(pdf_paths[0], "gpt-4o-mini") == (PAPER_INDEXES, "outline")
+    assert len(index_cache._memory) == 2
@@ -0,0 +1,35 @@
+import os
+
+import fitz
+import pytest
+
+from src.utils.paper_page_store import build_paper_page_store, get_page_store_path, load_paper_page_store
+
+PAGE_TEXTS = ["1. Introduction\nfirst page", "2. Method\n두 번째 페이지", "3. Results\nthird page"]
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    pdf_path = str(tmp_path / "paper.pdf")
+    with fitz.open() as paper_pdf:
+        for page_text in PAGE_TEXTS:
+            paper_pdf.new_page().insert_text((72, 72), page_text, fontname="korea")
+        paper_pdf.save(pdf_path)
+
+    return pdf_path
+
+
+@pytest.mark.parametrize("store_size", [0, 6, 40, -5])
+def test_truncated_store_is_rebuilt_from_pdf(pdf_path, store_size):
+    store_path = build_paper_page_store(pdf_path)
+    expected_page_texts = load_paper_page_store(pdf_path).get_page_texts()
+    with open(store_path, "r+b") as store_file:
+        store_file.truncate(store_size if store_size >= 0 else os.path.getsize(store_path) + store_size)
+
+    paper_page_store = load_paper_page_store(pdf_path)
+
+    assert paper_page_store.get_page_texts() == expected_page_texts
+    assert [page_text.split("\n")[0] for page_text in expected_page_texts] == [
+        page_text.split("\n")[0] for page_text in PAGE_TEXTS
+    ]
+    assert os.path.getsize(get_page_store_path(pdf_path)) > max(store_size, 0)
@@ -0,0 +1,203 @@
+import http.server
+import os
+import re
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from src.utils.paper_pdf_downloader import (
+    PARTIAL_DOWNLOAD_SUFFIX,
+    PaperPdfDownloader,
+    PdfDownloadTimeout,
+    PdfIntegrityError,
+)
+from src.utils.single_flight import SingleFlight
+
+PDF_CONTENT = b"%PDF-1.4\n" + bytes(range(256)) * 40
+
+
+class _PdfRequestHandler(http.server.BaseHTTPRequestHandler):
+    # 테스트마다 server.behavior로 응답 방식을 바꿈
+    # - range: Range 요청에 206으로 응답
+    # - ignore_range: Range를 무시하고 항상 200 전체 응답
+    # - truncate_once: 첫 요청은 Content-Length보다 짧게 보내고 연결 종료, 이후는 range
+    # - not_pdf: pdf가 아닌 본문
+    # - slow: read timeout보다 짧은 간격으로 조금씩 보내 전체 응답이 오래 걸림
+    def do_GET(self):
+        self.server.requests.append(self.headers.get("Range"))
+        content = b"<html>not found</html>" if self.server.behavior == "not_pdf" else PDF_CONTENT
+        range_match = re.fullmatch(r"bytes=(\d+)-", self.headers.get("Range") or "")
+        if range_match and self.server.behavior in ("range", "truncate_once"):
+            start = int(range_match.group(1))
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(content) - 1}/{len(content)}")
+            body = content[start:]
+        else:
+            self.send_response(200)
+            body = content
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        if self.server.behavior == "truncate_once" and len(self.server.requests) == 1:
+            self.wfile.write(body[: len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        if self.server.behavior == "slow":
+            try:
+                for start in range(0, len(body), 256):
+                    self.wfile.write(body[start:start + 256])
+                    self.wfile.flush()
+                    time.sleep(0.05)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            return
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def pdf_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _PdfRequestHandler)
+    server.behavior = "range"
+    server.requests = []
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def downloader():
+    return PaperPdfDownloader(max_workers=2, timeout=(2.0, 2.0), max_retries=3, retry_backoff=0.0, chunk_size=1024)
+
+
+def _pdf_url(server) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}/paper.pdf"
+
+
+def _unreachable_pdf_url() -> str:
+    # 아무도 listen하지 않는 port(연결 거부)
+    with socket.socket() as unused_socket:
+        unused_socket.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{unused_socket.getsockname()[1]}/paper.pdf"
+
+
+def test_resume_partial_download_with_range(pdf_server, downloader, tmp_path):
+    pdf_path = str(tmp_path / "paper.pdf")
+    with open(pdf_path + PARTIAL_DOWNLOAD_SUFFIX, "wb") as partial_file:
+        partial_file.write(PDF_CONTENT[:1000])
+
+    assert downloader.download(_pdf_url(pdf_server), pdf_path) == pdf_path
+    assert pdf_server.requests == ["bytes=1000-"]
+    with open(pdf_path, "rb") as pdf_file:
+        assert pdf_file.read() == PDF_CONTENT
+    assert not os.path.exists(pdf_path + PARTIAL_DOWNLOAD_SUFFIX)
+
+
+def test_restart_from_zero_when_server_ignores_range(pdf_server, downloader, tmp_path):
+    pdf_server.behavior = "ignore_range"
+    pdf_path = str(tmp_path / "paper.pdf")
+    with open(pdf_path + PARTIAL_DOWNLOAD_SUFFIX, "wb") as partial_file:
+        partial_file.write(b"stale bytes from another file")
+
+    downloader.download(_pdf_url(pdf_server), pdf_path)
+    assert pdf_server.requests == [f"bytes={len(b'stale bytes from another file')}-"]
+    with open(pdf_path, "rb") as pdf_file:
+        assert pdf_file.read() == PDF_CONTENT
+
+
+def test_truncated_body_is_resumed_on_retry(pdf_server, downloader, tmp_path):
+    pdf_server.behavior = "truncate_once"
+    pdf_path = str(tmp_path / "paper.pdf")
+
+    downloader.download(_pdf_url(pdf_server), pdf_path)
+    assert pdf_server.requests[0] is None
+    # 연결이 끊기기 전까지 받은 chunk들은 .part에 남아 그 지점부터 이어 받음
+    resumed_from = int(re.fullmatch(r"bytes=(\d+)-", pdf_server.requests[1]).group(1))
+    assert 0 < resumed_from <= len(PDF_CONTENT) // 2
+    with open(pdf_path, "rb") as pdf_file:
+        assert pdf_file.read() == PDF_CONTENT
+
+
+def test_non_pdf_body_raises_and_leaves_no_file(pdf_server, downloader, tmp_path):
+    pdf_server.behavior = "not_pdf"
+    pdf_path = str(tmp_path / "paper.pdf")
+
+    with pytest.raises(PdfIntegrityError):
+        downloader.download(_pdf_url(pdf_server), pdf_path)
+    assert len(pdf_server.requests) == downloader.max_retries
+    assert not os.path.exists(pdf_path)
+    assert not os.path.exists(pdf_path + PARTIAL_DOWNLOAD_SUFFIX)
+
+
+def test_single_flight_shares_concurrent_downloads_of_same_path(pdf_server, tmp_path):
+    downloader = PaperPdfDownloader(max_workers=4, retry_backoff=0.0, single_flight=SingleFlight(str(tmp_path / ".locks")))
+    pdf_path = str(tmp_path / "paper.pdf")
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        download_results = list(executor.map(lambda _: downloader.download(_pdf_url(pdf_server), pdf_path), range(4)))
+    assert download_results == [pdf_path] * 4
+    assert len(pdf_server.requests) == 1
+
+    # 이미 받은 pdf는 다시 요청하지 않음
+    downloader.download_many([(_pdf_url(pdf_server), pdf_path)])
+    assert len(pdf_server.requests) == 1
+
+
+def test_download_many_returns_failures_with_partial_results(pdf_server, downloader, tmp_path):
+    pdf_path, failed_pdf_path = str(tmp_path / "paper.pdf"), str(tmp_path / "failed.pdf")
+
+    download_results = downloader.download_many(
+        [(_pdf_url(pdf_server), pdf_path), (_unreachable_pdf_url(), failed_pdf_path)], return_exceptions=True
+    )
+    assert download_results[0] == pdf_path
+    assert isinstance(download_results[1], requests.ConnectionError)
+    assert os.path.isfile(pdf_path)
+    assert not os.path.exists(failed_pdf_path)
+
+    with pytest.raises(requests.ConnectionError):
+        downloader.download_many([(_unreachable_pdf_url(), failed_pdf_path)])
+
+
+def test_retry_backoff_does_not_hold_download_slot(pdf_server, tmp_path):
+    downloader = PaperPdfDownloader(max_workers=1, timeout=(2.0, 2.0), max_retries=2, retry_backoff=1.0)
+    failing_download = threading.Thread(
+        target=downloader.download_many,
+        args=([(_unreachable_pdf_url(), str(tmp_path / "failed.pdf"))], True),
+    )
+    failing_download.start()
+    # 실패한 다운로드가 backoff 중일 때 다른 다운로드는 slot을 기다리지 않음
+    time.sleep(0.2)
+    started_at = time.monotonic()
+    downloader.download(_pdf_url(pdf_server), str(tmp_path / "paper.pdf"))
+    assert time.monotonic() - started_at < 0.5
+    failing_download.join()
+
+
+def test_slow_download_stops_at_max_download_seconds(pdf_server, tmp_path):
+    pdf_server.behavior = "slow"
+    downloader = PaperPdfDownloader(
+        max_workers=1, timeout=(2.0, 2.0), max_retries=3, retry_backoff=0.0, chunk_size=256, max_download_seconds=0.3
+    )
+    pdf_path = str(tmp_path / "paper.pdf")
+
+    started_at = time.monotonic()
+    with pytest.raises(PdfDownloadTimeout):
+        downloader.download(_pdf_url(pdf_server), pdf_path)
+
+    # 각 읽기는 read timeout 안에 오지만 전체 다운로드는 재시도 없이 제한 시간에 끝남
+    assert time.monotonic() - started_at < 1.0
+    assert len(pdf_server.requests) == 1
+    assert not os.path.exists(pdf_path)
+    # 받던 .part는 다음 요청에서 이어 받음
+    assert 0 < os.path.getsize(pdf_path + PARTIAL_DOWNLOAD_SUFFIX) < len(PDF_CONTENT)
+    # download_many는 시간 초과도 대상별 실패로 반환
+    assert isinstance(downloader.download_many([(_pdf_url(pdf_server), pdf_path)], return_exceptions=True)[0], PdfDownloadTimeout)
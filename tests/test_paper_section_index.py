@@ -0,0 +1,48 @@
+from src.utils.paper_section_index import PaperSectionIndex
+
+
+class _ByteTokenizer:
+    # utf-8 byte 하나를 token 하나로 세는 tokenizer, tiktoken처럼 token 경계에서 한글이 잘릴 수 있음
+    def encode(self, text):
+        return list(text.encode("utf-8"))
+
+    def decode(self, tokens):
+        return bytes(tokens).decode("utf-8", errors="replace")
+
+
+def _section_index():
+    page_texts = [
+        "1 Introduction\n트랜스포머는 attention만 사용한다.",
+        "계속되는 서론\n2 Method\n방법 설명",
+        "3 Results\n결과",
+    ]
+    return PaperSectionIndex(page_texts=page_texts, paper_indexes={"1 Introduction": 0, "2 Method": 1, "3 Results": 2})
+
+
+def _read_all_chunks(section_index, index, max_tokens):
+    chunks, cursor = [], 0
+    while cursor is not None:
+        chunk_text, cursor = section_index.get_section_text(index, cursor=cursor, max_tokens=max_tokens, tokenizer=_ByteTokenizer())
+        assert len(chunk_text.encode("utf-8")) <= max_tokens
+        chunks.append(chunk_text)
+
+    return chunks
+
+
+def test_section_spans_end_at_next_heading_across_pages():
+    section_index = _section_index()
+
+    assert section_index.get_section_text("1 Introduction")[0] == "1 Introduction\n트랜스포머는 attention만 사용한다.\n계속되는 서론\n"
+    assert section_index.get_section_text("3 Results") == ("3 Results\n결과", None)
+
+
+def test_cursor_continues_section_without_losing_or_repeating_text():
+    section_index = _section_index()
+    full_section_text = section_index.get_section_text("1 Introduction")[0]
+
+    chunks = _read_all_chunks(section_index, "1 Introduction", max_tokens=7)
+
+    assert len(chunks) > 1
+    # 한글 중간에서 잘린 문자는 다음 cursor에서 다시 읽어 이어 붙이면 원래 section과 같음
+    assert "\ufffd" not in "".join(chunks)
+    assert "".join(chunks) == full_section_text
@@ -0,0 +1,32 @@
+import pytest
+
+from src.common.common import RECENT_PAPER_TYPE_MIN_CONFIDENCE
+from src.utils.paper_type_classifier import classify_paper_types, normalize_user_input
+
+
+@pytest.mark.parametrize(
+    "user_input",
+    [
+        # '비전'이 '텔레비전' 안의 부분 문자열일 뿐임
+        "텔레비전 관련 최신 논문",
+        # 'neural networks'가 더 좁은 분야('graph neural networks')의 일부임
+        "graph neural networks",
+    ],
+)
+def test_partial_alias_hits_fall_back_to_llm(user_input):
+    paper_types, confidence = classify_paper_types(normalize_user_input(user_input))
+
+    assert confidence < RECENT_PAPER_TYPE_MIN_CONFIDENCE
+
+
+@pytest.mark.parametrize(
+    "user_input, expected_paper_types",
+    [
+        ("컴퓨터 비전 최신 논문들을 보고싶어", ("cs.CV",)),
+        ("비전을 다루는 논문", ("cs.CV",)),
+        ("recent papers on neural networks", ("cs.NE",)),
+        ("recent papers in NLP and IR", ("cs.CL", "cs.IR")),
+    ],
+)
+def test_whole_alias_hits_are_confident(user_input, expected_paper_types):
+    assert classify_paper_types(normalize_user_input(user_input)) == (expected_paper_types, 1.0)
@@ -0,0 +1,67 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+
+from src.utils.parallel_tool_executor import ParallelToolExecutor
+
+SLOW_TOOL_TIMEOUT_SECONDS = 0.2
+
+release_slow_tool = threading.Event()
+
+
+@tool
+def slow_tool(query:str)->str:
+    """timeout보다 오래 걸리는 tool"""
+    release_slow_tool.wait(5.0)
+    return f"slow {query}"
+
+
+@tool
+def fast_tool(query:str)->str:
+    """바로 끝나는 tool"""
+    return f"fast {query}"
+
+
+@pytest.fixture
+def tool_executor():
+    release_slow_tool.clear()
+    tool_executor = ParallelToolExecutor(
+        tools=[slow_tool, fast_tool],
+        tool_limits={"slow_tool": {"timeout_seconds": SLOW_TOOL_TIMEOUT_SECONDS}},
+        tool_result_cache=False,
+    )
+    yield tool_executor
+    # timeout된 worker thread를 풀어줌
+    release_slow_tool.set()
+
+
+def _tool_call_state():
+    tool_calls = [
+        {"name": "fast_tool", "args": {"query": "a"}, "id": "call-1"},
+        {"name": "slow_tool", "args": {"query": "b"}, "id": "call-2"},
+        {"name": "fast_tool", "args": {"query": "c"}, "id": "call-3"},
+    ]
+    return {"messages": [AIMessage(content="", tool_calls=tool_calls)]}
+
+
+def _assert_only_slow_call_timed_out(tool_messages):
+    assert [tool_message.tool_call_id for tool_message in tool_messages] == ["call-1", "call-2", "call-3"]
+    assert (tool_messages[0].content, tool_messages[2].content) == ("fast a", "fast c")
+    assert tool_messages[1].status == "error"
+    assert json.loads(tool_messages[1].content)["error"] == "timeout"
+
+
+def test_timed_out_call_returns_error_while_others_succeed(tool_executor):
+    tool_messages = tool_executor.invoke(_tool_call_state())["messages"]
+
+    _assert_only_slow_call_timed_out(tool_messages)
+
+
+def test_async_timed_out_call_returns_error_while_others_succeed(tool_executor):
+    tool_messages = asyncio.run(tool_executor.ainvoke(_tool_call_state()))["messages"]
+
+    _assert_only_slow_call_timed_out(tool_messages)
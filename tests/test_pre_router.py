@@ -0,0 +1,34 @@
+import os
+
+import pytest
+from langchain_core.messages import AIMessage
+from langgraph.graph import END
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from src.agents.pre_router import classify_user_intent  # noqa: E402
+from src.graph import router  # noqa: E402
+
+
+@pytest.mark.parametrize(
+    "user_input, expected_intent",
+    [
+        ("2401.15884번 논문을 찾아서 다운로드해줘.", "arxiv_paper_searcher"),
+        ("download arxiv.org/abs/2401.15884", "arxiv_paper_searcher"),
+        # 이미 받은 논문에 대한 section 질문은 paper_team_leader가 판단하도록 supervisor로
+        ("2401.15884 논문의 introduction 설명해줘", "supervisor"),
+        ("NLP 최신 논문 보여줘", "paper_team_leader"),
+        ("안녕하세요!", "greeting"),
+    ],
+)
+def test_classify_user_intent(user_input, expected_intent):
+    assert classify_user_intent(user_input) == expected_intent
+
+
+def test_router_sends_unknown_next_role_to_fallback():
+    state = {"messages": [AIMessage(content="논문을 찾지 못했어요.")], "next_role": "arxiv_paper_searcher"}
+    searcher_roles = {"call_tool", "paper_team_leader", "supervisor", END}
+
+    assert router(state, next_roles=searcher_roles) == "supervisor"
+    assert router({**state, "next_role": "paper_team_leader"}, next_roles=searcher_roles) == "paper_team_leader"
+    assert router(state, next_roles={"paper_team_leader", END}, fallback_role=END) == END
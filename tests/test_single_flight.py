@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.utils.single_flight import SingleFlight
+
+
+class _BlockingWork:
+    # 첫 실행이 시작된 뒤 release될 때까지 끝나지 않는 작업
+    def __init__(self, error=None):
+        self.error = error
+        self.call_count = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.call_count += 1
+        self.started.set()
+        self.release.wait(5.0)
+        if self.error is not None:
+            raise self.error
+        return f"result {self.call_count}"
+
+
+def _run_concurrently(single_flight, work, caller_count=8):
+    with ThreadPoolExecutor(max_workers=caller_count) as executor:
+        leader_future = executor.submit(single_flight.do, "download:2401.00001", work)
+        work.started.wait(5.0)
+        follower_futures = [executor.submit(single_flight.do, "download:2401.00001", work) for _ in range(caller_count - 1)]
+        # follower들이 진행 중인 작업을 기다리기 시작할 시간
+        time.sleep(0.1)
+        work.release.set()
+
+    return [leader_future, *follower_futures]
+
+
+def test_concurrent_calls_run_work_once(tmp_path):
+    single_flight = SingleFlight(lock_dir=str(tmp_path / "locks"))
+    work = _BlockingWork()
+
+    call_futures = _run_concurrently(single_flight, work)
+
+    assert work.call_count == 1
+    assert [call_future.result() for call_future in call_futures] == ["result 1"] * len(call_futures)
+    # 끝난 작업은 기록하지 않으므로 다음 호출은 다시 실행
+    assert single_flight.do("download:2401.00001", work) == "result 2"
+
+
+def test_concurrent_callers_share_work_error(tmp_path):
+    single_flight = SingleFlight(lock_dir=str(tmp_path / "locks"))
+    work = _BlockingWork(error=ValueError("download failed"))
+
+    call_futures = _run_concurrently(single_flight, work)
+
+    assert work.call_count == 1
+    for call_future in call_futures:
+        with pytest.raises(ValueError, match="download failed"):
+            call_future.result()
+
+
+def test_concurrent_async_calls_run_coroutine_once():
+    single_flight = SingleFlight(lock_dir=None)
+    call_count = 0
+
+    async def work():
+        nonlocal call_count
+        call_count += 1
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def run_callers():
+        return await asyncio.gather(*[single_flight.ado("tool:search", work) for _ in range(8)])
+
+    assert asyncio.run(run_callers()) == ["result"] * 8
+    assert call_count == 1
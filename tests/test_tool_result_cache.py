@@ -0,0 +1,81 @@
+import json
+import sqlite3
+
+from langchain_core.messages import ToolMessage
+
+from src.utils.tool_result_cache import ToolResultCache
+
+SEARCH_TOOL_NAME = "search_paper_by_arxiv_id"
+
+
+def _tool_call(tool_name, tool_args, tool_call_id="call-1"):
+    return {"name": tool_name, "args": tool_args, "id": tool_call_id}
+
+
+def _tool_message(tool_name, content):
+    return ToolMessage(content=content, name=tool_name, tool_call_id="call-1")
+
+
+def _search_result(paper_paths, not_found_arxiv_ids=(), failed_arxiv_ids=()):
+    return json.dumps(
+        {
+            "paper_paths": list(paper_paths),
+            "invalid_arxiv_ids": [],
+            "not_found_arxiv_ids": list(not_found_arxiv_ids),
+            "failed_arxiv_ids": list(failed_arxiv_ids),
+        }
+    )
+
+
+def test_search_result_without_downloaded_paper_is_not_cached(tmp_path):
+    tool_result_cache = ToolResultCache(str(tmp_path / "tool_results.sqlite3"))
+    pdf_path = tmp_path / "2401.00001.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4")
+
+    for arxiv_ids, content in [
+        (["2401.99999"], _search_result([], not_found_arxiv_ids=["2401.99999"])),
+        (["2401.00001", "2401.99999"], _search_result([str(pdf_path)], not_found_arxiv_ids=["2401.99999"])),
+        (["2401.00001", "2401.00002"], _search_result([str(pdf_path)], failed_arxiv_ids=["2401.00002"])),
+    ]:
+        tool_call = _tool_call(SEARCH_TOOL_NAME, {"arxiv_paper_id": arxiv_ids})
+        tool_result_cache.put(tool_call, _tool_message(SEARCH_TOOL_NAME, content))
+        assert tool_result_cache.get(tool_call) is None
+
+    tool_call = _tool_call(SEARCH_TOOL_NAME, {"arxiv_paper_id": ["2401.00001"]})
+    tool_result_cache.put(tool_call, _tool_message(SEARCH_TOOL_NAME, _search_result([str(pdf_path)])))
+    assert tool_result_cache.get(tool_call) is not None
+
+
+def test_expired_and_invalid_results_are_evicted(tmp_path):
+    db_path = str(tmp_path / "tool_results.sqlite3")
+    tool_result_cache = ToolResultCache(db_path, tool_ttls={"duckduckgo_search": -1, SEARCH_TOOL_NAME: None})
+    pdf_path = tmp_path / "2401.00001.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4")
+
+    expired_call = _tool_call("duckduckgo_search", {"query": "attention"})
+    tool_result_cache.put(expired_call, _tool_message("duckduckgo_search", "result"))
+    search_call = _tool_call(SEARCH_TOOL_NAME, {"arxiv_paper_id": ["2401.00001"]})
+    tool_result_cache.put(search_call, _tool_message(SEARCH_TOOL_NAME, _search_result([str(pdf_path)])))
+    # 받아둔 pdf가 지워지면 cache된 결과도 무효
+    pdf_path.unlink()
+
+    assert tool_result_cache.get(expired_call) is None
+    assert tool_result_cache.get(search_call) is None
+    assert len(tool_result_cache._memory) == 0
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM tool_results").fetchone()[0] == 0
+
+
+def test_memory_is_bounded_by_lru():
+    tool_result_cache = ToolResultCache(max_entries=2)
+    tool_calls = [_tool_call("duckduckgo_search", {"query": f"query {index}"}) for index in range(3)]
+    tool_result_cache.put(tool_calls[0], _tool_message("duckduckgo_search", "result 0"))
+    tool_result_cache.put(tool_calls[1], _tool_message("duckduckgo_search", "result 1"))
+    # 최근에 읽은 결과는 남고 가장 오래 쓰지 않은 결과가 밀려남
+    assert tool_result_cache.get(tool_calls[0]) is not None
+    tool_result_cache.put(tool_calls[2], _tool_message("duckduckgo_search", "result 2"))
+
+    assert len(tool_result_cache._memory) == 2
+    assert tool_result_cache.get(tool_calls[0]) is not None
+    assert tool_result_cache.get(tool_calls[1]) is None
+    assert tool_result_cache.get(tool_calls[2]) is not None